@@ -1,38 +1,178 @@
+import threading
 from game.puzzle import Puzzle, PuzzleSize
 from game.tiles import TileMode, DuplicationMode
+from game.solver import DEFAULT_WEIGHT, SolverEngine
+from game.heuristics import HeuristicType
+from game.solution_archive import SolutionArchive, SolutionOutput
+from game.search_budget import SearchBudget
+from game.async_solver import AsyncSolver, BoardInput
+from game.board import Board
+from game.replay import MoveSequence, Replay, ReplayResult, VerificationReport
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, List, Optional, Tuple, Union
 
 
 def create_puzzle(
-    size: PuzzleSize,
+    size: Union[PuzzleSize, Tuple[int, int]],
     tile_mode: TileMode,
     repeat_mode: DuplicationMode,
     duplicates_count: int = None,
+    engine: SolverEngine = SolverEngine.BFS,
+    heuristics: List[HeuristicType] = None,
+    output: SolutionOutput = SolutionOutput.ARCHIVE,
+    use_cache: bool = False,
+    collect_stats: bool = False,
+    budget: Optional[SearchBudget] = None,
+    weight: float = DEFAULT_WEIGHT,
+    interchangeable_duplicates: bool = False,
 ) -> Puzzle:
     """
     Create a puzzle with the given parameters.
 
     Args:
-        size (PuzzleSize): The size of the puzzle.
+        size (Union[PuzzleSize, Tuple[int, int]]): The size of the puzzle, a predefined size or (rows, columns).
         tile_mode (TileMode): The mode for selecting tiles.
         repeat_mode (DuplicationMode): The mode for duplicating tiles.
         duplicates_count (int, optional): The number of duplicates to create. Defaults to None.
+        engine (SolverEngine, optional): The search engine of the solver. Defaults to SolverEngine.BFS.
+        heuristics (List[HeuristicType], optional): The heuristics of the informed engines. Defaults to None.
+        output (SolutionOutput, optional): Where solved puzzles are written to. Defaults to SolutionOutput.ARCHIVE.
+        use_cache (bool, optional): Reuse optimal solutions across runs. Defaults to False.
+        collect_stats (bool, optional): Write search statistics to run_stats.txt. Defaults to False.
+        budget (SearchBudget, optional): The limits of every search and the fallback engine. Defaults to None.
+        weight (float, optional): The heuristic weight of SolverEngine.WEIGHTED_A_STAR, higher is faster
+            but gives longer solutions. Defaults to DEFAULT_WEIGHT.
+        interchangeable_duplicates (bool, optional): Treat duplicated tiles as interchangeable, so any
+            arrangement of the goal's visible values solves a puzzle. Defaults to False.
 
     Returns:
         Puzzle: The created puzzle object.
     """
-    return Puzzle(size, tile_mode, repeat_mode, duplicates_count)
+    return Puzzle(
+        size,
+        tile_mode,
+        repeat_mode,
+        duplicates_count,
+        engine,
+        heuristics,
+        output,
+        use_cache,
+        collect_stats,
+        budget,
+        weight,
+        interchangeable_duplicates,
+    )
 
 
-def start_puzzle(puzzle: Puzzle, to_solve: int) -> bool:
+def start_puzzle(
+    puzzle: Puzzle,
+    to_solve: int,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    seed: Optional[int] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> bool:
     """
     Starts the puzzle solving process.
 
     Args:
         puzzle (Puzzle): The puzzle object to solve.
         to_solve (int): The number of puzzles to solve.
+        progress_callback (Callable[[int, int], None], optional): Called with the number of
+            finished puzzles and the number of puzzles to solve. Defaults to None.
+        seed (Optional[int], optional): Seed of the drawn states, for reproducible runs. Defaults to None.
+        cancel_event (Optional[threading.Event], optional): Stops the run when set, e.g. from another
+            thread; the puzzles finished so far are kept. Defaults to None.
 
     Returns:
-        bool: True if the puzzle solving process was started successfully.
+        bool: True if all puzzles were finished, False if the run was cancelled.
     """
-    puzzle.start(to_solve)
-    return True
+    return puzzle.start(to_solve, progress_callback, seed, cancel_event)
+
+
+async def solve_board(
+    board: BoardInput,
+    engine: SolverEngine = SolverEngine.AUTO,
+    heuristics: List[HeuristicType] = None,
+    weight: float = DEFAULT_WEIGHT,
+    budget: Optional[SearchBudget] = None,
+) -> Optional[List[str]]:
+    """
+    Solves a single board on the shared process pool without blocking the event loop.
+
+    Args:
+        board (BoardInput): The board, or rows of visible tile values with 0 as the blank,
+            e.g. [[1, 2, 3], [4, 0, 6], [7, 5, 8]].
+        engine (SolverEngine, optional): The search engine of the solver. Defaults to SolverEngine.AUTO.
+        heuristics (List[HeuristicType], optional): The heuristics of the informed engines. Defaults to None.
+        weight (float, optional): The heuristic weight of SolverEngine.WEIGHTED_A_STAR. Defaults to DEFAULT_WEIGHT.
+        budget (SearchBudget, optional): The limits of the search. Defaults to None.
+
+    Returns:
+        Optional[List[str]]: The solution path as a list of moves, or None if no solution is found.
+    """
+    return await AsyncSolver.get_default().solve(board, engine, heuristics, weight, budget)
+
+
+async def solve_boards(
+    boards: Union[Iterable[BoardInput], AsyncIterable[BoardInput]],
+    engine: SolverEngine = SolverEngine.AUTO,
+    heuristics: List[HeuristicType] = None,
+    weight: float = DEFAULT_WEIGHT,
+    budget: Optional[SearchBudget] = None,
+) -> AsyncIterator[Tuple[int, Optional[List[str]]]]:
+    """
+    Solves many boards on the shared process pool and yields the solutions as they are finished.
+
+    Args:
+        boards (Union[Iterable[BoardInput], AsyncIterable[BoardInput]]): The boards to solve.
+        engine (SolverEngine, optional): The search engine of the solver. Defaults to SolverEngine.AUTO.
+        heuristics (List[HeuristicType], optional): The heuristics of the informed engines. Defaults to None.
+        weight (float, optional): The heuristic weight of SolverEngine.WEIGHTED_A_STAR. Defaults to DEFAULT_WEIGHT.
+        budget (SearchBudget, optional): The limits of every search. Defaults to None.
+
+    Yields:
+        Tuple[int, Optional[List[str]]]: The position of the board in the input and its solution path.
+    """
+    async for result in AsyncSolver.get_default().solve_many(
+        boards, engine, heuristics, weight, budget
+    ):
+        yield result
+
+
+def verify_solution(board: BoardInput, moves: MoveSequence) -> ReplayResult:
+    """
+    Replays a solution and checks that its moves are legal and reach the goal.
+
+    Args:
+        board (BoardInput): The start board, or rows of visible tile values with 0 as the blank.
+        moves (MoveSequence): The moves, as move names or as a string of move letters, e.g. "ulldr".
+
+    Returns:
+        ReplayResult: The final board and, if the solution is rejected, the reason.
+    """
+    if not isinstance(board, Board):
+        board = Board.from_rows(board)
+    return Replay.verify(board, moves)
+
+
+def verify_solutions(puzzle: Puzzle, archive_path: Optional[str] = None) -> VerificationReport:
+    """
+    Verifies every solution of a run stored in a solution archive.
+
+    Args:
+        puzzle (Puzzle): The puzzle the solutions were recorded for.
+        archive_path (Optional[str], optional): The path of the archive. Defaults to the
+            solutions.bin of the last run of the puzzle.
+
+    Returns:
+        VerificationReport: The counters and the state indices of the rejected solutions.
+
+    Raises:
+        ValueError: If no archive path is given and the puzzle has not been started.
+    """
+    if archive_path is None:
+        if puzzle.dir_path is None:
+            raise ValueError("The puzzle has not been started, pass the path of the archive")
+        archive_path = f"{puzzle.dir_path}/solutions.bin"
+    all_states, _ = puzzle.get_states()
+    with SolutionArchive(archive_path) as archive:
+        return Replay.verify_archive(archive, all_states)
@@ -0,0 +1,387 @@
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from game.board import Board
+from game.puzzle import Puzzle, PuzzleSize
+from game.solution_archive import SolutionOutput
+from game.solution_table import SolutionTable
+from game.solver import Solver, SolverEngine
+from game.state import State
+from game.tiles import TileMode, DuplicationMode
+
+# Hardest 3x3 boards (31 moves), as visible numbers in cell order, 0 being the blank
+HARDEST_3X3_BOARDS: List[List[int]] = [
+    [8, 6, 7, 2, 5, 4, 3, 0, 1],
+    [6, 4, 7, 8, 5, 0, 3, 2, 1],
+]
+# Puzzle configurations of the corpus: size, tile mode, duplication mode, duplicate count
+CONFIGURATIONS: List[
+    Tuple[Union[PuzzleSize, Tuple[int, int]], TileMode, DuplicationMode, Optional[int]]
+] = [
+    (PuzzleSize.SMALL, TileMode.NUMBERS, DuplicationMode.UNIQUE, None),
+    (PuzzleSize.SMALL, TileMode.LETTERS, DuplicationMode.UNIQUE, None),
+    (PuzzleSize.SMALL, TileMode.MIXED, DuplicationMode.DUPLICATED, 2),
+    (PuzzleSize.MEDIUM, TileMode.NUMBERS, DuplicationMode.UNIQUE, None),
+    (PuzzleSize.LARGE, TileMode.NUMBERS, DuplicationMode.UNIQUE, None),
+    ((5, 5), TileMode.NUMBERS, DuplicationMode.UNIQUE, None),
+]
+# Engines timed per board size in cells. Uninformed engines cannot solve random boards
+# of the larger sizes, which are drawn by random walks of RANDOM_WALK_LENGTHS moves instead
+ENGINES: Dict[int, List[SolverEngine]] = {
+    9: [
+        SolverEngine.BFS,
+        SolverEngine.BIDIRECTIONAL,
+        SolverEngine.A_STAR,
+        SolverEngine.IDA_STAR,
+        SolverEngine.LOOKUP_TABLE,
+    ],
+    12: [
+        SolverEngine.BIDIRECTIONAL,
+        SolverEngine.A_STAR,
+        SolverEngine.IDA_STAR,
+        SolverEngine.WEIGHTED_A_STAR,
+        SolverEngine.REDUCTION,
+    ],
+    16: [
+        SolverEngine.A_STAR,
+        SolverEngine.IDA_STAR,
+        SolverEngine.WEIGHTED_A_STAR,
+        SolverEngine.REDUCTION,
+    ],
+    25: [SolverEngine.REDUCTION],
+}
+RANDOM_WALK_LENGTHS: Dict[int, int] = {12: 30, 16: 40}
+DEFAULT_SEED: int = 15
+FORMAT_VERSION: int = 2
+
+
+class Benchmark:
+    """
+    Reproducible benchmark of the solver engines, the state generation and whole runs.
+
+    Every instance of the corpus is drawn from a seeded generator, so two runs with
+    the same seed time the same boards and their JSON reports can be compared
+    across commits. Times are measured with time.perf_counter.
+
+    Attributes:
+        seed (int): The seed of the corpus.
+        instance_count (int): The number of random instances per configuration.
+        quick (bool): True to skip the slow state generation and end-to-end benchmarks.
+    """
+
+    def __init__(self, seed: int = DEFAULT_SEED, instance_count: int = 20, quick: bool = False):
+        """
+        Initializes a new instance of the Benchmark class.
+
+        Args:
+            seed (int, optional): The seed of the corpus. Defaults to DEFAULT_SEED.
+            instance_count (int, optional): The number of random instances per configuration. Defaults to 20.
+            quick (bool, optional): Skip the slow benchmarks. Defaults to False.
+        """
+        self.seed: int = seed
+        self.instance_count: int = instance_count
+        self.quick: bool = quick
+
+    @staticmethod
+    def summarize(samples: List[float]) -> Dict[str, float]:
+        """
+        Summarizes timing samples.
+
+        Args:
+            samples (List[float]): The measured times in seconds.
+
+        Returns:
+            Dict[str, float]: The count, total, mean, minimum, maximum and percentiles of the samples.
+        """
+        if not samples:
+            return {"count": 0}
+        ordered = sorted(samples)
+
+        def percentile(fraction: float) -> float:
+            # Nearest-rank percentile
+            return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+        return {
+            "count": len(ordered),
+            "total": sum(ordered),
+            "mean": statistics.fmean(ordered),
+            "min": ordered[0],
+            "p50": percentile(0.5),
+            "p90": percentile(0.9),
+            "p99": percentile(0.99),
+            "max": ordered[-1],
+        }
+
+    @staticmethod
+    def peak_rss_kb(who: int = resource.RUSAGE_SELF) -> int:
+        """
+        Returns the peak resident set size of this process or of its finished children.
+
+        Args:
+            who (int, optional): resource.RUSAGE_SELF or resource.RUSAGE_CHILDREN. Defaults to RUSAGE_SELF.
+
+        Returns:
+            int: The peak resident set size in kilobytes.
+        """
+        peak = resource.getrusage(who).ru_maxrss
+        # macOS reports bytes, Linux kilobytes
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+    @staticmethod
+    def timed(func: Callable, *args, **kwargs) -> Tuple[object, float]:
+        """
+        Calls a function and measures its running time.
+
+        Args:
+            func (Callable): The function to call.
+
+        Returns:
+            Tuple[object, float]: The result of the function and the running time in seconds.
+        """
+        start_time = time.perf_counter()
+        result = func(*args, **kwargs)
+        return result, time.perf_counter() - start_time
+
+    @staticmethod
+    def get_configuration_name(
+        size: Union[PuzzleSize, Tuple[int, int]],
+        tile_mode: TileMode,
+        duplication_mode: DuplicationMode,
+        duplicate_count: Optional[int],
+    ) -> str:
+        """
+        Returns the name of a puzzle configuration in the report.
+
+        Returns:
+            str: The name, e.g. "3x3_numbers_unique".
+        """
+        row_count, col_count = Puzzle.get_dimensions(size)
+        name = f"{row_count}x{col_count}_{tile_mode.value}_{duplication_mode.value}"
+        return f"{name}({duplicate_count})" if duplicate_count else name
+
+    def get_corpus(self, puzzle: Puzzle) -> List[Tuple[str, State, State]]:
+        """
+        Returns the seeded instances of a puzzle configuration.
+
+        Args:
+            puzzle (Puzzle): The puzzle of the configuration.
+
+        Returns:
+            List[Tuple[str, State, State]]: The name, start state and goal state of every instance.
+        """
+        all_states, solved_state = puzzle.get_states()
+        size = puzzle.row_count * puzzle.col_count
+        corpus: List[Tuple[str, State, State]] = []
+        if size == 9 and puzzle.tile_mode == TileMode.NUMBERS and puzzle.duplication_mode == DuplicationMode.UNIQUE:
+            for number, values in enumerate(HARDEST_3X3_BOARDS):
+                # A number tile's code is its goal cell plus one, which is its value
+                board = Board.from_codes(values, puzzle.row_count, puzzle.col_count)
+                corpus.append((f"hardest_{number}", board.to_state(solved_state), solved_state))
+        if size in RANDOM_WALK_LENGTHS:
+            generator = random.Random(self.seed)
+            for number in range(self.instance_count):
+                board = Board.goal(puzzle.row_count, puzzle.col_count)
+                previous = -1
+                for _ in range(RANDOM_WALK_LENGTHS[size]):
+                    # Never undo the previous move, so the walk leaves the goal
+                    neighbors = [
+                        (neighbor, move)
+                        for neighbor, move in board.get_neighbors()
+                        if neighbor.blank != previous
+                    ]
+                    previous = board.blank
+                    board = generator.choice(neighbors)[0]
+                corpus.append((f"walk_{number}", board.to_state(solved_state), solved_state))
+        else:
+            for index in all_states.sample(self.instance_count, self.seed):
+                corpus.append((f"index_{index}", all_states[index], solved_state))
+        return corpus
+
+    def run_solvers(self, puzzle: Puzzle) -> Dict[str, dict]:
+        """
+        Times every engine of the board size on the corpus of a configuration.
+
+        Args:
+            puzzle (Puzzle): The puzzle of the configuration.
+
+        Returns:
+            Dict[str, dict]: Per engine the timing summary, solution lengths, node rates and the
+                search statistics of every instance.
+        """
+        results: Dict[str, dict] = {}
+        corpus = self.get_corpus(puzzle)
+        for engine in ENGINES[puzzle.row_count * puzzle.col_count]:
+            # Build the table once beforehand, as Puzzle.start does, so only lookups are timed
+            if engine == SolverEngine.LOOKUP_TABLE:
+                SolutionTable.get(puzzle.row_count, puzzle.col_count)
+            times: List[float] = []
+            lengths: Dict[str, Optional[int]] = {}
+            nodes_per_second: List[float] = []
+            stats: Dict[str, dict] = {}
+            for name, start_state, goal_state in corpus:
+                # Time the plain engines, the statistics come from a second, traced run
+                solver = Solver(
+                    start_state, 0, puzzle, puzzle.col_count, goal_state, engine, puzzle.heuristics
+                )
+                solution, elapsed = Benchmark.timed(solver.solve)
+                times.append(elapsed)
+                lengths[name] = None if solution is None else len(solution)
+                traced_solver = Solver(
+                    start_state,
+                    0,
+                    puzzle,
+                    puzzle.col_count,
+                    goal_state,
+                    engine,
+                    puzzle.heuristics,
+                    collect_stats=True,
+                )
+                traced_solver.solve()
+                stats[name] = traced_solver.stats.to_dict()
+                if traced_solver.stats.expansions and elapsed > 0:
+                    nodes_per_second.append(traced_solver.stats.expansions / elapsed)
+            results[engine.value] = {
+                "time": Benchmark.summarize(times),
+                "nodes_per_second": statistics.fmean(nodes_per_second) if nodes_per_second else None,
+                "solution_lengths": lengths,
+                "stats": stats,
+            }
+        return results
+
+    def run_get_states(self, puzzle: Puzzle, repeat: int = 5) -> Dict[str, float]:
+        """
+        Times loading the state space of a configuration from its state store.
+
+        Args:
+            puzzle (Puzzle): The puzzle of the configuration.
+            repeat (int, optional): The number of loads. Defaults to 5.
+
+        Returns:
+            Dict[str, float]: The timing summary.
+        """
+        # The first call may create the store, only the loads are timed
+        random.seed(self.seed)
+        puzzle.get_states()
+        return Benchmark.summarize([Benchmark.timed(puzzle.get_states)[1] for _ in range(repeat)])
+
+    def run_generation(self) -> Dict[str, float]:
+        """
+        Times enumerating all 3x3 states with State.generate_all_states.
+
+        Returns:
+            Dict[str, float]: The running time and the number of generated states.
+        """
+        random.seed(self.seed)
+        (states, _), elapsed = Benchmark.timed(
+            State.generate_all_states, 3, 3, TileMode.NUMBERS, DuplicationMode.UNIQUE
+        )
+        return {"time": elapsed, "states": len(states)}
+
+    def run_puzzle_start(self, to_solve_count: int = 200) -> Dict[str, float]:
+        """
+        Times a whole seeded Puzzle.start run on 3x3 boards.
+
+        Args:
+            to_solve_count (int, optional): The number of puzzles to solve. Defaults to 200.
+
+        Returns:
+            Dict[str, float]: The running time, the throughput and the peak memory of the workers.
+        """
+        puzzle = Puzzle(
+            PuzzleSize.SMALL,
+            TileMode.NUMBERS,
+            DuplicationMode.UNIQUE,
+            engine=SolverEngine.A_STAR,
+            output=SolutionOutput.ARCHIVE,
+        )
+        _, elapsed = Benchmark.timed(puzzle.start, to_solve_count, None, self.seed)
+        return {
+            "time": elapsed,
+            "puzzles": to_solve_count,
+            "puzzles_per_second": to_solve_count / elapsed,
+            "children_peak_rss_kb": Benchmark.peak_rss_kb(resource.RUSAGE_CHILDREN),
+        }
+
+    @staticmethod
+    def get_commit() -> Optional[str]:
+        """
+        Returns the current git commit of the repository, if available.
+
+        Returns:
+            Optional[str]: The commit hash or None.
+        """
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def run(self) -> dict:
+        """
+        Runs all benchmarks.
+
+        Returns:
+            dict: The JSON-serialisable report.
+        """
+        report: dict = {
+            "format_version": FORMAT_VERSION,
+            "commit": Benchmark.get_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": self.seed,
+            "instance_count": self.instance_count,
+            "quick": self.quick,
+            "configurations": {},
+        }
+        for size, tile_mode, duplication_mode, duplicate_count in CONFIGURATIONS:
+            puzzle = Puzzle(size, tile_mode, duplication_mode, duplicate_count)
+            name = Benchmark.get_configuration_name(size, tile_mode, duplication_mode, duplicate_count)
+            report["configurations"][name] = {
+                "get_states": self.run_get_states(puzzle),
+                "solvers": self.run_solvers(puzzle),
+            }
+        if not self.quick:
+            report["generate_all_states_3x3"] = self.run_generation()
+            report["puzzle_start_3x3"] = self.run_puzzle_start()
+        report["peak_rss_kb"] = Benchmark.peak_rss_kb()
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the puzzle solvers.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="seed of the corpus")
+    parser.add_argument(
+        "--instances", type=int, default=20, help="random instances per configuration"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="skip state generation and the end-to-end run"
+    )
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+    report = Benchmark(args.seed, args.instances, args.quick).run()
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+from game.board import Board
+from game.heuristics import HeuristicType
+from game.puzzle import Puzzle
+from game.search_budget import SearchBudget
+from game.solver import DEFAULT_WEIGHT, Solver, SolverEngine
+from game.state import State
+from game.tiles import DuplicationMode, TileMode
+
+# Number of boards submitted per worker before callers have to wait for a free slot
+PENDING_PER_WORKER: int = 2
+# A board as a Board or as rows of visible tile values, the blank being 0
+BoardInput = Union[Board, Sequence[Sequence[Union[int, str]]]]
+
+
+class AsyncSolver:
+    """
+    Asyncio facade of the solver running on a long-lived process pool.
+
+    The pool is created on the first request and reused by every later one, so a
+    single request does not pay for starting and stopping worker processes, and
+    the per-process tables (heuristics, pattern databases) stay loaded in the
+    workers. At most max_pending boards are submitted at a time: solve() waits for
+    a free slot and solve_many() only pulls the next board from its input once a
+    slot is free, so a fast producer cannot queue unbounded work.
+
+    Cancelling a waiting solve() or closing a solve_many() iterator drops the
+    boards that have not started yet. A board that is already being solved keeps
+    its worker busy until it is finished (process pool workers cannot be
+    interrupted), so long searches should be bounded with a SearchBudget.
+
+    Attributes:
+        max_workers (int): The number of worker processes.
+        max_pending (int): The largest number of boards submitted to the pool at a time.
+    """
+
+    _default: Optional["AsyncSolver"] = None
+    # Goal state of every board shape, built once per worker process
+    _goal_states: Dict[Tuple[int, int], State] = {}
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        Initializes a new instance of the AsyncSolver class.
+
+        Args:
+            max_workers (Optional[int], optional): The number of worker processes. Defaults to the number of CPUs.
+            max_pending (Optional[int], optional): The largest number of boards submitted at a time.
+                Defaults to PENDING_PER_WORKER per worker.
+        """
+        self.max_workers: int = max_workers or cpu_count() or 1
+        self.max_pending: int = max_pending or self.max_workers * PENDING_PER_WORKER
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # Created lazily per event loop, a semaphore cannot be shared between loops
+        self.slots: Optional[asyncio.Semaphore] = None
+        self.slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def get_default() -> "AsyncSolver":
+        """
+        Returns the solver shared by all callers of this process.
+
+        Returns:
+            AsyncSolver: The shared solver.
+        """
+        if AsyncSolver._default is None:
+            AsyncSolver._default = AsyncSolver()
+        return AsyncSolver._default
+
+    async def __aenter__(self) -> "AsyncSolver":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Shuts the process pool down without blocking the event loop.
+
+        The running boards are waited for on a thread of the loop's default
+        executor, so other coroutines keep running meanwhile.
+        """
+        executor = self.executor
+        self.executor = None
+        if AsyncSolver._default is self:
+            AsyncSolver._default = None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: executor.shutdown(wait=True, cancel_futures=True)
+            )
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Shuts the process pool down, a later request starts a new one.
+
+        Args:
+            wait (bool, optional): Wait for the running boards to finish. Defaults to True.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+            self.executor = None
+        if AsyncSolver._default is self:
+            AsyncSolver._default = None
+
+    @staticmethod
+    def solve_codes(
+        row_count: int,
+        col_count: int,
+        codes: List[int],
+        engine: SolverEngine,
+        heuristics: Optional[List[HeuristicType]],
+        weight: float,
+        budget: Optional[SearchBudget],
+    ) -> Optional[List[str]]:
+        """
+        Solves a board in a worker process.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            codes (List[int]): The tile codes of the board.
+            engine (SolverEngine): The search engine.
+            heuristics (Optional[List[HeuristicType]]): The heuristics of the informed engines.
+            weight (float): The heuristic weight of SolverEngine.WEIGHTED_A_STAR.
+            budget (Optional[SearchBudget]): The limits of the search.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if no solution is found.
+        """
+        goal_state = AsyncSolver._goal_states.get((row_count, col_count))
+        if goal_state is None:
+            size = row_count * col_count
+            goal_state = State.generate_solved_state(
+                State.prepare_tiles(size, TileMode.NUMBERS, 0, 0, DuplicationMode.UNIQUE),
+                col_count,
+                TileMode.NUMBERS,
+                DuplicationMode.UNIQUE,
+            )
+            AsyncSolver._goal_states[(row_count, col_count)] = goal_state
+        # Only the tile mode of the puzzle is used by the solver
+        puzzle = Puzzle((row_count, col_count), engine=engine, heuristics=heuristics)
+        start_state = Board.from_codes(codes, row_count, col_count).to_state(goal_state)
+        solver = Solver(
+            start_state,
+            0,
+            puzzle,
+            col_count,
+            goal_state,
+            engine,
+            heuristics,
+            budget=budget,
+            weight=weight,
+        )
+        return solver.solve()
+
+    async def solve(
+        self,
+        board: BoardInput,
+        engine: SolverEngine = SolverEngine.AUTO,
+        heuristics: Optional[List[HeuristicType]] = None,
+        weight: float = DEFAULT_WEIGHT,
+        budget: Optional[SearchBudget] = None,
+    ) -> Optional[List[str]]:
+        """
+        Solves a board in the process pool without blocking the event loop.
+
+        Args:
+            board (BoardInput): The board, or rows of visible tile values (see Board.from_rows).
+            engine (SolverEngine, optional): The search engine. Defaults to SolverEngine.AUTO.
+            heuristics (Optional[List[HeuristicType]], optional): The heuristics of the informed engines.
+                Defaults to None (the solver defaults).
+            weight (float, optional): The heuristic weight of SolverEngine.WEIGHTED_A_STAR.
+                Defaults to DEFAULT_WEIGHT.
+            budget (Optional[SearchBudget], optional): The limits of the search. Defaults to None.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if no solution is found.
+        """
+        if not isinstance(board, Board):
+            board = Board.from_rows(board)
+        loop = asyncio.get_running_loop()
+        if self.slots_loop is not loop:
+            self.slots = asyncio.Semaphore(self.max_pending)
+            self.slots_loop = loop
+        # Wait for a free slot, this is the back-pressure on callers
+        async with self.slots:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(self.max_workers)
+            layout = board.layout
+            return await loop.run_in_executor(
+                self.executor,
+                AsyncSolver.solve_codes,
+                layout.row_count,
+                layout.col_count,
+                board.to_codes(),
+                engine,
+                heuristics,
+                weight,
+                budget,
+            )
+
+    async def solve_many(
+        self,
+        boards: Union[Iterable[BoardInput], AsyncIterable[BoardInput]],
+        engine: SolverEngine = SolverEngine.AUTO,
+        heuristics: Optional[List[HeuristicType]] = None,
+        weight: float = DEFAULT_WEIGHT,
+        budget: Optional[SearchBudget] = None,
+    ) -> AsyncIterator[Tuple[int, Optional[List[str]]]]:
+        """
+        Solves many boards and yields the solutions in the order they are finished.
+
+        The boards are pulled from the input only while fewer than max_pending of
+        them are in flight. Leaving the loop early or cancelling the consuming task
+        cancels the boards in flight.
+
+        Args:
+            boards (Union[Iterable[BoardInput], AsyncIterable[BoardInput]]): The boards to solve.
+            engine (SolverEngine, optional): The search engine. Defaults to SolverEngine.AUTO.
+            heuristics (Optional[List[HeuristicType]], optional): The heuristics of the informed engines.
+                Defaults to None (the solver defaults).
+            weight (float, optional): The heuristic weight of SolverEngine.WEIGHTED_A_STAR.
+                Defaults to DEFAULT_WEIGHT.
+            budget (Optional[SearchBudget], optional): The limits of every search. Defaults to None.
+
+        Yields:
+            Tuple[int, Optional[List[str]]]: The position of the board in the input and its solution path.
+        """
+        if isinstance(boards, AsyncIterable):
+            source = boards.__aiter__()
+        else:
+            source = AsyncSolver.iterate(boards)
+        in_flight: Dict[asyncio.Task, int] = {}
+        position = 0
+        exhausted = False
+        try:
+            while True:
+                # Fill the free slots, the input is not read any further ahead
+                while not exhausted and len(in_flight) < self.max_pending:
+                    try:
+                        board = await source.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.ensure_future(
+                        self.solve(board, engine, heuristics, weight, budget)
+                    )
+                    in_flight[task] = position
+                    position += 1
+                if not in_flight:
+                    return
+                done: Set[asyncio.Task]
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield in_flight.pop(task), task.result()
+        finally:
+            # Reached when the consumer stops early or is cancelled
+            for task in in_flight:
+                task.cancel()
+
+    @staticmethod
+    async def iterate(boards: Iterable[BoardInput]) -> AsyncIterator[BoardInput]:
+        """
+        Wraps an iterable of boards into an asynchronous iterator.
+
+        Args:
+            boards (Iterable[BoardInput]): The boards.
+
+        Yields:
+            BoardInput: The next board.
+        """
+        for board in boards:
+            yield board
@@ -0,0 +1,418 @@
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from game.moves import Moves
+from game.ranking import Ranking
+from game.state import State
+from game.tiles import Tile
+
+
+class BoardLayout:
+    """
+    Precomputed geometry shared by every board of one shape.
+
+    Cells are numbered row by row. Each cell of a packed board holds a tile code
+    in a fixed number of bits: the blank is 0 and every other tile is coded by its
+    position in the goal state plus one (which equals `scale_value % size`).
+
+    Attributes:
+        row_count (int): The number of rows of the board.
+        col_count (int): The number of columns of the board.
+        size (int): The number of cells of the board.
+        bits (int): The number of bits used per cell.
+        mask (int): The bit mask of a single cell.
+        shifts (List[int]): The bit offset of every cell.
+        transitions (List[List[Tuple[int, str, int, int]]]): For every blank position
+            the legal moves as (target index, move name, swap factor, target shift).
+        goal_key (int): The packed goal board.
+    """
+
+    _layouts: Dict[Tuple[int, int], "BoardLayout"] = {}
+
+    def __init__(self, row_count: int, col_count: int):
+        """
+        Initializes a new instance of the BoardLayout class.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+        """
+        self.row_count: int = row_count
+        self.col_count: int = col_count
+        self.size: int = row_count * col_count
+        # At least a nibble per cell, more for boards with more than 16 cells
+        self.bits: int = max(4, (self.size - 1).bit_length())
+        self.mask: int = (1 << self.bits) - 1
+        self.shifts: List[int] = [index * self.bits for index in range(self.size)]
+        self.transitions: List[List[Tuple[int, str, int, int]]] = []
+        for blank in range(self.size):
+            row, col = divmod(blank, col_count)
+            moves = []
+            for move, move_enum in Moves.moves_dict.items():
+                new_row, new_col = row + move_enum.value[0], col + move_enum.value[1]
+                # Check if the move is within the bounds of the board
+                if 0 <= new_row < row_count and 0 <= new_col < col_count:
+                    target = new_row * col_count + new_col
+                    # Moving the tile with code v from the target cell into the blank cell
+                    # changes the packed key by v * factor
+                    factor = (1 << self.shifts[blank]) - (1 << self.shifts[target])
+                    moves.append((target, move, factor, self.shifts[target]))
+            self.transitions.append(moves)
+        self.goal_key: int = self.pack(self.goal_codes())
+
+    @staticmethod
+    def get(row_count: int, col_count: int) -> "BoardLayout":
+        """
+        Returns the shared layout for the given board shape.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            BoardLayout: The layout of the board shape.
+        """
+        layout = BoardLayout._layouts.get((row_count, col_count))
+        if layout is None:
+            layout = BoardLayout(row_count, col_count)
+            BoardLayout._layouts[(row_count, col_count)] = layout
+        return layout
+
+    def goal_codes(self) -> List[int]:
+        """
+        Returns the tile codes of the goal board.
+
+        Returns:
+            List[int]: The tile codes of the goal board, the blank last.
+        """
+        return list(range(1, self.size)) + [0]
+
+    def pack(self, codes: List[int]) -> int:
+        """
+        Packs a list of tile codes into a single integer.
+
+        Args:
+            codes (List[int]): The tile codes in cell order.
+
+        Returns:
+            int: The packed board.
+        """
+        key = 0
+        for code, shift in zip(codes, self.shifts):
+            key |= code << shift
+        return key
+
+    def unpack(self, key: int) -> List[int]:
+        """
+        Unpacks a packed board into a list of tile codes.
+
+        Args:
+            key (int): The packed board.
+
+        Returns:
+            List[int]: The tile codes in cell order.
+        """
+        mask = self.mask
+        return [(key >> shift) & mask for shift in self.shifts]
+
+
+class Board:
+    """
+    Compact, immutable representation of a puzzle state used by the solver engines.
+
+    The whole board is a single integer, so hashing and comparing boards is cheap
+    and creating a neighbour costs one integer instead of a full list of tiles.
+
+    Attributes:
+        layout (BoardLayout): The layout of the board.
+        key (int): The packed tile codes.
+        blank (int): The cell index of the blank tile.
+    """
+
+    __slots__ = ("layout", "key", "blank")
+
+    def __init__(self, layout: BoardLayout, key: int, blank: int):
+        """
+        Initializes a new instance of the Board class.
+
+        Args:
+            layout (BoardLayout): The layout of the board.
+            key (int): The packed tile codes.
+            blank (int): The cell index of the blank tile.
+        """
+        self.layout: BoardLayout = layout
+        self.key: int = key
+        self.blank: int = blank
+
+    @staticmethod
+    def from_codes(codes: List[int], row_count: int, col_count: int) -> "Board":
+        """
+        Creates a board from a list of tile codes.
+
+        Args:
+            codes (List[int]): The tile codes in cell order, 0 being the blank.
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            Board: The created board.
+        """
+        layout = BoardLayout.get(row_count, col_count)
+        return Board(layout, layout.pack(codes), codes.index(0))
+
+    @staticmethod
+    def from_key(key: int, row_count: int, col_count: int) -> "Board":
+        """
+        Creates a board from a packed key.
+
+        Args:
+            key (int): The packed tile codes.
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            Board: The created board.
+        """
+        layout = BoardLayout.get(row_count, col_count)
+        return Board(layout, key, layout.unpack(key).index(0))
+
+    @staticmethod
+    def goal(row_count: int, col_count: int) -> "Board":
+        """
+        Returns the goal board of the given shape.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            Board: The goal board.
+        """
+        layout = BoardLayout.get(row_count, col_count)
+        return Board(layout, layout.goal_key, layout.size - 1)
+
+    @staticmethod
+    def from_rows(
+        values: Sequence[Sequence[Union[int, str]]],
+        goal_values: Optional[Sequence[Sequence[Union[int, str]]]] = None,
+        blank_value: Union[int, str] = 0,
+    ) -> "Board":
+        """
+        Builds a board from rows of visible tile values.
+
+        Identical values are numbered in goal order; if that numbering is not
+        solvable, the first two copies of a duplicated value are swapped, as in
+        StateSpace.get_board.
+
+        Args:
+            values (Sequence[Sequence[Union[int, str]]]): The rows of the board.
+            goal_values (Optional[Sequence[Sequence[Union[int, str]]]], optional): The rows of the goal board.
+                Defaults to 1, 2, ... row by row with the blank in the last cell.
+            blank_value (Union[int, str], optional): The value of the blank. Defaults to 0.
+
+        Returns:
+            Board: The board.
+
+        Raises:
+            ValueError: If the rows are ragged or the tiles differ from the goal tiles.
+        """
+        row_count, col_count = len(values), len(values[0])
+        if any(len(row) != col_count for row in values):
+            raise ValueError("All rows of a board must have the same length")
+        size = row_count * col_count
+        cells = [value for row in values for value in row]
+        if goal_values is None:
+            goal = list(range(1, size)) + [blank_value]
+        else:
+            goal = [value for row in goal_values for value in row]
+        if Counter(cells) != Counter(goal) or goal[-1] != blank_value:
+            raise ValueError("The board must hold the goal tiles, with the blank last in the goal")
+        # Codes of every value in goal order, a tile's code is its goal cell plus one
+        codes_of: Dict[Union[int, str], List[int]] = {}
+        for cell, value in enumerate(goal):
+            codes_of.setdefault(value, []).append((cell + 1) % size)
+        next_copy: Counter = Counter()
+        codes: List[int] = []
+        for value in cells:
+            codes.append(codes_of[value][next_copy[value]])
+            next_copy[value] += 1
+        board = Board.from_codes(codes, row_count, col_count)
+        duplicated = next((copies for copies in codes_of.values() if len(copies) > 1), None)
+        if not board.is_solvable() and duplicated is not None:
+            # Swapping two identical tiles fixes the parity without changing the visible board
+            first, second = codes.index(duplicated[0]), codes.index(duplicated[1])
+            codes[first], codes[second] = codes[second], codes[first]
+            board = Board.from_codes(codes, row_count, col_count)
+        return board
+
+    @staticmethod
+    def from_state(state: State, col_count: int) -> "Board":
+        """
+        Converts a State of Tile objects into a board.
+
+        Args:
+            state (State): The state to convert.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            Board: The converted board.
+        """
+        size = len(state.state)
+        codes = [0] * size
+        for tile in state.state:
+            codes[tile.row * col_count + tile.col] = tile.scale_value % size
+        return Board.from_codes(codes, size // col_count, col_count)
+
+    @staticmethod
+    def get_code_classes(goal_state: State) -> List[int]:
+        """
+        Returns the visible value class of every tile code of a goal state.
+
+        Identical tiles (DuplicationMode.DUPLICATED) have different codes but the
+        same visible value; the class of a code is the code of the first copy of its
+        value in the goal state, so tiles with a unique value are their own class.
+
+        Args:
+            goal_state (State): The goal state.
+
+        Returns:
+            List[int]: The class code of every tile code.
+        """
+        size = len(goal_state.state)
+        classes: Dict[Union[int, str], int] = {}
+        code_classes = [0] * size
+        for tile in goal_state.state:
+            code = tile.scale_value % size
+            code_classes[code] = classes.setdefault(tile.val, code)
+        return code_classes
+
+    def canonical(self, code_classes: List[int]) -> "Board":
+        """
+        Returns the board with every tile code replaced by its class code.
+
+        All relabellings of identical tiles have the same canonical board, so the
+        canonical board identifies a board by its visible values only.
+
+        Args:
+            code_classes (List[int]): The class code of every tile code (see get_code_classes).
+
+        Returns:
+            Board: The canonical board.
+        """
+        layout = self.layout
+        codes = [code_classes[code] for code in layout.unpack(self.key)]
+        return Board(layout, layout.pack(codes), self.blank)
+
+    def to_state(self, goal_state: State) -> State:
+        """
+        Converts the board back into a State of Tile objects.
+
+        Args:
+            goal_state (State): The goal state providing the tile values of each code.
+
+        Returns:
+            State: The converted state.
+        """
+        size = self.layout.size
+        col_count = self.layout.col_count
+        tiles_by_code = {tile.scale_value % size: tile for tile in goal_state.state}
+        tiles = []
+        for index, code in enumerate(self.to_codes()):
+            tile = tiles_by_code[code]
+            row, col = divmod(index, col_count)
+            tiles.append(
+                Tile(
+                    tile.val,
+                    row,
+                    col,
+                    tile.scale_value,
+                    getattr(tile, "duplicated", None),
+                    tile.real_val,
+                )
+            )
+        return State(tiles, goal_state.tile_mode, goal_state.repeat_mode)
+
+    def to_codes(self) -> List[int]:
+        """
+        Returns the tile codes of the board.
+
+        Returns:
+            List[int]: The tile codes in cell order.
+        """
+        return self.layout.unpack(self.key)
+
+    def code_at(self, index: int) -> int:
+        """
+        Returns the tile code at the given cell.
+
+        Args:
+            index (int): The cell index.
+
+        Returns:
+            int: The tile code at the cell.
+        """
+        return (self.key >> self.layout.shifts[index]) & self.layout.mask
+
+    def is_goal(self) -> bool:
+        """
+        Checks if the board is the goal board.
+
+        Returns:
+            bool: True if the board is the goal board, False otherwise.
+        """
+        return self.key == self.layout.goal_key
+
+    def is_solvable(self) -> bool:
+        """
+        Checks if the goal board can be reached from the board.
+
+        Every move swaps the blank with a tile, so the parity of the permutation
+        (blank included) changes together with the parity of the blank's distance
+        to its goal cell. The board is solvable if both parities match.
+
+        Returns:
+            bool: True if the board is solvable, False otherwise.
+        """
+        size, col_count = self.layout.size, self.layout.col_count
+        # Goal cell of the tile on every cell
+        targets = [(code - 1) % size for code in self.to_codes()]
+        blank_row, blank_col = divmod(self.blank, col_count)
+        blank_distance = (self.layout.row_count - 1 - blank_row) + (col_count - 1 - blank_col)
+        return Ranking.is_even(targets) == (blank_distance % 2 == 0)
+
+    def get_neighbors(self) -> List[Tuple["Board", str]]:
+        """
+        Returns a list of neighbouring boards and the corresponding move.
+
+        Returns:
+            List[Tuple[Board, str]]: A list of tuples containing the neighbouring boards and the corresponding move.
+        """
+        key, layout, mask = self.key, self.layout, self.layout.mask
+        return [
+            (Board(layout, key + ((key >> shift) & mask) * factor, target), move)
+            for target, move, factor, shift in layout.transitions[self.blank]
+        ]
+
+    def apply_move(self, move: str) -> "Board":
+        """
+        Returns the board reached by moving the blank tile in the given direction.
+
+        Args:
+            move (str): The move, one of the keys of Moves.moves_dict.
+
+        Returns:
+            Board: The board after the move.
+
+        Raises:
+            ValueError: If the move leaves the board.
+        """
+        for target, name, factor, shift in self.layout.transitions[self.blank]:
+            if name == move:
+                value = (self.key >> shift) & self.layout.mask
+                return Board(self.layout, self.key + value * factor, target)
+        raise ValueError(f"Illegal move '{move}' for blank at cell {self.blank}")
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Board) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
@@ -0,0 +1,288 @@
+from collections import deque
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+from game.board import BoardLayout
+from game.pattern_database import PatternDatabase
+
+
+class HeuristicType(Enum):
+    """
+    Enum class representing the admissible heuristics of the informed solver engines.
+
+    Attributes:
+        MANHATTAN (str): Sum of the Manhattan distances of all tiles to their goal cells.
+        LINEAR_CONFLICT (str): Extra moves for tiles in their goal line but in reversed order. Stacks on MANHATTAN.
+        WALKING_DISTANCE (str): Row and column walking distances computed from precomputed tables.
+        PATTERN_DATABASE (str): Sum of disjoint additive pattern databases, see game.pattern_database.
+    """
+
+    MANHATTAN = "manhattan"
+    LINEAR_CONFLICT = "linear_conflict"
+    WALKING_DISTANCE = "walking_distance"
+    PATTERN_DATABASE = "pattern_database"
+
+
+class WalkingDistanceTable:
+    """
+    Distance table of the walking distance heuristic for one axis of a board shape.
+
+    A configuration counts, for every line (row or column) of the board, how many
+    tiles of each goal line it currently holds, plus the line of the blank tile.
+    The table stores the number of moves along the axis needed to reach the goal
+    configuration, computed once by a breadth-first search from the goal.
+
+    Attributes:
+        line_count (int): The number of lines along the axis.
+        line_length (int): The number of cells per line.
+        distances (Dict[Tuple[int, ...], int]): The distance of every reachable configuration.
+    """
+
+    _tables: Dict[Tuple[int, int], "WalkingDistanceTable"] = {}
+
+    def __init__(self, line_count: int, line_length: int):
+        """
+        Initializes a new instance of the WalkingDistanceTable class.
+
+        Args:
+            line_count (int): The number of lines along the axis.
+            line_length (int): The number of cells per line.
+        """
+        self.line_count: int = line_count
+        self.line_length: int = line_length
+        self.distances: Dict[Tuple[int, ...], int] = {}
+        # The goal configuration: every line holds its own tiles, the blank is in the last line
+        counts = [0] * (line_count * line_count)
+        for line in range(line_count):
+            counts[line * line_count + line] = line_length
+        counts[-1] -= 1
+        goal = tuple(counts) + (line_count - 1,)
+        self.distances[goal] = 0
+        queue = deque([goal])
+        while queue:
+            config = queue.popleft()
+            distance = self.distances[config] + 1
+            blank_line = config[-1]
+            for other_line in (blank_line - 1, blank_line + 1):
+                if not 0 <= other_line < line_count:
+                    continue
+                # Move one tile of each goal line from the other line into the blank line
+                for goal_line in range(line_count):
+                    source = other_line * line_count + goal_line
+                    if config[source] == 0:
+                        continue
+                    new_config = list(config)
+                    new_config[source] -= 1
+                    new_config[blank_line * line_count + goal_line] += 1
+                    new_config[-1] = other_line
+                    new_config = tuple(new_config)
+                    if new_config not in self.distances:
+                        self.distances[new_config] = distance
+                        queue.append(new_config)
+
+    @staticmethod
+    def get(line_count: int, line_length: int) -> "WalkingDistanceTable":
+        """
+        Returns the shared table for the given axis dimensions, building it on first use.
+
+        Args:
+            line_count (int): The number of lines along the axis.
+            line_length (int): The number of cells per line.
+
+        Returns:
+            WalkingDistanceTable: The walking distance table.
+        """
+        table = WalkingDistanceTable._tables.get((line_count, line_length))
+        if table is None:
+            table = WalkingDistanceTable(line_count, line_length)
+            WalkingDistanceTable._tables[(line_count, line_length)] = table
+        return table
+
+
+class Heuristic:
+    """
+    Admissible estimate of the number of moves from a board to the goal board.
+
+    The selected heuristics are stacked: Manhattan distance and linear conflict are
+    added, walking distance and the pattern databases are combined with the sum by
+    taking the maximum, so the result stays admissible.
+
+    On canonical boards with interchangeable identical tiles (see Board.canonical)
+    a tile may end on any goal cell of its value, so its Manhattan distance is the
+    distance to the nearest of these cells. Linear conflict, walking distance and
+    the pattern databases assume one goal cell per tile and are not admissible on
+    such boards; they are replaced by the Manhattan distance.
+
+    Attributes:
+        layout (BoardLayout): The layout of the boards to estimate.
+        heuristic_types (List[HeuristicType]): The selected heuristics.
+    """
+
+    def __init__(
+        self,
+        layout: BoardLayout,
+        heuristic_types: List[HeuristicType],
+        code_classes: Optional[List[int]] = None,
+    ):
+        """
+        Initializes a new instance of the Heuristic class.
+
+        Args:
+            layout (BoardLayout): The layout of the boards to estimate.
+            heuristic_types (List[HeuristicType]): The selected heuristics.
+            code_classes (Optional[List[int]], optional): The class code of every tile code for
+                canonical boards with interchangeable identical tiles. Defaults to None.
+        """
+        self.layout: BoardLayout = layout
+        self.heuristic_types: List[HeuristicType] = heuristic_types
+        if code_classes is not None:
+            heuristic_types = [HeuristicType.MANHATTAN]
+        self.use_linear_conflict: bool = HeuristicType.LINEAR_CONFLICT in heuristic_types
+        # Linear conflict is only admissible on top of the Manhattan distance
+        self.use_manhattan: bool = (
+            HeuristicType.MANHATTAN in heuristic_types or self.use_linear_conflict
+        )
+        self.use_walking_distance: bool = (
+            HeuristicType.WALKING_DISTANCE in heuristic_types
+        )
+        size, col_count = layout.size, layout.col_count
+        # Goal row and column of every tile code, the blank has none
+        self.goal_rows: List[int] = [-1] + [(code - 1) // col_count for code in range(1, size)]
+        self.goal_cols: List[int] = [-1] + [(code - 1) % col_count for code in range(1, size)]
+        # Manhattan distance of every tile code on every cell
+        self.manhattan: List[List[int]] = [[0] * size]
+        for code in range(1, size):
+            self.manhattan.append(
+                [
+                    abs(index // col_count - self.goal_rows[code])
+                    + abs(index % col_count - self.goal_cols[code])
+                    for index in range(size)
+                ]
+            )
+        if code_classes is not None:
+            # A class code may end on the goal cell of any code of its class
+            for code in range(1, size):
+                value_class = code_classes[code]
+                if value_class != code:
+                    self.manhattan[value_class] = [
+                        min(distances)
+                        for distances in zip(self.manhattan[value_class], self.manhattan[code])
+                    ]
+        self.conflicts_cache: Dict[Tuple[int, ...], int] = {}
+        self.pattern_databases: List[PatternDatabase] = []
+        if HeuristicType.PATTERN_DATABASE in heuristic_types:
+            self.pattern_databases = PatternDatabase.get_partition(
+                layout.row_count, layout.col_count
+            )
+        if self.use_walking_distance:
+            self.row_table = WalkingDistanceTable.get(layout.row_count, layout.col_count)
+            self.col_table = WalkingDistanceTable.get(layout.col_count, layout.row_count)
+
+    def estimate(self, codes: List[int]) -> int:
+        """
+        Estimates the number of moves needed to reach the goal.
+
+        Args:
+            codes (List[int]): The tile codes of the board in cell order.
+
+        Returns:
+            int: A lower bound on the number of moves to the goal.
+        """
+        estimate = 0
+        if self.use_manhattan:
+            manhattan = self.manhattan
+            estimate = sum(manhattan[code][index] for index, code in enumerate(codes))
+            if self.use_linear_conflict:
+                estimate += self.linear_conflict(codes)
+        if self.use_walking_distance:
+            estimate = max(estimate, self.walking_distance(codes))
+        if self.pattern_databases:
+            # Cell of every tile code, shared by the lookups of all patterns
+            positions = [0] * len(codes)
+            for cell, code in enumerate(codes):
+                positions[code] = cell
+            estimate = max(
+                estimate,
+                sum(database.lookup_positions(positions) for database in self.pattern_databases),
+            )
+        return estimate
+
+    def linear_conflict(self, codes: List[int]) -> int:
+        """
+        Computes the linear conflict term of a board.
+
+        In every row (column) the tiles that belong to it must be reordered if their
+        goal columns (rows) are not increasing; each tile that has to leave the line
+        to let the others pass costs two extra moves.
+
+        Args:
+            codes (List[int]): The tile codes of the board in cell order.
+
+        Returns:
+            int: The number of extra moves caused by linear conflicts.
+        """
+        row_count, col_count = self.layout.row_count, self.layout.col_count
+        conflicts = 0
+        for row in range(row_count):
+            line = tuple(
+                self.goal_cols[code]
+                for code in codes[row * col_count : (row + 1) * col_count]
+                if code and self.goal_rows[code] == row
+            )
+            conflicts += self.line_conflicts(line)
+        for col in range(col_count):
+            line = tuple(
+                self.goal_rows[code]
+                for code in codes[col::col_count]
+                if code and self.goal_cols[code] == col
+            )
+            conflicts += self.line_conflicts(line)
+        return 2 * conflicts
+
+    def line_conflicts(self, line: Tuple[int, ...]) -> int:
+        """
+        Returns the number of tiles that must leave a line to resolve its conflicts.
+
+        Args:
+            line (Tuple[int, ...]): The goal offsets of the line's own tiles in their current order.
+
+        Returns:
+            int: The line length minus its longest increasing subsequence.
+        """
+        if len(line) < 2:
+            return 0
+        conflicts = self.conflicts_cache.get(line)
+        if conflicts is None:
+            longest = [1] * len(line)
+            for i in range(len(line)):
+                for j in range(i):
+                    if line[j] < line[i] and longest[j] + 1 > longest[i]:
+                        longest[i] = longest[j] + 1
+            conflicts = len(line) - max(longest)
+            self.conflicts_cache[line] = conflicts
+        return conflicts
+
+    def walking_distance(self, codes: List[int]) -> int:
+        """
+        Computes the walking distance of a board.
+
+        Args:
+            codes (List[int]): The tile codes of the board in cell order.
+
+        Returns:
+            int: The sum of the vertical and horizontal walking distances.
+        """
+        row_count, col_count = self.layout.row_count, self.layout.col_count
+        row_counts = [0] * (row_count * row_count)
+        col_counts = [0] * (col_count * col_count)
+        blank_row = blank_col = 0
+        for index, code in enumerate(codes):
+            row, col = divmod(index, col_count)
+            if code == 0:
+                blank_row, blank_col = row, col
+                continue
+            row_counts[row * row_count + self.goal_rows[code]] += 1
+            col_counts[col * col_count + self.goal_cols[code]] += 1
+        return (
+            self.row_table.distances[tuple(row_counts) + (blank_row,)]
+            + self.col_table.distances[tuple(col_counts) + (blank_col,)]
+        )
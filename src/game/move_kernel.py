@@ -0,0 +1,264 @@
+from typing import Dict, List, Optional, Tuple
+from game.board import Board, BoardLayout
+from game.heuristics import Heuristic
+from game.pattern_database import PatternDatabase
+
+
+class MoveKernel:
+    """
+    Mutable board of the depth-first engines, moved in place and undone on backtrack.
+
+    The kernel keeps the tile codes of one board in a list and moves the blank by
+    writing two cells, so the search creates no boards, lists or tuples per node.
+    The Manhattan distance and the linear conflicts are updated by per-move deltas:
+    the Manhattan distance changes by the precomputed distances of the moved tile
+    on its old and new cell, and a move only changes the conflicts of the two
+    lines the tile leaves and enters across the move (the rows of a vertical move,
+    the columns of a horizontal one). The contents of every row and column are kept
+    as packed integers, and the conflicts of a line are memoized per packed line,
+    so a delta costs two dictionary lookups once the lines have been seen.
+
+    The pattern databases partition the tiles, so a move changes the entry of the
+    one pattern holding the moved tile. The kernel keeps the cells of the table
+    tiles of every pattern, updates the cell of the moved tile and reads only that
+    pattern's entry again; the Manhattan part of the pattern estimate is the
+    incremental Manhattan distance, as the patterns cover all tiles.
+
+    Walking distance has no per-move delta; with it the estimate is computed from
+    the tile list of the kernel (see estimate).
+
+    Attributes:
+        layout (BoardLayout): The layout of the board.
+        heuristic (Heuristic): The heuristic of the search.
+        incremental (bool): True if the estimate is kept by per-move deltas.
+        codes (List[int]): The tile code of every cell, changed in place.
+        blank (int): The cell of the blank.
+        key (int): The packed board, kept for goal tests and cache lookups.
+        manhattan (int): The Manhattan distance of the board.
+        conflicts (int): The number of tiles that must leave their line, half the linear conflict term.
+        pattern_entries (int): The sum of the pattern database entries, half the moves the pattern
+            estimate adds to the Manhattan distance.
+    """
+
+    def __init__(self, board: Board, heuristic: Heuristic):
+        """
+        Initializes a new instance of the MoveKernel class.
+
+        Args:
+            board (Board): The start board.
+            heuristic (Heuristic): The heuristic of the search.
+        """
+        layout: BoardLayout = board.layout
+        self.layout: BoardLayout = layout
+        self.heuristic: Heuristic = heuristic
+        # Walking distance has no per-move delta
+        self.incremental: bool = not heuristic.use_walking_distance and bool(
+            heuristic.use_manhattan or heuristic.pattern_databases
+        )
+        self.use_manhattan: bool = heuristic.use_manhattan
+        self.use_linear_conflict: bool = self.incremental and heuristic.use_linear_conflict
+        self.pattern_databases: List[PatternDatabase] = (
+            heuristic.pattern_databases if self.incremental else []
+        )
+        size, row_count, col_count, bits = (
+            layout.size,
+            layout.row_count,
+            layout.col_count,
+            layout.bits,
+        )
+        self.codes: List[int] = board.to_codes()
+        self.blank: int = board.blank
+        self.key: int = board.key
+        # Change of the packed key when the tile on a cell moves into the blank,
+        # per tile code unit, indexed by blank * size + cell
+        self.factors: List[int] = [0] * (size * size)
+        for blank in range(size):
+            for target, _, factor, _ in layout.transitions[blank]:
+                self.factors[blank * size + target] = factor
+        self.rows: List[int] = [index // col_count for index in range(size)]
+        self.cols: List[int] = [index % col_count for index in range(size)]
+        # Bit offset of a cell within the packed contents of its row and of its column
+        self.row_shifts: List[int] = [(index % col_count) * bits for index in range(size)]
+        self.col_shifts: List[int] = [(index // col_count) * bits for index in range(size)]
+        # Packed contents of every row and column
+        self.row_keys: List[int] = [0] * row_count
+        self.col_keys: List[int] = [0] * col_count
+        for index, code in enumerate(self.codes):
+            self.row_keys[self.rows[index]] |= code << self.row_shifts[index]
+            self.col_keys[self.cols[index]] |= code << self.col_shifts[index]
+        # Conflicts of every packed line, memoized per row and per column
+        self.row_tables: List[Dict[int, int]] = [{} for _ in range(row_count)]
+        self.col_tables: List[Dict[int, int]] = [{} for _ in range(col_count)]
+        self.manhattan: int = 0
+        self.conflicts: int = 0
+        self.row_conflicts: List[int] = [0] * row_count
+        self.col_conflicts: List[int] = [0] * col_count
+        if self.incremental:
+            self.manhattan = sum(
+                heuristic.manhattan[code][index] for index, code in enumerate(self.codes)
+            )
+        # Pattern and slot of every tile code in the table tiles, None for the blank
+        self.tile_slots: List[Optional[Tuple[int, int]]] = [None] * size
+        # Cells of the table tiles of every pattern, its transposed cells for transposed patterns
+        self.table_positions: List[List[int]] = []
+        self.cell_maps: List[Optional[List[int]]] = []
+        self.entries: List[int] = []
+        positions = [0] * size
+        for index, code in enumerate(self.codes):
+            positions[code] = index
+        for database_index, database in enumerate(self.pattern_databases):
+            for slot, code in enumerate(database.lookup_codes):
+                self.tile_slots[code] = (database_index, slot)
+            table_positions = database.get_table_positions(positions)
+            self.table_positions.append(table_positions)
+            self.cell_maps.append(database.cells)
+            self.entries.append(database.get_entry(table_positions))
+        self.pattern_entries: int = sum(self.entries)
+        if self.use_linear_conflict:
+            self.row_conflicts = [self.get_row_conflicts(row) for row in range(row_count)]
+            self.col_conflicts = [self.get_col_conflicts(col) for col in range(col_count)]
+            self.conflicts = sum(self.row_conflicts) + sum(self.col_conflicts)
+
+    def get_row_conflicts(self, row: int) -> int:
+        """
+        Returns the conflicts of a row, computed on the first visit of its contents.
+
+        Args:
+            row (int): The row.
+
+        Returns:
+            int: The number of tiles that must leave the row.
+        """
+        row_key = self.row_keys[row]
+        conflicts = self.row_tables[row].get(row_key)
+        if conflicts is None:
+            col_count, bits, mask = self.layout.col_count, self.layout.bits, self.layout.mask
+            goal_rows, goal_cols = self.heuristic.goal_rows, self.heuristic.goal_cols
+            codes = [(row_key >> (col * bits)) & mask for col in range(col_count)]
+            conflicts = self.heuristic.line_conflicts(
+                tuple(goal_cols[code] for code in codes if code and goal_rows[code] == row)
+            )
+            self.row_tables[row][row_key] = conflicts
+        return conflicts
+
+    def get_col_conflicts(self, col: int) -> int:
+        """
+        Returns the conflicts of a column, computed on the first visit of its contents.
+
+        Args:
+            col (int): The column.
+
+        Returns:
+            int: The number of tiles that must leave the column.
+        """
+        col_key = self.col_keys[col]
+        conflicts = self.col_tables[col].get(col_key)
+        if conflicts is None:
+            row_count, bits, mask = self.layout.row_count, self.layout.bits, self.layout.mask
+            goal_rows, goal_cols = self.heuristic.goal_rows, self.heuristic.goal_cols
+            codes = [(col_key >> (row * bits)) & mask for row in range(row_count)]
+            conflicts = self.heuristic.line_conflicts(
+                tuple(goal_rows[code] for code in codes if code and goal_cols[code] == col)
+            )
+            self.col_tables[col][col_key] = conflicts
+        return conflicts
+
+    def estimate(self) -> int:
+        """
+        Estimates the number of moves from the current board to the goal.
+
+        Returns:
+            int: The estimate of the heuristic, equal to Heuristic.estimate of the board.
+        """
+        if not self.incremental:
+            return self.heuristic.estimate(self.codes)
+        estimate = self.manhattan + 2 * self.conflicts if self.use_manhattan else 0
+        if self.pattern_databases:
+            # The pattern estimate and the Manhattan-based one are combined by their maximum
+            pattern_estimate = self.manhattan + 2 * self.pattern_entries
+            if pattern_estimate > estimate:
+                estimate = pattern_estimate
+        return estimate
+
+    def make(self, target: int) -> None:
+        """
+        Moves the tile on a neighbouring cell of the blank into the blank, in place.
+
+        Args:
+            target (int): The cell the blank moves to.
+        """
+        codes = self.codes
+        blank = self.blank
+        tile = codes[target]
+        codes[blank] = tile
+        codes[target] = 0
+        self.blank = target
+        self.key += tile * self.factors[blank * self.layout.size + target]
+        if not self.incremental:
+            return
+        distances = self.heuristic.manhattan[tile]
+        self.manhattan += distances[blank] - distances[target]
+        if self.pattern_databases:
+            # Only the pattern of the moved tile changes its entry
+            database_index, slot = self.tile_slots[tile]
+            cells = self.cell_maps[database_index]
+            table_positions = self.table_positions[database_index]
+            table_positions[slot] = cells[blank] if cells is not None else blank
+            entry = self.pattern_databases[database_index].get_entry(table_positions)
+            self.pattern_entries += entry - self.entries[database_index]
+            self.entries[database_index] = entry
+        if not self.use_linear_conflict:
+            return
+        rows, cols = self.rows, self.cols
+        row_keys, col_keys = self.row_keys, self.col_keys
+        if rows[blank] != rows[target]:
+            # A vertical move keeps the order of the column and changes both rows
+            shift = self.row_shifts[target]
+            row_keys[rows[target]] -= tile << shift
+            row_keys[rows[blank]] += tile << shift
+            col_keys[cols[target]] += tile * (
+                (1 << self.col_shifts[blank]) - (1 << self.col_shifts[target])
+            )
+            row_conflicts = self.row_conflicts
+            # The tile leaves the row of the target cell and enters the row of the blank
+            left_row, entered_row = rows[target], rows[blank]
+            left_conflicts = self.get_row_conflicts(left_row)
+            entered_conflicts = self.get_row_conflicts(entered_row)
+            self.conflicts += (
+                left_conflicts
+                + entered_conflicts
+                - row_conflicts[left_row]
+                - row_conflicts[entered_row]
+            )
+            row_conflicts[left_row] = left_conflicts
+            row_conflicts[entered_row] = entered_conflicts
+        else:
+            # A horizontal move keeps the order of the row and changes both columns
+            shift = self.col_shifts[target]
+            col_keys[cols[target]] -= tile << shift
+            col_keys[cols[blank]] += tile << shift
+            row_keys[rows[target]] += tile * (
+                (1 << self.row_shifts[blank]) - (1 << self.row_shifts[target])
+            )
+            col_conflicts = self.col_conflicts
+            # The tile leaves the column of the target cell and enters the column of the blank
+            left_col, entered_col = cols[target], cols[blank]
+            left_conflicts = self.get_col_conflicts(left_col)
+            entered_conflicts = self.get_col_conflicts(entered_col)
+            self.conflicts += (
+                left_conflicts
+                + entered_conflicts
+                - col_conflicts[left_col]
+                - col_conflicts[entered_col]
+            )
+            col_conflicts[left_col] = left_conflicts
+            col_conflicts[entered_col] = entered_conflicts
+
+    def unmake(self, previous_blank: int) -> None:
+        """
+        Undoes the last move by moving the blank back to its previous cell.
+
+        Args:
+            previous_blank (int): The cell of the blank before the last move.
+        """
+        self.make(previous_blank)
@@ -24,3 +24,14 @@ class Moves:
         "left": MovesEnum.LEFT,
         "right": MovesEnum.RIGHT,
     }
+
+    # The move that undoes each move
+    opposite_moves = {
+        "up": "down",
+        "down": "up",
+        "left": "right",
+        "right": "left",
+    }
+
+    # Move names by index, used to store moves as single bytes
+    move_names = list(moves_dict)
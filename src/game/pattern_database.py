@@ -0,0 +1,607 @@
+from collections import deque
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+from game.symmetry import Symmetry
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the tables are then built by the pure Python search
+    np = None
+
+# Disjoint tile partitions (tile codes) of the additive pattern databases per board shape.
+# The 4x4 partition splits the tiles above and below the main diagonal, which are
+# transposed patterns sharing one table (see PatternDatabase.get), and the diagonal
+DEFAULT_PARTITIONS: Dict[Tuple[int, int], List[Tuple[int, ...]]] = {
+    (3, 3): [(1, 2, 3, 4), (5, 6, 7, 8)],
+    (3, 4): [(1, 2, 5, 6, 9, 10), (3, 4, 7, 8, 11)],
+    (4, 4): [(2, 3, 4, 7, 8, 12), (5, 9, 10, 13, 14, 15), (1, 6, 11)],
+}
+# Tiles per pattern for board shapes without a predefined partition
+DEFAULT_PATTERN_SIZE: int = 4
+# File header: magic, format version, row count, column count, pattern size
+HEADER_FORMAT: str = "<4sBBBB"
+MAGIC: bytes = b"PDB\x00"
+VERSION: int = 1
+UNREACHED: int = 255
+# Number of search states expanded at once by the vectorised table build
+VECTOR_BLOCK_SIZE: int = 1 << 20
+
+
+class PatternDatabase:
+    """
+    Additive pattern database for one pattern (a subset of the tiles).
+
+    An entry holds the minimal number of moves of the pattern's own tiles needed
+    to bring them to their goal cells, for every placement of the pattern tiles.
+    Only moves of pattern tiles are counted, so the databases of a disjoint
+    partition can be added and stay admissible.
+
+    Entries are stored relative to the Manhattan distance of the pattern tiles:
+    the database value and the Manhattan distance have the same parity, so every
+    entry is (value - manhattan) // 2 capped at 15, packed two per byte. The file
+    is memory-mapped read-only, so all processes share one copy of the table.
+
+    On square boards a pattern and its transposed pattern (see game.symmetry)
+    have the same entries for transposed placements, so both are answered from
+    the table of one of them and the table files of a transposition-symmetric
+    partition need half the space and build time.
+
+    Attributes:
+        row_count (int): The number of rows of the board.
+        col_count (int): The number of columns of the board.
+        pattern (Tuple[int, ...]): The tile codes of the pattern.
+        table_pattern (Tuple[int, ...]): The tile codes of the pattern stored in the table file.
+        path (str): The path of the table file.
+        table (mmap.mmap): The memory-mapped table file.
+        offset (int): The offset of the first entry in the file.
+    """
+
+    _databases: Dict[Tuple[str, Tuple[int, ...]], "PatternDatabase"] = {}
+
+    def __init__(
+        self,
+        row_count: int,
+        col_count: int,
+        pattern: Tuple[int, ...],
+        path: str,
+        transposed: bool = False,
+    ):
+        """
+        Initializes a new instance of the PatternDatabase class by mapping an existing table file.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            pattern (Tuple[int, ...]): The tile codes of the pattern.
+            path (str): The path of the table file.
+            transposed (bool, optional): The file holds the table of the transposed pattern of a square
+                board, sorted by tile code. Defaults to False.
+        """
+        self.row_count: int = row_count
+        self.col_count: int = col_count
+        self.pattern: Tuple[int, ...] = pattern
+        self.table_pattern: Tuple[int, ...] = pattern
+        # Tile codes read from a board, one per table tile, and the transposed cell of every cell
+        self.lookup_codes: Tuple[int, ...] = pattern
+        self.cells: Optional[List[int]] = None
+        if transposed:
+            symmetry = Symmetry.get(row_count, col_count)
+            self.table_pattern = tuple(sorted(symmetry.codes[code] for code in pattern))
+            self.lookup_codes = tuple(symmetry.codes[code] for code in self.table_pattern)
+            self.cells = symmetry.cells
+        self.path: str = path
+        with open(path, "rb") as file:
+            self.table: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rows, cols, pattern_size = struct.unpack_from(
+            HEADER_FORMAT, self.table, 0
+        )
+        self.offset: int = struct.calcsize(HEADER_FORMAT) + pattern_size
+        stored_pattern = tuple(self.table[self.offset - pattern_size : self.offset])
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or (rows, cols) != (row_count, col_count)
+            or stored_pattern != self.table_pattern
+        ):
+            raise ValueError(f"Pattern database {path} does not match the requested pattern")
+        size = row_count * col_count
+        # Manhattan distance of every table tile on every cell
+        self.manhattan: List[List[int]] = [
+            [
+                abs(index // col_count - (code - 1) // col_count)
+                + abs(index % col_count - (code - 1) % col_count)
+                for index in range(size)
+            ]
+            for code in self.table_pattern
+        ]
+
+    @staticmethod
+    def get_path(row_count: int, col_count: int, pattern: Tuple[int, ...]) -> str:
+        """
+        Returns the path of the table file of a pattern.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            pattern (Tuple[int, ...]): The tile codes of the pattern.
+
+        Returns:
+            str: The path of the table file under assets/pdb.
+        """
+        dir_of_script = os.path.dirname(os.path.abspath(__file__))
+        pdb_path = os.path.join(dir_of_script, os.pardir, os.pardir, "assets", "pdb")
+        tiles = "-".join(str(code) for code in pattern)
+        return os.path.join(pdb_path, f"pdb_{row_count}x{col_count}_{tiles}.bin")
+
+    @staticmethod
+    def get(row_count: int, col_count: int, pattern: Tuple[int, ...]) -> "PatternDatabase":
+        """
+        Returns the mapped database of a pattern, building the table file on first use.
+
+        On square boards a pattern whose sorted transposed pattern comes first is
+        answered from the table of the transposed pattern.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            pattern (Tuple[int, ...]): The tile codes of the pattern.
+
+        Returns:
+            PatternDatabase: The pattern database.
+        """
+        table_pattern, transposed = PatternDatabase.get_table_pattern(row_count, col_count, pattern)
+        path = PatternDatabase.get_path(row_count, col_count, table_pattern)
+        database = PatternDatabase._databases.get((path, pattern))
+        if database is None:
+            if not os.path.exists(path):
+                PatternDatabase.build(row_count, col_count, table_pattern, path)
+            database = PatternDatabase(row_count, col_count, pattern, path, transposed)
+            PatternDatabase._databases[(path, pattern)] = database
+        return database
+
+    @staticmethod
+    def get_table_pattern(
+        row_count: int, col_count: int, pattern: Tuple[int, ...]
+    ) -> Tuple[Tuple[int, ...], bool]:
+        """
+        Returns the pattern whose table file answers the lookups of a pattern.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            pattern (Tuple[int, ...]): The tile codes of the pattern.
+
+        Returns:
+            Tuple[Tuple[int, ...], bool]: The table pattern and True if it is the sorted transposed pattern.
+        """
+        symmetry = Symmetry.get(row_count, col_count)
+        if symmetry is not None:
+            transposed_pattern = tuple(sorted(symmetry.codes[code] for code in pattern))
+            if transposed_pattern < tuple(sorted(pattern)):
+                return transposed_pattern, True
+        return pattern, False
+
+    @staticmethod
+    def get_partition(row_count: int, col_count: int) -> List["PatternDatabase"]:
+        """
+        Returns the databases of the default disjoint partition of a board shape.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            List[PatternDatabase]: One database per pattern of the partition.
+        """
+        return [
+            PatternDatabase.get(row_count, col_count, pattern)
+            for pattern in PatternDatabase.get_default_partition(row_count, col_count)
+        ]
+
+    @staticmethod
+    def get_default_partition(row_count: int, col_count: int) -> List[Tuple[int, ...]]:
+        """
+        Returns the default disjoint partition of the tile codes of a board shape.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            List[Tuple[int, ...]]: The tile codes of every pattern, covering all tiles.
+        """
+        partition = DEFAULT_PARTITIONS.get((row_count, col_count))
+        if partition is None:
+            codes = list(range(1, row_count * col_count))
+            partition = [
+                tuple(codes[i : i + DEFAULT_PATTERN_SIZE])
+                for i in range(0, len(codes), DEFAULT_PATTERN_SIZE)
+            ]
+        return partition
+
+    @staticmethod
+    def rank(positions: Sequence[int], size: int) -> int:
+        """
+        Ranks the cells of the pattern tiles as a partial permutation.
+
+        Args:
+            positions (Sequence[int]): The cell of every pattern tile.
+            size (int): The number of cells of the board.
+
+        Returns:
+            int: The rank in [0, size! / (size - len(positions))!).
+        """
+        rank = 0
+        for i, position in enumerate(positions):
+            # Number of free cells before the position
+            smaller = position
+            for previous in positions[:i]:
+                if previous < position:
+                    smaller -= 1
+            rank = rank * (size - i) + smaller
+        return rank
+
+    @staticmethod
+    def unrank(rank: int, pattern_size: int, size: int) -> List[int]:
+        """
+        Returns the cells of the pattern tiles of a rank.
+
+        Args:
+            rank (int): The rank of the partial permutation.
+            pattern_size (int): The number of pattern tiles.
+            size (int): The number of cells of the board.
+
+        Returns:
+            List[int]: The cell of every pattern tile.
+        """
+        digits = []
+        for i in reversed(range(pattern_size)):
+            rank, digit = divmod(rank, size - i)
+            digits.append(digit)
+        digits.reverse()
+        free = list(range(size))
+        return [free.pop(digit) for digit in digits]
+
+    @staticmethod
+    def build(row_count: int, col_count: int, pattern: Tuple[int, ...], path: str) -> None:
+        """
+        Builds the table file of a pattern by a retrograde search from the goal.
+
+        The search runs over the cells of the pattern tiles and the blank. Moving the
+        blank over a non-pattern cell is free, moving a pattern tile costs one move,
+        so a 0-1 breadth-first search yields the pattern distances. With numpy the
+        search expands whole blocks of states at once (see get_table_vectorised),
+        otherwise one state at a time (see get_table).
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            pattern (Tuple[int, ...]): The tile codes of the pattern.
+            path (str): The path of the table file to write.
+        """
+        if np is not None:
+            table = PatternDatabase.get_table_vectorised(row_count, col_count, pattern)
+        else:
+            table = PatternDatabase.get_table(row_count, col_count, pattern)
+        # Write to a temporary file first so that concurrent readers never see a partial table
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(
+                struct.pack(HEADER_FORMAT, MAGIC, VERSION, row_count, col_count, len(pattern))
+            )
+            file.write(bytes(pattern))
+            file.write(table)
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def get_table(row_count: int, col_count: int, pattern: Tuple[int, ...]) -> bytearray:
+        """
+        Computes the packed entries of a pattern by a 0-1 breadth-first search in pure Python.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            pattern (Tuple[int, ...]): The tile codes of the pattern.
+
+        Returns:
+            bytearray: The entries, two per byte, in placement rank order.
+        """
+        size = row_count * col_count
+        pattern_size = len(pattern)
+        rank = PatternDatabase.rank
+        entry_count = 1
+        for i in range(pattern_size):
+            entry_count *= size - i
+        # Neighbouring cells of every cell
+        neighbors = []
+        for index in range(size):
+            row, col = divmod(index, col_count)
+            cells = []
+            for new_row, new_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                if 0 <= new_row < row_count and 0 <= new_col < col_count:
+                    cells.append(new_row * col_count + new_col)
+            neighbors.append(cells)
+        # Distance of every (pattern placement, blank cell) pair
+        distances = bytearray([UNREACHED]) * (entry_count * size)
+        goal_positions = tuple(code - 1 for code in pattern)
+        start = rank(goal_positions, size) * size + (size - 1)
+        distances[start] = 0
+        queue = deque([(goal_positions, size - 1, 0)])
+        while queue:
+            positions, blank, distance = queue.popleft()
+            placement = rank(positions, size)
+            if distances[placement * size + blank] < distance:
+                continue  # Already settled with a smaller distance
+            for cell in neighbors[blank]:
+                if cell in positions:
+                    # Moving a pattern tile into the blank costs one move
+                    tile = positions.index(cell)
+                    new_positions = positions[:tile] + (blank,) + positions[tile + 1 :]
+                    new_index = rank(new_positions, size) * size + cell
+                    if distances[new_index] > distance + 1:
+                        distances[new_index] = distance + 1
+                        queue.append((new_positions, cell, distance + 1))
+                else:
+                    # Moving a non-pattern tile is free
+                    new_index = placement * size + cell
+                    if distances[new_index] > distance:
+                        distances[new_index] = distance
+                        queue.appendleft((positions, cell, distance))
+        # Minimum over all blank cells, stored relative to the Manhattan distance
+        table = bytearray((entry_count + 1) // 2)
+        for placement in range(entry_count):
+            value = min(distances[placement * size : (placement + 1) * size])
+            positions = PatternDatabase.unrank(placement, pattern_size, size)
+            manhattan = sum(
+                abs(position // col_count - (code - 1) // col_count)
+                + abs(position % col_count - (code - 1) % col_count)
+                for position, code in zip(positions, pattern)
+            )
+            entry = min(15, (value - manhattan) // 2)
+            table[placement >> 1] |= entry << ((placement & 1) * 4)
+        return table
+
+    @staticmethod
+    def rank_array(positions: "np.ndarray", size: int) -> "np.ndarray":
+        """
+        Ranks many placements at once, see rank.
+
+        Args:
+            positions (np.ndarray): An (n, pattern size) array with the cell of every pattern tile.
+            size (int): The number of cells of the board.
+
+        Returns:
+            np.ndarray: The rank of every placement.
+        """
+        ranks = np.zeros(len(positions), dtype=np.int64)
+        for i in range(positions.shape[1]):
+            position = positions[:, i]
+            # Number of free cells before the position
+            smaller = position.astype(np.int64)
+            for previous in range(i):
+                smaller -= positions[:, previous] < position
+            ranks = ranks * (size - i) + smaller
+        return ranks
+
+    @staticmethod
+    def unrank_array(count: int, pattern_size: int, size: int) -> "np.ndarray":
+        """
+        Returns the placements of the ranks 0 to count - 1, see unrank.
+
+        Args:
+            count (int): The number of placements.
+            pattern_size (int): The number of pattern tiles.
+            size (int): The number of cells of the board.
+
+        Returns:
+            np.ndarray: A (count, pattern_size) array with the cell of every pattern tile.
+        """
+        ranks = np.arange(count, dtype=np.int64)
+        digits = np.zeros((count, pattern_size), dtype=np.int8)
+        for i in reversed(range(pattern_size)):
+            ranks, digits[:, i] = np.divmod(ranks, size - i)
+        positions = np.zeros((count, pattern_size), dtype=np.int8)
+        for i in range(pattern_size):
+            # The digit-th free cell: skip every earlier tile on a cell up to it, in cell order
+            cell = digits[:, i].copy()
+            for previous in np.sort(positions[:, :i], axis=1).T:
+                cell += previous <= cell
+            positions[:, i] = cell
+        return positions
+
+    @staticmethod
+    def get_table_vectorised(
+        row_count: int, col_count: int, pattern: Tuple[int, ...]
+    ) -> bytearray:
+        """
+        Computes the packed entries of a pattern by a 0-1 breadth-first search over numpy arrays.
+
+        A search state is placement * size + blank cell. Every level first closes
+        the states of its distance under the free moves of the blank and then
+        moves the pattern tiles, which yields the next level; every step handles
+        a block of states with array operations.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            pattern (Tuple[int, ...]): The tile codes of the pattern.
+
+        Returns:
+            bytearray: The entries, two per byte, in placement rank order.
+        """
+        size = row_count * col_count
+        pattern_size = len(pattern)
+        entry_count = 1
+        for i in range(pattern_size):
+            entry_count *= size - i
+        positions = PatternDatabase.unrank_array(entry_count, pattern_size, size)
+        # Cells taken by the pattern tiles of every placement, one bit per cell
+        occupied = np.zeros(entry_count, dtype=np.int64)
+        for i in range(pattern_size):
+            occupied |= np.left_shift(1, positions[:, i].astype(np.int64))
+        # Neighbouring cell of every cell per direction, -1 off the board
+        directions = []
+        for row_step, col_step in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            cells = np.full(size, -1, dtype=np.int64)
+            for index in range(size):
+                row, col = divmod(index, col_count)
+                if 0 <= row + row_step < row_count and 0 <= col + col_step < col_count:
+                    cells[index] = (row + row_step) * col_count + col + col_step
+            directions.append(cells)
+        distances = np.full(entry_count * size, UNREACHED, dtype=np.uint8)
+        goal_positions = np.array([[code - 1 for code in pattern]], dtype=np.int8)
+        start = int(PatternDatabase.rank_array(goal_positions, size)[0]) * size + size - 1
+        distances[start] = 0
+        frontier = np.array([start], dtype=np.int64)
+        distance = 0
+        while len(frontier):
+            # Close the level under the free moves of the blank over non-pattern cells
+            level = [frontier]
+            queue = frontier
+            while len(queue):
+                reached = []
+                for block_start in range(0, len(queue), VECTOR_BLOCK_SIZE):
+                    states = queue[block_start : block_start + VECTOR_BLOCK_SIZE]
+                    placements, blanks = np.divmod(states, size)
+                    for cells in directions:
+                        targets = cells[blanks]
+                        free = targets >= 0
+                        free[free] = (occupied[placements[free]] >> targets[free]) & 1 == 0
+                        new_states = placements[free] * size + targets[free]
+                        new_states = np.unique(new_states[distances[new_states] == UNREACHED])
+                        distances[new_states] = distance
+                        reached.append(new_states)
+                queue = np.concatenate(reached) if reached else np.zeros(0, dtype=np.int64)
+                level.append(queue)
+            # Move a pattern tile into the blank from every state of the level
+            next_level = []
+            for states in level:
+                for block_start in range(0, len(states), VECTOR_BLOCK_SIZE):
+                    block = states[block_start : block_start + VECTOR_BLOCK_SIZE]
+                    placements, blanks = np.divmod(block, size)
+                    for cells in directions:
+                        targets = cells[blanks]
+                        moved = targets >= 0
+                        moved[moved] = (occupied[placements[moved]] >> targets[moved]) & 1 == 1
+                        moved_placements = placements[moved]
+                        sources = targets[moved]
+                        new_positions = positions[moved_placements]
+                        # The tile on the target cell moves onto the blank's cell
+                        tiles = np.argmax(new_positions == sources[:, None], axis=1)
+                        new_positions[np.arange(len(tiles)), tiles] = blanks[moved]
+                        new_states = (
+                            PatternDatabase.rank_array(new_positions, size) * size + sources
+                        )
+                        new_states = np.unique(new_states[distances[new_states] == UNREACHED])
+                        distances[new_states] = distance + 1
+                        next_level.append(new_states)
+            frontier = np.concatenate(next_level) if next_level else np.zeros(0, dtype=np.int64)
+            distance += 1
+        # Minimum over all blank cells, stored relative to the Manhattan distance
+        values = distances.reshape(entry_count, size).min(axis=1).astype(np.int64)
+        manhattan = np.zeros(entry_count, dtype=np.int64)
+        for i, code in enumerate(pattern):
+            rows, cols = np.divmod(positions[:, i].astype(np.int64), col_count)
+            manhattan += np.abs(rows - (code - 1) // col_count) + np.abs(
+                cols - (code - 1) % col_count
+            )
+        entries = np.minimum(15, (values - manhattan) // 2).astype(np.uint8)
+        if entry_count % 2:
+            entries = np.append(entries, np.uint8(0))
+        return bytearray((entries[0::2] | (entries[1::2] << 4)).tobytes())
+
+    @staticmethod
+    def is_built(row_count: int, col_count: int) -> bool:
+        """
+        Checks if the table files of the default partition of a board shape exist.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            bool: True if get_partition maps existing files without building any table.
+        """
+        return all(
+            os.path.exists(
+                PatternDatabase.get_path(
+                    row_count,
+                    col_count,
+                    PatternDatabase.get_table_pattern(row_count, col_count, pattern)[0],
+                )
+            )
+            for pattern in PatternDatabase.get_default_partition(row_count, col_count)
+        )
+
+    @staticmethod
+    def has_fast_build() -> bool:
+        """
+        Checks if missing tables are built by the vectorised search (see get_table_vectorised).
+
+        Returns:
+            bool: True if numpy is installed, the 4x4 tables then take about a minute instead of a quarter of an hour.
+        """
+        return np is not None
+
+    def get_table_positions(self, positions: Sequence[int]) -> List[int]:
+        """
+        Returns the cells of the table tiles, in table order.
+
+        Args:
+            positions (Sequence[int]): The cell of every tile code of the board.
+
+        Returns:
+            List[int]: The cell of every table tile, on the transposed board for a transposed pattern.
+        """
+        table_positions = [positions[code] for code in self.lookup_codes]
+        if self.cells is not None:
+            # Cells of the table tiles on the transposed board
+            table_positions = [self.cells[position] for position in table_positions]
+        return table_positions
+
+    def get_entry(self, table_positions: Sequence[int]) -> int:
+        """
+        Returns the stored entry of a placement, half the moves above the Manhattan distance.
+
+        Args:
+            table_positions (Sequence[int]): The cell of every table tile (see get_table_positions).
+
+        Returns:
+            int: The entry, at most 15.
+        """
+        placement = PatternDatabase.rank(table_positions, self.row_count * self.col_count)
+        return (self.table[self.offset + (placement >> 1)] >> ((placement & 1) * 4)) & 15
+
+    def lookup_positions(self, positions: Sequence[int]) -> int:
+        """
+        Returns the number of pattern tile moves needed to solve the pattern.
+
+        Args:
+            positions (Sequence[int]): The cell of every tile code of the board.
+
+        Returns:
+            int: A lower bound on the moves of the pattern tiles.
+        """
+        table_positions = self.get_table_positions(positions)
+        manhattan = 0
+        for distances, position in zip(self.manhattan, table_positions):
+            manhattan += distances[position]
+        return manhattan + 2 * self.get_entry(table_positions)
+
+    def lookup(self, codes: List[int]) -> int:
+        """
+        Returns the number of pattern tile moves needed to solve the pattern.
+
+        Args:
+            codes (List[int]): The tile codes of the board in cell order.
+
+        Returns:
+            int: A lower bound on the moves of the pattern tiles.
+        """
+        positions = [0] * len(codes)
+        for cell, code in enumerate(codes):
+            positions[code] = cell
+        return self.lookup_positions(positions)
@@ -1,19 +1,51 @@
-from multiprocessing import Pool, cpu_count
+from multiprocessing import Pool, TimeoutError, cpu_count
 import os
-import pickle
-import random
-from typing import List
-from game.tiles import TileMode, DuplicationMode
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from game.tiles import Tile, TileMode, DuplicationMode
 from game.state import State
-from game.solver import Solver
+from game.state_space import StateSpace
+from game.state_store import StateStore
+from game.solver import (
+    AUTO_A_STAR_MAX_SIZE,
+    AUTO_OPTIMAL_MAX_SIZE,
+    DEFAULT_WEIGHT,
+    Solver,
+    SolverEngine,
+)
+from game.heuristics import HeuristicType
+from game.pattern_database import PatternDatabase
+from game.solution_table import SolutionTable
+from game.solution_archive import SolutionArchive, SolutionOutput
+from game.search_stats import SearchStats
+from game.search_budget import BudgetOutcome, SearchBudget
 from game.utils import PuzzleUtils as utils
-import os
 from datetime import datetime
+from string import ascii_uppercase
 import time
 from enum import Enum
 
 
+# Number of chunks each worker receives on average, more chunks balance uneven solve times
+# at the cost of more inter-process messages
+CHUNKS_PER_WORKER: int = 16
+# Largest number of state indices sent to a worker at once
+MAX_CHUNKSIZE: int = 256
+# Smallest number of rows and columns of a board
+MIN_SIDE_LENGTH: int = 2
+# Largest number of rows and columns of a board, stored as single bytes in the asset headers
+MAX_SIDE_LENGTH: int = 255
+# Longest time in seconds between two checks of the cancel event while waiting for a result
+CANCEL_POLL_SECONDS: float = 0.2
+
+
 class PuzzleSize(Enum):
+    """
+    Enum class representing the predefined board shapes as (rows, columns).
+
+    Any other shape can be passed to Puzzle as a (rows, columns) tuple.
+    """
+
     SMALL = (3, 3)
     MEDIUM = (3, 4)
     LARGE = (4, 4)
@@ -24,10 +56,19 @@ class Puzzle:
     Represents a puzzle game.
 
     Args:
-        size (PuzzleSize): The size of the puzzle.
+        size (Union[PuzzleSize, Tuple[int, int]]): The size of the puzzle, a predefined size or (rows, columns).
         tile_mode (TileMode, optional): The mode for generating puzzle tiles. Defaults to TileMode.NUMBERS.
         duplication_mode (DuplicationMode, optional): The mode for duplicating puzzle tiles. Defaults to DuplicationMode.UNIQUE.
         duplicate_count (int, optional): The number of times to duplicate each tile. Defaults to None.
+        engine (SolverEngine, optional): The search engine of the solver. Defaults to SolverEngine.BFS.
+        heuristics (List[HeuristicType], optional): The heuristics of the informed engines. Defaults to None.
+        output (SolutionOutput, optional): Where solved puzzles are written to. Defaults to SolutionOutput.ARCHIVE.
+        use_cache (bool, optional): Reuse optimal solutions across runs (see game.solution_cache). Defaults to False.
+        collect_stats (bool, optional): Write search statistics of every puzzle to run_stats.txt. Defaults to False.
+        budget (SearchBudget, optional): The limits of every search (see game.search_budget). Defaults to None.
+        weight (float, optional): The heuristic weight of SolverEngine.WEIGHTED_A_STAR. Defaults to DEFAULT_WEIGHT.
+        interchangeable_duplicates (bool, optional): Treat duplicated tiles as interchangeable, so any
+            arrangement of the goal's visible values solves a puzzle. Defaults to False.
 
     Attributes:
         row_count (int): The number of rows in the puzzle.
@@ -36,26 +77,87 @@ class Puzzle:
         duplication_mode (DuplicationMode): The mode for duplicating puzzle tiles.
         duplicate_count (int): The number of times each tile is duplicated.
         dir_path (str): The directory path for saving solved states.
+        engine (SolverEngine): The search engine of the solver.
+        heuristics (List[HeuristicType]): The heuristics of the informed engines, None for the solver defaults.
+        output (SolutionOutput): Where solved puzzles are written to.
+        use_cache (bool): True if the solvers use the persistent solution cache.
+        collect_stats (bool): True if the solvers collect search statistics.
+        budget (Optional[SearchBudget]): The limits of every search, None for no limits.
+        weight (float): The heuristic weight of SolverEngine.WEIGHTED_A_STAR.
+        interchangeable_duplicates (bool): True if duplicated tiles are interchangeable.
 
     Methods:
         solve_puzzle: Solves a puzzle using a solver.
+        init_worker: Stores the puzzle and its state space in a worker process.
+        solve_state_index: Solves the state with the given index in a worker process.
         start: Starts the puzzle solving process.
+        get_dimensions: Returns the number of rows and columns of a puzzle size.
         get_states: Retrieves or generates all possible states of the puzzle.
     """
 
+    # Puzzle and state space of the current worker process, set once by init_worker
+    worker_puzzle: Optional["Puzzle"] = None
+    worker_states: Optional[StateSpace] = None
+
     def __init__(
         self,
-        size: PuzzleSize,
+        size: Union[PuzzleSize, Tuple[int, int]],
         tile_mode: TileMode = TileMode.NUMBERS,
         duplication_mode: DuplicationMode = DuplicationMode.UNIQUE,
         duplicate_count: int = None,
+        engine: SolverEngine = SolverEngine.BFS,
+        heuristics: List[HeuristicType] = None,
+        output: SolutionOutput = SolutionOutput.ARCHIVE,
+        use_cache: bool = False,
+        collect_stats: bool = False,
+        budget: Optional[SearchBudget] = None,
+        weight: float = DEFAULT_WEIGHT,
+        interchangeable_duplicates: bool = False,
     ):
-        self.row_count: int = size.value[0]
-        self.col_count: int = size.value[1]
+        self.row_count: int
+        self.col_count: int
+        self.row_count, self.col_count = Puzzle.get_dimensions(size)
+        # The letters mode has one letter per tile
+        if tile_mode == TileMode.LETTERS and self.row_count * self.col_count - 1 > len(ascii_uppercase):
+            raise ValueError(
+                f"The letters mode supports at most {len(ascii_uppercase) + 1} cells, "
+                f"got {self.row_count}x{self.col_count}"
+            )
         self.tile_mode: TileMode = tile_mode
         self.duplication_mode: DuplicationMode = duplication_mode
         self.duplicate_count: int = duplicate_count
         self.dir_path: str = None
+        self.engine: SolverEngine = engine
+        self.heuristics: List[HeuristicType] = heuristics
+        self.output: SolutionOutput = output
+        self.use_cache: bool = use_cache
+        self.collect_stats: bool = collect_stats
+        self.budget: Optional[SearchBudget] = budget
+        self.weight: float = weight
+        self.interchangeable_duplicates: bool = interchangeable_duplicates
+
+    @staticmethod
+    def get_dimensions(size: Union[PuzzleSize, Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        Returns the number of rows and columns of a puzzle size.
+
+        Args:
+            size (Union[PuzzleSize, Tuple[int, int]]): A predefined size or (rows, columns).
+
+        Returns:
+            Tuple[int, int]: The number of rows and columns.
+
+        Raises:
+            ValueError: If a side is shorter than MIN_SIDE_LENGTH or longer than MAX_SIDE_LENGTH.
+        """
+        row_count, col_count = size.value if isinstance(size, PuzzleSize) else size
+        for side_length in (row_count, col_count):
+            if not MIN_SIDE_LENGTH <= side_length <= MAX_SIDE_LENGTH:
+                raise ValueError(
+                    f"Board sides must be between {MIN_SIDE_LENGTH} and {MAX_SIDE_LENGTH}, "
+                    f"got {row_count}x{col_count}"
+                )
+        return row_count, col_count
 
     @staticmethod
     def solve_puzzle(args):
@@ -66,34 +168,142 @@ class Puzzle:
             args: A tuple containing the start state, random state index, puzzle, column count, and solved state.
 
         Returns:
-            Tuple[int, float]: A tuple containing the random state index and the running time of the solver.
+            Tuple[Optional[int], float, Optional[List[str]], Optional[dict], Optional[dict]]: A tuple
+                containing the random state index (None if no solution is found), the running time of
+                the solver, the solution path if it is written to the solution archive by the main
+                process, the search statistics (see SearchStats.to_dict) if they are collected and
+                a report of the state: its "state" index, with a budget its "outcome" and "reason",
+                and for a solution that is not proven optimal its "length" and "lower_bound".
+                The report is None if there is nothing to report.
         """
         start_state, random_state_index, puzzle, col_count, solved_state = args
         solver = Solver(
-            start_state, random_state_index, puzzle, col_count, solved_state
+            start_state,
+            random_state_index,
+            puzzle,
+            col_count,
+            solved_state,
+            puzzle.engine,
+            puzzle.heuristics,
+            puzzle.use_cache,
+            puzzle.collect_stats,
+            puzzle.budget,
+            puzzle.weight,
+            puzzle.interchangeable_duplicates,
         )
         solution, running_time = utils.measure_time(solver.solve)
+        stats: Optional[dict] = solver.stats.to_dict() if solver.stats is not None else None
+        report: Optional[dict] = {"state": random_state_index}
+        if solver.budget_outcome is not None:
+            report["outcome"] = solver.budget_outcome.value
+            report["reason"] = solver.budget_reason
+        if solution and solver.lower_bound < solver.solution_length:
+            report["length"] = solver.solution_length
+            report["lower_bound"] = solver.lower_bound
+        if len(report) == 1:
+            # Nothing to report beyond the state index
+            report = None
         # If a solution is found, apply the solution and draw the solved state to a file
-        # and return the random state index and the running time
+        # or return it for the solution archive, together with the random state index and the running time
         if solution:
-            solver.apply_solution_and_draw(solution)
-            return random_state_index, running_time
+            if puzzle.output == SolutionOutput.TEXT_FILES:
+                solver.apply_solution_and_draw(solution)
+                return random_state_index, running_time, None, stats, report
+            return random_state_index, running_time, solution, stats, report
         else:
             # If no solution is found, return None and the running time
-            return None, running_time
+            return None, running_time, None, stats, report
+
+    @staticmethod
+    def init_worker(puzzle: "Puzzle", all_states: StateSpace) -> None:
+        """
+        Stores the puzzle and its state space in a worker process.
+
+        Runs once per worker as the pool initializer. The state space is sent as its
+        solved state and the path of its state store, which the worker maps again,
+        so the tasks themselves are plain state indices.
+
+        Args:
+            puzzle (Puzzle): The puzzle to solve.
+            all_states (StateSpace): The state space of the puzzle.
+        """
+        Puzzle.worker_puzzle = puzzle
+        Puzzle.worker_states = all_states
+
+    @staticmethod
+    def solve_state_index(
+        random_state_index: int,
+    ) -> Tuple[Optional[int], float, Optional[List[str]], Optional[dict], Optional[dict]]:
+        """
+        Solves the state with the given index in a worker process set up by init_worker.
+
+        Args:
+            random_state_index (int): The index of the state in the state space.
+
+        Returns:
+            Tuple[Optional[int], float, Optional[List[str]], Optional[dict], Optional[dict]]: See solve_puzzle.
+        """
+        puzzle = Puzzle.worker_puzzle
+        all_states = Puzzle.worker_states
+        return Puzzle.solve_puzzle(
+            (
+                all_states[random_state_index],
+                random_state_index,
+                puzzle,
+                puzzle.col_count,
+                all_states.solved_state,
+            )
+        )
+
+    @staticmethod
+    def solve_state_indices(
+        state_indices: List[int],
+    ) -> List[Tuple[Optional[int], float, Optional[List[str]], Optional[dict], Optional[dict]]]:
+        """
+        Solves a chunk of states in a worker process set up by init_worker.
+
+        Args:
+            state_indices (List[int]): The indices of the states in the state space.
+
+        Returns:
+            List[Tuple[Optional[int], float, Optional[List[str]], Optional[dict], Optional[dict]]]:
+                The result of every state, see solve_puzzle.
+        """
+        return [Puzzle.solve_state_index(state_index) for state_index in state_indices]
 
     def start(
         self,
         to_solve_count: int,
-    ):
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        seed: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> bool:
         """
         Starts the puzzle solving process.
 
+        Results are collected as they arrive and appended to run_stats.txt right away,
+        so the statistics of a killed run are kept and the memory use does not grow
+        with the number of puzzles. With SolutionOutput.ARCHIVE all solutions are
+        appended to solutions.bin (see game.solution_archive) by this process instead
+        of every worker writing one text file per puzzle. With a budget, puzzles solved
+        by the fallback engine or left unsolved within the budget are marked and counted.
+
+        Setting the cancel event, e.g. from another thread, terminates the worker pool
+        within CANCEL_POLL_SECONDS. The results finished so far stay in run_stats.txt
+        and solutions.bin, and the run statistics are written as for a finished run.
+
         Args:
             to_solve_count (int): The number of puzzles to solve.
+            progress_callback (Callable[[int, int], None], optional): Called with the number of
+                finished puzzles and the number of puzzles to solve after every result. Defaults to None.
+            seed (Optional[int], optional): Seed of the drawn states, for reproducible runs. Defaults to None.
+            cancel_event (Optional[threading.Event], optional): Stops the run when set. Defaults to None.
+
+        Returns:
+            bool: True if all puzzles were finished, False if the run was cancelled.
         """
         now = datetime.now()  # current date and time
-        programm_start_time: time = time.time()  # current time
+        programm_start_time: float = time.perf_counter()  # start of the run
         timestamp_str = now.strftime(
             "%Y%m%d_%H%M%S"
         )  # current date and time in string format
@@ -109,86 +319,177 @@ class Puzzle:
         # Create the directory if it does not exist
         os.makedirs(self.dir_path, exist_ok=True)
 
-        all_states: List[State]
+        all_states: StateSpace
         all_states_time: str
         # Retrieve or generate all possible states of the puzzle with given parameters
         (all_states, solved_state), all_states_time = utils.measure_time(
             self.get_states
         )
-        # Keep track of the indices of the solved states
-        solved_states_indices: List[int] = []
-
-        args_list = []  # List of arguments for the solver
-        for _ in range(to_solve_count):  # Loop through the number of puzzles to solve
-            while True:  # Loop until a random state index that has not been solved is found
-                random_state_index = random.randint(
-                    0, len(all_states) - 1
-                )  # Generate a random state index
-                if random_state_index not in solved_states_indices:  # Check if the random state index has not been solved
-                    break
-            start_state = all_states[
-                random_state_index
-            ]  # Get the start state from all states with the random state index
-            solved_states_indices.append(
-                random_state_index
-            )  # Add the random state index to the list of solved states
-            # Add the arguments for the solver to the list of arguments
-            args_list.append(
-                (
-                    start_state,
-                    random_state_index,
-                    self,
-                    self.col_count,
-                    solved_state,
-                )
-            )
-        solution_start_time: time = time.time()  # Start time for solving the puzzles
-        # Solve the puzzles in parallel
-        with Pool(cpu_count()) as pool:  # Use the number of CPU cores available for the pool
-            results = pool.map(
-                Puzzle.solve_puzzle, args_list
-            )  # Map the arguments to the solver function
+        # Build missing pattern database tables once, before the workers map them
+        if self.heuristics and HeuristicType.PATTERN_DATABASE in self.heuristics:
+            PatternDatabase.get_partition(self.row_count, self.col_count)
+        # AUTO searches mid-sized boards with the pattern databases once their tables exist,
+        # with numpy building them is a one-time cost of the first run
+        elif (
+            self.engine == SolverEngine.AUTO
+            and AUTO_A_STAR_MAX_SIZE < self.row_count * self.col_count <= AUTO_OPTIMAL_MAX_SIZE
+            and PatternDatabase.has_fast_build()
+        ):
+            PatternDatabase.get_partition(self.row_count, self.col_count)
+        # Sweep the whole state space backwards from the goal once, the workers only look up paths
+        if self.engine == SolverEngine.LOOKUP_TABLE:
+            SolutionTable.get(self.row_count, self.col_count)
+        # Pick distinct random state indices, so that no state is solved twice
+        state_indices: List[int] = all_states.sample(to_solve_count, seed)
+        worker_count: int = cpu_count()  # Use the number of CPU cores available for the pool
+        # Send the indices in chunks, so that a worker asks for new work only a few times
+        chunksize: int = max(
+            1, min(MAX_CHUNKSIZE, to_solve_count // (worker_count * CHUNKS_PER_WORKER))
+        )
+        cancelled: bool = False  # True if the run was stopped by the cancel event
         solved_states_count: int = 0  # Number of solved states to keep track of the number of puzzles solved
-        running_times: List[str] = []  # List of running times for each puzzle
-        # Loop through the results
-        for result in results:
-            result_index, result_time = result  # Get the index and running time from the result
-            if result_index is not None:
-                solved_states_count += 1  # Increment the number of solved states
-                # Add the running time to the list of running times
-                running_times.append(  
-                    f"Running time for {result_index}: {result_time} seconds"
-                )
-        solution_end_time: time = time.time()
-        solution_duration: str = (  # Calculate the duration of the solution process
-            f"{float(solution_end_time) - float(solution_start_time):.2f}"
+        finished_count: int = 0  # Number of finished puzzles, solved or not
+        # Number of puzzles per budget outcome
+        outcome_counts: Dict[str, int] = {outcome.value: 0 for outcome in BudgetOutcome}
+        # Total solution length and lower bound of the solutions that are not proven optimal
+        suboptimal_count: int = 0
+        suboptimal_length: int = 0
+        suboptimal_lower_bound: int = 0
+        solution_start_time: float = time.perf_counter()  # Start time for solving the puzzles
+        archive: Optional[SolutionArchive] = (
+            SolutionArchive(f"{self.dir_path}/solutions.bin", self.row_count, self.col_count)
+            if self.output == SolutionOutput.ARCHIVE
+            else None
         )
-        # Write the results to a file
+        # Write the results to a file while they arrive
         with open(f"{self.dir_path}/run_stats.txt", "a") as file:
             file.write(
-                f"All states ({len(all_states)}) generation/retrieval time: {all_states_time} seconds\n"
+                f"All states ({all_states.count}) generation/retrieval time: {all_states_time} seconds\n"
                 f"States to solve: {to_solve_count}\n"
                 f"Puzzle size: {self.row_count}x{self.col_count}\n"
                 f"Tile mode: {self.tile_mode.value}\n"
                 f"Duplication mode: {self.duplication_mode.value}\n"
-                f"--------------------------------------------------\n"
+                f"Solver engine: {self.engine.value}\n"
             )
-            # Write the running times for each puzzle
-            for running_time in running_times:
-                file.write(running_time + "\n")
+            if self.budget is not None:
+                fallback = self.budget.fallback.value if self.budget.fallback is not None else "none"
+                file.write(
+                    f"Search budget: max_expansions={self.budget.max_expansions} "
+                    f"max_stored={self.budget.max_stored} max_seconds={self.budget.max_seconds} "
+                    f"fallback={fallback}\n"
+                )
+            file.write("--------------------------------------------------\n")
+            file.flush()
+            # Solve the puzzles in parallel
+            # Every worker receives the puzzle and the state space once, the tasks are chunks of state indices
+            with Pool(
+                worker_count,
+                initializer=Puzzle.init_worker,
+                initargs=(self, all_states),
+            ) as pool:
+                # The chunks are sent as single tasks, as Pool.imap_unordered does with a chunksize,
+                # so that the result iterator can be waited on with a timeout
+                chunks: List[List[int]] = [
+                    state_indices[start : start + chunksize]
+                    for start in range(0, len(state_indices), chunksize)
+                ]
+                results = pool.imap_unordered(Puzzle.solve_state_indices, chunks)
+                # Results of the last received chunk that are not processed yet
+                pending: List[
+                    Tuple[Optional[int], float, Optional[List[str]], Optional[dict], Optional[dict]]
+                ] = []
+                # Wait for the results with a timeout, so that the cancel event is seen while
+                # the workers are busy with long searches
+                poll_seconds: Optional[float] = (
+                    CANCEL_POLL_SECONDS if cancel_event is not None else None
+                )
+                # Loop through the results in the order they are finished
+                while finished_count < len(state_indices):
+                    if not pending:
+                        if cancel_event is not None and cancel_event.is_set():
+                            # Stop the workers, the finished results are already written
+                            pool.terminate()
+                            cancelled = True
+                            break
+                        try:
+                            pending = results.next(poll_seconds)
+                        except TimeoutError:
+                            continue
+                    result_index, result_time, solution, stats, report = pending.pop()
+                    finished_count += 1
+                    outcome: Optional[str] = report.get("outcome") if report is not None else None
+                    if outcome is not None:
+                        outcome_counts[outcome] += 1
+                    if result_index is not None:
+                        solved_states_count += 1  # Increment the number of solved states
+                        if archive is not None:
+                            archive.append(result_index, solution)
+                            archive.flush()
+                        # Write the running time of the puzzle and its search statistics
+                        file.write(f"Running time for {result_index}: {result_time} seconds")
+                        if stats is not None:
+                            file.write(f" ({SearchStats.format(stats)})")
+                        if outcome == BudgetOutcome.FALLBACK.value:
+                            file.write(f" [fallback after {report['reason']} budget]")
+                        if report is not None and "length" in report:
+                            suboptimal_count += 1
+                            suboptimal_length += report["length"]
+                            suboptimal_lower_bound += report["lower_bound"]
+                            file.write(
+                                f" [length {report['length']}, lower bound {report['lower_bound']}]"
+                            )
+                        file.write("\n")
+                    elif outcome == BudgetOutcome.UNSOLVED.value:
+                        # Puzzles given up within the budget are always written
+                        file.write(
+                            f"Unsolved within budget ({report['reason']}): {report['state']}\n"
+                        )
+                    elif stats is not None:
+                        # Unsolved puzzles are written only with their statistics
+                        file.write(f"Unsolved: {SearchStats.format(stats)}\n")
+                    # Flush every record, so that a killed run keeps the statistics of all finished puzzles
+                    file.flush()
+                    if progress_callback is not None:
+                        progress_callback(finished_count, to_solve_count)
+            if archive is not None:
+                archive.close()
+            solution_end_time: float = time.perf_counter()
+            solution_duration: str = (  # Calculate the duration of the solution process
+                f"{float(solution_end_time) - float(solution_start_time):.2f}"
+            )
+            if cancelled:
+                file.write(f"Run cancelled after {finished_count} from {to_solve_count} puzzles\n")
             file.write(
                 f"{solved_states_count} from {to_solve_count} puzzles solved in {solution_duration} seconds\n"
             )
+            if suboptimal_count:
+                file.write(
+                    f"Solutions not proven optimal: {suboptimal_count}, "
+                    f"total length {suboptimal_length}, total lower bound {suboptimal_lower_bound}\n"
+                )
+            if self.budget is not None:
+                file.write(
+                    "Budget outcomes: "
+                    + " ".join(f"{name}={count}" for name, count in outcome_counts.items())
+                    + "\n"
+                )
             file.write(
                 f"Programm total running time: {(solution_end_time - programm_start_time):.2f} seconds\n"
             )
+        return not cancelled
 
-    def get_states(self) -> List[State]:
+    def get_states(self) -> Tuple[StateSpace, State]:
         """
-        Retrieves or generates all possible states of the puzzle.
+        Retrieves the state space and the solved state of the puzzle.
+
+        The states are not enumerated: the returned StateSpace builds every state on
+        demand from its index. The configuration is cached in a binary state store
+        (see game.state_store), since the placement of duplicated tiles is random.
+        Legacy pickle caches are migrated to a state store once; their state list is
+        kept as board rows, so that their state indices stay valid.
 
         Returns:
-            Tuple[List[State], State]: A tuple containing the list of all states and the solved state.
+            Tuple[StateSpace, State]: A tuple containing the state space and the solved state.
         """
         # Get the directory path of the script
         dir_of_script = os.path.dirname(os.path.abspath(__file__))
@@ -199,28 +500,55 @@ class Puzzle:
             file_name_extension = f"({self.duplicate_count})"
         # Generate a file name for the all states file
         states_path = os.path.join(assets_path, "states")
-        all_states_file = os.path.join(
-            states_path,
-            f"all_states_{self.col_count * self.row_count}_{self.tile_mode.value}_{self.duplication_mode.value}{file_name_extension}.pkl",
+        # The predefined sizes keep their names by cell count, so existing stores stay valid.
+        # Other shapes are named by rows and columns, since e.g. 3x4 and 4x3 have the same cell count
+        shape_name: str = (
+            str(self.col_count * self.row_count)
+            if (self.row_count, self.col_count) in [size.value for size in PuzzleSize]
+            else f"{self.row_count}x{self.col_count}"
         )
+        file_name = f"all_states_{shape_name}_{self.tile_mode.value}_{self.duplication_mode.value}{file_name_extension}"
+        all_states_file = os.path.join(states_path, f"{file_name}.states")
+        legacy_states_file = os.path.join(states_path, f"{file_name}.pkl")
         # Check if the states directory exists, if not, create it
         if not os.path.exists(states_path):
             os.makedirs(states_path)
-        # Check if the all states file exists
-        # If it exists, load the all states and solved state from the file
-        # If it does not exist, generate all states and the solved state
-        if os.path.exists(all_states_file):
-            with open(all_states_file, "rb") as file:
-                all_states, solved_state = pickle.load(file)
-        else:
-            all_states, solved_state = State.generate_all_states(
-                col_count=self.col_count,
-                row_count=self.row_count,
-                tile_mode=self.tile_mode,
-                repeat_mode=self.duplication_mode,
-                duplicates_count=self.duplicate_count,
-            )
-            # Save the all states and solved state to a file
-            with open(all_states_file, "wb") as file:
-                pickle.dump((all_states, solved_state), file)
-        return all_states, solved_state  # Return the all states and solved state
+        # Check if the state store exists
+        # If it does not exist, migrate the legacy pickle file if there is one
+        # Else, generate the solved state and write a new state store
+        if not os.path.exists(all_states_file):
+            if os.path.exists(legacy_states_file):
+                StateStore.migrate(
+                    legacy_states_file,
+                    all_states_file,
+                    self.row_count,
+                    self.col_count,
+                    self.duplicate_count,
+                )
+            else:
+                size: int = self.col_count * self.row_count
+                solved_state = State.generate_solved_state(
+                    State.prepare_tiles(
+                        size,
+                        self.tile_mode,
+                        self.duplicate_count,
+                        Tile.get_blank_tile_value(self.tile_mode),
+                        self.duplication_mode,
+                    ),
+                    self.col_count,
+                    self.tile_mode,
+                    self.duplication_mode,
+                )
+                StateStore.write(
+                    all_states_file,
+                    solved_state,
+                    self.row_count,
+                    self.col_count,
+                    self.duplicate_count,
+                )
+        store = StateStore(all_states_file)
+        # Return the state space and solved state
+        return (
+            StateSpace(store.solved_state, self.row_count, self.col_count, store),
+            store.solved_state,
+        )
@@ -0,0 +1,340 @@
+from math import factorial
+from typing import Dict, List, Sequence
+
+
+class Ranking:
+    """
+    Maps permutations of tile codes to dense integer indices and back.
+
+    The class provides the linear-time ranking of Myrvold and Ruskey, a rank of
+    solvable boards in [0, n!/2) built on it and a rank of multiset permutations
+    for boards with duplicated tiles. Dense ranks let visited sets and lookup
+    tables be plain bytearrays instead of hash sets.
+    """
+
+    @staticmethod
+    def rank_linear(permutation: Sequence[int]) -> int:
+        """
+        Returns the Myrvold-Ruskey rank of a permutation of 0..n-1 in O(n).
+
+        The two permutations whose ranks differ by n!/2 differ by one transposition,
+        so the rank modulo n!/2 is a perfect hash of the permutations of one parity.
+
+        Args:
+            permutation (Sequence[int]): The permutation to rank.
+
+        Returns:
+            int: The rank in [0, n!).
+        """
+        values = list(permutation)
+        inverse = [0] * len(values)
+        for position, value in enumerate(values):
+            inverse[value] = position
+        rank = 0
+        multiplier = 1
+        for n in range(len(values), 1, -1):
+            # Move the value n - 1 to the last position
+            digit = values[n - 1]
+            position = inverse[n - 1]
+            values[n - 1], values[position] = n - 1, digit
+            inverse[digit], inverse[n - 1] = position, n - 1
+            rank += digit * multiplier
+            multiplier *= n
+        return rank
+
+    @staticmethod
+    def unrank_linear(rank: int, n: int) -> List[int]:
+        """
+        Returns the permutation of 0..n-1 with the given Myrvold-Ruskey rank.
+
+        Args:
+            rank (int): The rank in [0, n!).
+            n (int): The length of the permutation.
+
+        Returns:
+            List[int]: The permutation.
+        """
+        digits = []
+        for length in range(n, 1, -1):
+            rank, digit = divmod(rank, length)
+            digits.append(digit)
+        values = list(range(n))
+        inverse = list(range(n))
+        # Undo the swaps of rank_linear, the innermost first
+        for length, digit in zip(range(2, n + 1), reversed(digits)):
+            position = inverse[digit]
+            values[length - 1], values[position] = digit, length - 1
+            inverse[digit], inverse[length - 1] = length - 1, position
+        return values
+
+    @staticmethod
+    def is_even(permutation: Sequence[int]) -> bool:
+        """
+        Checks if a permutation of 0..n-1 is even.
+
+        Args:
+            permutation (Sequence[int]): The permutation to check.
+
+        Returns:
+            bool: True if the permutation is a product of an even number of transpositions.
+        """
+        seen = [False] * len(permutation)
+        transpositions = 0
+        for start in range(len(permutation)):
+            # Every cycle of length k contributes k - 1 transpositions
+            length = 0
+            index = start
+            while not seen[index]:
+                seen[index] = True
+                index = permutation[index]
+                length += 1
+            if length:
+                transpositions += length - 1
+        return transpositions % 2 == 0
+
+    @staticmethod
+    def get_board_count(row_count: int, col_count: int) -> int:
+        """
+        Returns the number of solvable boards of a board shape.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            int: n!/2 for a board with n cells.
+        """
+        return factorial(row_count * col_count) // 2
+
+    @staticmethod
+    def tiles_parity(blank: int, row_count: int, col_count: int) -> int:
+        """
+        Returns the parity the tile permutation of a solvable board must have.
+
+        A board is solvable if the parity of its permutation (blank included)
+        equals the parity of the blank's distance to its goal cell. Removing the
+        blank, which has the largest goal cell, removes the inversions with all
+        cells after it.
+
+        Args:
+            blank (int): The cell of the blank tile.
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            int: 0 if the tile permutation must be even, 1 if it must be odd.
+        """
+        size = row_count * col_count
+        blank_row, blank_col = divmod(blank, col_count)
+        blank_distance = (row_count - 1 - blank_row) + (col_count - 1 - blank_col)
+        return (blank_distance + size - 1 - blank) % 2
+
+    @staticmethod
+    def rank_board(codes: Sequence[int], row_count: int, col_count: int) -> int:
+        """
+        Returns the dense rank of a solvable board.
+
+        The rank combines the blank cell with the Myrvold-Ruskey rank of the tiles
+        modulo (n-1)!/2: for a given blank cell only one permutation parity is
+        solvable, so the rank is a bijection onto [0, n!/2).
+
+        Args:
+            codes (Sequence[int]): The tile codes of the board in cell order.
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            int: The rank in [0, n!/2).
+        """
+        size = len(codes)
+        half = factorial(size - 1) // 2
+        blank = 0
+        tiles = []
+        for index, code in enumerate(codes):
+            if code:
+                tiles.append(code - 1)
+            else:
+                blank = index
+        return blank * half + Ranking.rank_linear(tiles) % half
+
+    @staticmethod
+    def unrank_board(rank: int, row_count: int, col_count: int) -> List[int]:
+        """
+        Returns the tile codes of the solvable board with the given dense rank.
+
+        Args:
+            rank (int): The rank in [0, n!/2).
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            List[int]: The tile codes of the board in cell order.
+        """
+        size = row_count * col_count
+        half = factorial(size - 1) // 2
+        blank, tiles_rank = divmod(rank, half)
+        tiles = Ranking.unrank_linear(tiles_rank, size - 1)
+        # The other permutation with the same rank modulo half has the opposite parity
+        if Ranking.is_even(tiles) != (Ranking.tiles_parity(blank, row_count, col_count) == 0):
+            tiles = Ranking.unrank_linear(tiles_rank + half, size - 1)
+        codes = [tile + 1 for tile in tiles]
+        codes.insert(blank, 0)
+        return codes
+
+    @staticmethod
+    def get_multiset_count(counts: Dict[int, int]) -> int:
+        """
+        Returns the number of distinct arrangements of a multiset.
+
+        Args:
+            counts (Dict[int, int]): The multiplicity of every value.
+
+        Returns:
+            int: n! divided by the factorials of all multiplicities.
+        """
+        count = factorial(sum(counts.values()))
+        for multiplicity in counts.values():
+            count //= factorial(multiplicity)
+        return count
+
+    @staticmethod
+    def rank_multiset(values: Sequence[int]) -> int:
+        """
+        Returns the lexicographic rank of a multiset permutation.
+
+        Boards with duplicated tiles are ranked by their visible values, so all
+        relabellings of identical tiles share one rank.
+
+        Args:
+            values (Sequence[int]): The values in cell order.
+
+        Returns:
+            int: The rank in [0, get_multiset_count(counts)).
+        """
+        counts: Dict[int, int] = {}
+        for value in values:
+            counts[value] = counts.get(value, 0) + 1
+        remaining = len(values)
+        # Number of arrangements of the remaining values
+        arrangements = Ranking.get_multiset_count(counts)
+        rank = 0
+        for value in values:
+            for smaller in sorted(counts):
+                if smaller >= value:
+                    break
+                # Arrangements that start with the smaller value
+                rank += arrangements * counts[smaller] // remaining
+            arrangements = arrangements * counts[value] // remaining
+            counts[value] -= 1
+            if counts[value] == 0:
+                del counts[value]
+            remaining -= 1
+        return rank
+
+    @staticmethod
+    def unrank_multiset(rank: int, counts: Dict[int, int]) -> List[int]:
+        """
+        Returns the multiset permutation with the given lexicographic rank.
+
+        Args:
+            rank (int): The rank in [0, get_multiset_count(counts)).
+            counts (Dict[int, int]): The multiplicity of every value.
+
+        Returns:
+            List[int]: The values in cell order.
+        """
+        counts = {value: count for value, count in counts.items() if count}
+        remaining = sum(counts.values())
+        arrangements = Ranking.get_multiset_count(counts)
+        values = []
+        while remaining:
+            for value in sorted(counts):
+                # Arrangements that start with this value
+                block = arrangements * counts[value] // remaining
+                if rank < block:
+                    break
+                rank -= block
+            values.append(value)
+            arrangements = block
+            counts[value] -= 1
+            if counts[value] == 0:
+                del counts[value]
+            remaining -= 1
+        return values
+
+
+class RankBitset:
+    """
+    Set of dense ranks stored as one bit per rank.
+
+    Attributes:
+        bits (bytearray): The bits of all ranks.
+    """
+
+    def __init__(self, count: int):
+        """
+        Initializes a new, empty instance of the RankBitset class.
+
+        Args:
+            count (int): The number of possible ranks.
+        """
+        self.bits: bytearray = bytearray((count + 7) >> 3)
+
+    def add(self, rank: int) -> None:
+        """
+        Adds a rank to the set.
+
+        Args:
+            rank (int): The rank to add.
+        """
+        self.bits[rank >> 3] |= 1 << (rank & 7)
+
+    def __contains__(self, rank: int) -> bool:
+        return bool(self.bits[rank >> 3] & (1 << (rank & 7)))
+
+
+class RankMoveTable:
+    """
+    Map from dense ranks to small move codes stored as one nibble per rank.
+
+    Code 0 marks an absent rank, so the table doubles as a visited set. Search
+    engines store the index of the move that first reached a board plus one;
+    the parent board follows by undoing that move.
+
+    Attributes:
+        nibbles (bytearray): The codes of all ranks, two ranks per byte.
+    """
+
+    def __init__(self, count: int):
+        """
+        Initializes a new, empty instance of the RankMoveTable class.
+
+        Args:
+            count (int): The number of possible ranks.
+        """
+        self.nibbles: bytearray = bytearray((count + 1) >> 1)
+
+    def get(self, rank: int) -> int:
+        """
+        Returns the code stored for a rank.
+
+        Args:
+            rank (int): The rank to look up.
+
+        Returns:
+            int: The stored code in [1, 15], or 0 if the rank is absent.
+        """
+        return (self.nibbles[rank >> 1] >> ((rank & 1) << 2)) & 15
+
+    def set(self, rank: int, code: int) -> None:
+        """
+        Stores a code for a rank that is still absent.
+
+        Args:
+            rank (int): The rank to store.
+            code (int): The code in [1, 15].
+        """
+        self.nibbles[rank >> 1] |= code << ((rank & 1) << 2)
+
+    def __contains__(self, rank: int) -> bool:
+        return self.get(rank) != 0
@@ -0,0 +1,148 @@
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+from game.board import Board, BoardLayout
+
+# Search state of a placement: the blank cell followed by the cells of the tracked tiles
+PlacementState = Tuple[int, ...]
+
+
+class Reduction:
+    """
+    Constructive solver that reduces the board row by row and column by column.
+
+    The top row of the unsolved region is placed while the region has more than
+    two rows, then the left column while it has more than two columns, and the
+    remaining 2x2 block is finished exactly. Placed cells are locked and never
+    touched again. A tile is placed by a breadth-first search over the blank cell
+    and the cells of the tracked tiles only, all other tiles are interchangeable,
+    so a placement searches at most n^k states for k tracked tiles on n cells.
+    The last two tiles of a row or column are placed together, which avoids the
+    dead end of placing one and then being unable to insert the other.
+
+    The solutions are deterministic and found in polynomial time, but usually
+    far longer than optimal ones.
+    """
+
+    @staticmethod
+    def solve(board: Board) -> Optional[List[str]]:
+        """
+        Solves a board by row and column reduction.
+
+        Args:
+            board (Board): The start board.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if the board is not solvable.
+        """
+        layout: BoardLayout = board.layout
+        col_count: int = layout.col_count
+        codes: List[int] = board.to_codes()
+        blank: int = board.blank
+        locked: List[bool] = [False] * layout.size
+        solution: List[str] = []
+        top, left = 0, 0
+        row_end, col_end = layout.row_count, col_count
+        while row_end - top > 2 or col_end - left > 2:
+            if row_end - top > 2:
+                # Place the top row of the region, its last two tiles together
+                cells = [top * col_count + col for col in range(left, col_end)]
+            else:
+                # Place the left column of the two remaining rows together
+                cells = [top * col_count + left, (top + 1) * col_count + left]
+            groups = [[cell] for cell in cells[:-2]] + [cells[-2:]]
+            for group in groups:
+                moves = Reduction.place(layout, codes, blank, locked, group)
+                if moves is None:
+                    return None
+                blank = Reduction.apply_moves(layout, codes, blank, moves)
+                solution.extend(moves)
+                for cell in group:
+                    locked[cell] = True
+            if row_end - top > 2:
+                top += 1
+            else:
+                left += 1
+        # Finish the last 2x2 block exactly, with the blank in the last cell
+        cells = [
+            row * col_count + col for row in range(top, row_end) for col in range(left, col_end)
+        ]
+        moves = Reduction.place(layout, codes, blank, locked, cells[:-1], cells[-1])
+        if moves is None:
+            return None
+        solution.extend(moves)
+        return solution
+
+    @staticmethod
+    def place(
+        layout: BoardLayout,
+        codes: Sequence[int],
+        blank: int,
+        locked: Sequence[bool],
+        cells: List[int],
+        blank_cell: Optional[int] = None,
+    ) -> Optional[List[str]]:
+        """
+        Finds the shortest move sequence that brings the goal tiles of some cells home.
+
+        Args:
+            layout (BoardLayout): The layout of the board.
+            codes (Sequence[int]): The tile code of every cell.
+            blank (int): The cell of the blank.
+            locked (Sequence[bool]): True for every cell the blank must not enter.
+            cells (List[int]): The cells to fill with their goal tiles.
+            blank_cell (Optional[int], optional): The cell the blank must end on. Defaults to None (any cell).
+
+        Returns:
+            Optional[List[str]]: The moves, or None if the tiles cannot be placed.
+        """
+        transitions = layout.transitions
+        # The goal tile of cell c has the code c + 1
+        start: PlacementState = (blank,) + tuple(codes.index(cell + 1) for cell in cells)
+        goal: PlacementState = tuple(cells)
+        # The move that first reached every state and the state it was made from
+        came_from: Dict[PlacementState, Tuple[Optional[PlacementState], str]] = {start: (None, "")}
+        queue: deque = deque([start])
+        while queue:
+            state = queue.popleft()
+            if state[1:] == goal and (blank_cell is None or state[0] == blank_cell):
+                moves: List[str] = []
+                while True:
+                    parent, move = came_from[state]
+                    if parent is None:
+                        return moves[::-1]
+                    moves.append(move)
+                    state = parent
+            state_blank = state[0]
+            for target, move, _, _ in transitions[state_blank]:
+                if locked[target]:
+                    continue
+                # The tile on the target cell moves into the blank cell
+                neighbor = (target,) + tuple(
+                    state_blank if cell == target else cell for cell in state[1:]
+                )
+                if neighbor not in came_from:
+                    came_from[neighbor] = (state, move)
+                    queue.append(neighbor)
+        return None
+
+    @staticmethod
+    def apply_moves(layout: BoardLayout, codes: List[int], blank: int, moves: List[str]) -> int:
+        """
+        Applies moves to a list of tile codes in place.
+
+        Args:
+            layout (BoardLayout): The layout of the board.
+            codes (List[int]): The tile code of every cell, updated in place.
+            blank (int): The cell of the blank.
+            moves (List[str]): The moves to apply.
+
+        Returns:
+            int: The cell of the blank after the moves.
+        """
+        for move in moves:
+            for target, name, _, _ in layout.transitions[blank]:
+                if name == move:
+                    codes[blank], codes[target] = codes[target], 0
+                    blank = target
+                    break
+        return blank
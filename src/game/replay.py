@@ -0,0 +1,312 @@
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+from game.board import Board, BoardLayout
+from game.moves import Moves
+from game.solution_archive import SolutionArchive
+from game.solution_cache import LETTER_MOVES
+from game.state_space import StateSpace
+
+# A solution as a list of move names or as a string of move letters ("u", "d", "l", "r")
+MoveSequence = Union[str, Sequence[str]]
+# Move code (index in Moves.move_names) of every move name and move letter
+MOVE_CODES: Dict[str, int] = {move: index for index, move in enumerate(Moves.move_names)}
+MOVE_CODES.update({letter: MOVE_CODES[move] for letter, move in LETTER_MOVES.items()})
+# Largest number of failures a VerificationReport keeps
+MAX_REPORTED_FAILURES: int = 1000
+
+
+class ReplayResult:
+    """
+    Outcome of replaying one solution.
+
+    Attributes:
+        board (Board): The board after the last legal move.
+        moves_applied (int): The number of legal moves applied.
+        error (Optional[str]): Why the solution is rejected, None if it is legal and reaches the goal.
+    """
+
+    def __init__(self, board: Board, moves_applied: int, error: Optional[str]):
+        """
+        Initializes a new instance of the ReplayResult class.
+
+        Args:
+            board (Board): The board after the last legal move.
+            moves_applied (int): The number of legal moves applied.
+            error (Optional[str]): Why the solution is rejected, None if it is valid.
+        """
+        self.board: Board = board
+        self.moves_applied: int = moves_applied
+        self.error: Optional[str] = error
+
+    @property
+    def solved(self) -> bool:
+        """
+        True if every move was legal and the final board is a goal board.
+        """
+        return self.error is None
+
+
+class VerificationReport:
+    """
+    Summary of a batch verification.
+
+    Attributes:
+        checked (int): The number of verified solutions.
+        passed (int): The number of valid solutions.
+        total_moves (int): The number of replayed moves.
+        failures (List[Tuple[Hashable, str]]): The identifier and the error of the first
+            MAX_REPORTED_FAILURES rejected solutions.
+    """
+
+    def __init__(self):
+        """
+        Initializes a new, empty instance of the VerificationReport class.
+        """
+        self.checked: int = 0
+        self.passed: int = 0
+        self.total_moves: int = 0
+        self.failures: List[Tuple[Hashable, str]] = []
+
+    @property
+    def failed(self) -> int:
+        """
+        The number of rejected solutions.
+        """
+        return self.checked - self.passed
+
+    def add(self, identifier: Hashable, result: ReplayResult) -> None:
+        """
+        Records the result of one solution.
+
+        Args:
+            identifier (Hashable): The identifier of the solution, e.g. its state index.
+            result (ReplayResult): The result of its replay.
+        """
+        self.checked += 1
+        self.total_moves += result.moves_applied
+        if result.error is None:
+            self.passed += 1
+        elif len(self.failures) < MAX_REPORTED_FAILURES:
+            self.failures.append((identifier, result.error))
+
+    def to_dict(self) -> Dict[str, Union[int, List[Tuple[Hashable, str]]]]:
+        """
+        Returns the report as a JSON-serializable dict.
+
+        Returns:
+            Dict[str, Union[int, List[Tuple[Hashable, str]]]]: The counters and the failures.
+        """
+        return {
+            "checked": self.checked,
+            "passed": self.passed,
+            "failed": self.failed,
+            "total_moves": self.total_moves,
+            "failures": self.failures,
+        }
+
+
+class Replay:
+    """
+    Replays and verifies solutions on packed boards.
+
+    A move is looked up by its code in a per-shape table of the blank's targets
+    and applied to the packed key with one multiplication (see game.board), so a
+    replay costs O(solution length) without locating the blank or rendering any
+    board. A solution is valid if all its moves stay on the board and it ends on
+    the goal board; with code classes (identical tiles, see Board.get_code_classes)
+    any board showing the goal's visible values is a goal board.
+    """
+
+    # Target cell, key factor and target shift of every move code for every blank cell
+    _steps: Dict[Tuple[int, int], List[List[Optional[Tuple[int, int, int]]]]] = {}
+
+    @staticmethod
+    def get_steps(layout: BoardLayout) -> List[List[Optional[Tuple[int, int, int]]]]:
+        """
+        Returns the move table of a board shape, built once per process.
+
+        Args:
+            layout (BoardLayout): The layout of the board.
+
+        Returns:
+            List[List[Optional[Tuple[int, int, int]]]]: For every blank cell and move code the
+                (target, factor, shift) of the move, None if the move leaves the board.
+        """
+        shape = (layout.row_count, layout.col_count)
+        steps = Replay._steps.get(shape)
+        if steps is None:
+            steps = []
+            for transitions in layout.transitions:
+                cell_steps: List[Optional[Tuple[int, int, int]]] = [None] * len(Moves.move_names)
+                for target, move, factor, shift in transitions:
+                    cell_steps[MOVE_CODES[move]] = (target, factor, shift)
+                steps.append(cell_steps)
+            Replay._steps[shape] = steps
+        return steps
+
+    @staticmethod
+    def run(board: Board, moves: MoveSequence) -> ReplayResult:
+        """
+        Applies moves until the first illegal one, without checking the final board.
+
+        Args:
+            board (Board): The start board.
+            moves (MoveSequence): The moves.
+
+        Returns:
+            ReplayResult: The board after the last legal move, with an error if a move is illegal.
+        """
+        layout = board.layout
+        steps = Replay.get_steps(layout)
+        mask = layout.mask
+        key, blank = board.key, board.blank
+        for position, move in enumerate(moves):
+            code = MOVE_CODES.get(move)
+            if code is None:
+                error = f"unknown move {move!r} at move {position + 1}"
+                return ReplayResult(Board(layout, key, blank), position, error)
+            step = steps[blank][code]
+            if step is None:
+                error = f"illegal move {move!r} at move {position + 1}, blank on cell {blank}"
+                return ReplayResult(Board(layout, key, blank), position, error)
+            target, factor, shift = step
+            key += ((key >> shift) & mask) * factor
+            blank = target
+        return ReplayResult(Board(layout, key, blank), len(moves), None)
+
+    @staticmethod
+    def replay(board: Board, moves: MoveSequence) -> Board:
+        """
+        Applies a solution to a board and returns the final board.
+
+        Args:
+            board (Board): The start board.
+            moves (MoveSequence): The moves, as move names or as a string of move letters.
+
+        Returns:
+            Board: The board after all moves.
+
+        Raises:
+            ValueError: If a move is unknown or leaves the board.
+        """
+        result = Replay.run(board, moves)
+        if result.error is not None:
+            raise ValueError(f"Cannot replay the solution: {result.error}")
+        return result.board
+
+    @staticmethod
+    def get_goal_key(layout: BoardLayout, code_classes: Optional[List[int]] = None) -> int:
+        """
+        Returns the packed goal board a final board is compared with.
+
+        Args:
+            layout (BoardLayout): The layout of the board.
+            code_classes (Optional[List[int]], optional): The class code of every tile code. Defaults to None.
+
+        Returns:
+            int: The packed goal board, canonical if code classes are given.
+        """
+        goal = Board.goal(layout.row_count, layout.col_count)
+        return goal.canonical(code_classes).key if code_classes is not None else goal.key
+
+    @staticmethod
+    def verify(
+        board: Board, moves: MoveSequence, code_classes: Optional[List[int]] = None
+    ) -> ReplayResult:
+        """
+        Checks that a solution is legal and reaches the goal.
+
+        Args:
+            board (Board): The start board.
+            moves (MoveSequence): The moves, as move names or as a string of move letters.
+            code_classes (Optional[List[int]], optional): The class code of every tile code, any board
+                with the goal's visible values is then a goal. Defaults to None.
+
+        Returns:
+            ReplayResult: The final board and, if the solution is rejected, the error.
+        """
+        return Replay.check(
+            Replay.run(board, moves),
+            Replay.get_goal_key(board.layout, code_classes),
+            code_classes,
+        )
+
+    @staticmethod
+    def check(
+        result: ReplayResult, goal_key: int, code_classes: Optional[List[int]]
+    ) -> ReplayResult:
+        """
+        Rejects a replay whose moves are legal but whose final board is not the goal.
+
+        Args:
+            result (ReplayResult): The result of Replay.run.
+            goal_key (int): The packed goal board (see get_goal_key).
+            code_classes (Optional[List[int]]): The class code of every tile code, if any.
+
+        Returns:
+            ReplayResult: The result, with an error if the goal is not reached.
+        """
+        if result.error is None:
+            final = result.board
+            if code_classes is not None:
+                final = final.canonical(code_classes)
+            if final.key != goal_key:
+                result.error = f"the goal is not reached after {result.moves_applied} moves"
+        return result
+
+    @staticmethod
+    def verify_many(
+        solutions: Iterable[Tuple[Hashable, Board, MoveSequence]],
+        code_classes: Optional[List[int]] = None,
+    ) -> VerificationReport:
+        """
+        Verifies many solutions in one pass.
+
+        Args:
+            solutions (Iterable[Tuple[Hashable, Board, MoveSequence]]): The identifier, start board
+                and moves of every solution. All boards must have the same shape.
+            code_classes (Optional[List[int]], optional): The class code of every tile code.
+                Defaults to None.
+
+        Returns:
+            VerificationReport: The counters and the rejected solutions.
+        """
+        report = VerificationReport()
+        goal_key: Optional[int] = None
+        for identifier, board, moves in solutions:
+            if goal_key is None:
+                goal_key = Replay.get_goal_key(board.layout, code_classes)
+            report.add(identifier, Replay.check(Replay.run(board, moves), goal_key, code_classes))
+        return report
+
+    @staticmethod
+    def verify_archive(archive: SolutionArchive, all_states: StateSpace) -> VerificationReport:
+        """
+        Verifies every solution stored in a solution archive.
+
+        The start board of a record is rebuilt from its state index. With
+        duplicated tiles, a solution is valid if it reaches the goal's visible
+        values, which holds for labelled and interchangeable solutions alike.
+
+        Args:
+            archive (SolutionArchive): The archive of a run.
+            all_states (StateSpace): The state space the solutions were recorded for.
+
+        Returns:
+            VerificationReport: The counters and the state indices of the rejected solutions.
+
+        Raises:
+            ValueError: If the archive was written for another board shape.
+        """
+        if (archive.row_count, archive.col_count) != (all_states.row_count, all_states.col_count):
+            raise ValueError(
+                f"The archive holds {archive.row_count}x{archive.col_count} solutions, "
+                f"the state space {all_states.row_count}x{all_states.col_count} boards"
+            )
+        code_classes = all_states.code_classes if all_states.has_duplicates else None
+        return Replay.verify_many(
+            (
+                (state_index, all_states.get_board(state_index), moves)
+                for state_index, moves in archive
+            ),
+            code_classes,
+        )
@@ -0,0 +1,127 @@
+from enum import Enum
+import time
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game.solver import SolverEngine
+
+# Number of expansions between two checks of the time budget, reading the clock on
+# every expansion would cost more than the expansion itself
+CHECK_INTERVAL: int = 1024
+
+
+class BudgetOutcome(Enum):
+    """
+    Enum class representing how a search ended with respect to its budget.
+
+    Attributes:
+        WITHIN_BUDGET (str): The selected engine finished within the budget.
+        FALLBACK (str): The selected engine exceeded the budget and the fallback engine finished.
+        UNSOLVED (str): Every engine exceeded the budget, the instance is unsolved within budget.
+    """
+
+    WITHIN_BUDGET = "within_budget"
+    FALLBACK = "fallback"
+    UNSOLVED = "unsolved_within_budget"
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised by a search engine that exceeds its budget.
+
+    Attributes:
+        reason (str): The exceeded limit: "expansions", "stored" or "time".
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(f"Search budget exceeded: {reason}")
+        self.reason: str = reason
+
+
+class SearchBudget:
+    """
+    Per-instance limits of a search.
+
+    The node and memory limits count expanded and stored boards, so they cut a
+    search at the same point on every machine; the time limit bounds the tail
+    latency of a batch on a given machine. The memory limit counts the boards an
+    engine keeps (visited boards, open lists and frontiers) rather than bytes.
+    An instance that exceeds the budget is solved again with the fallback engine
+    (with a fresh budget) or, without a fallback, reported as unsolved.
+
+    Attributes:
+        max_expansions (Optional[int]): The largest number of expanded boards, None for no limit.
+        max_stored (Optional[int]): The largest number of stored boards, None for no limit.
+        max_seconds (Optional[float]): The longest running time in seconds, None for no limit.
+        fallback (Optional[SolverEngine]): The engine used after the budget is exceeded, None to give up.
+    """
+
+    def __init__(
+        self,
+        max_expansions: Optional[int] = None,
+        max_stored: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+        fallback: Optional["SolverEngine"] = None,
+    ):
+        """
+        Initializes a new instance of the SearchBudget class.
+
+        Args:
+            max_expansions (Optional[int], optional): The largest number of expanded boards. Defaults to None.
+            max_stored (Optional[int], optional): The largest number of stored boards. Defaults to None.
+            max_seconds (Optional[float], optional): The longest running time in seconds. Defaults to None.
+            fallback (Optional[SolverEngine], optional): The engine used after the budget is exceeded.
+                Defaults to None.
+        """
+        self.max_expansions: Optional[int] = max_expansions
+        self.max_stored: Optional[int] = max_stored
+        self.max_seconds: Optional[float] = max_seconds
+        self.fallback: Optional["SolverEngine"] = fallback
+
+    def first_check(self) -> int:
+        """
+        Returns the number of expansions at which a search first calls check.
+
+        Returns:
+            int: The expansion count of the first check.
+        """
+        return self.next_check(0)
+
+    def next_check(self, expansions: int) -> int:
+        """
+        Returns the number of expansions at which a search calls check next.
+
+        Args:
+            expansions (int): The current number of expansions.
+
+        Returns:
+            int: The expansion count of the next check.
+        """
+        next_expansions = expansions + CHECK_INTERVAL
+        if self.max_expansions is not None and self.max_expansions < next_expansions:
+            # Stop exactly at the node limit
+            next_expansions = max(self.max_expansions, expansions + 1)
+        return next_expansions
+
+    def check(self, expansions: int, stored: int, start_time: float) -> int:
+        """
+        Checks the budget of a running search.
+
+        Args:
+            expansions (int): The number of expanded boards.
+            stored (int): The number of stored boards.
+            start_time (float): The time.perf_counter() value at the start of the search.
+
+        Returns:
+            int: The expansion count of the next check.
+
+        Raises:
+            BudgetExceeded: If a limit is exceeded.
+        """
+        if self.max_expansions is not None and expansions >= self.max_expansions:
+            raise BudgetExceeded("expansions")
+        if self.max_stored is not None and stored > self.max_stored:
+            raise BudgetExceeded("stored")
+        if self.max_seconds is not None and time.perf_counter() - start_time > self.max_seconds:
+            raise BudgetExceeded("time")
+        return self.next_check(expansions)
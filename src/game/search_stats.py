@@ -0,0 +1,118 @@
+from typing import Dict, Optional, Union
+
+
+class SearchStats:
+    """
+    Counters and timings of one search, collected by the solver engines on request.
+
+    Collecting statistics is opt-in (see Solver's collect_stats argument). Every
+    engine runs one expansion loop either way; without statistics it only skips the
+    guarded timing and counter calls and never touches this class. With statistics
+    the lookup of every neighbour in the visited boards is timed, and the rest of
+    the expansion counts as neighbour generation.
+
+    Attributes:
+        engine (str): The engine that ran the search.
+        expansions (int): The number of expanded boards.
+        generated (int): The number of generated neighbours.
+        duplicate_hits (int): The number of generated neighbours that were already visited.
+        peak_frontier (int): The largest number of boards waiting to be expanded.
+        peak_visited (int): The largest number of boards kept as visited (the path length for IDA*).
+        generation_time (float): The seconds spent generating neighbours (not timed by IDA*, which
+            generates and recurses in one step).
+        lookup_time (float): The seconds spent ranking, hashing and storing visited boards.
+        total_time (float): The seconds spent in the whole search.
+        solution_length (Optional[int]): The number of moves of the solution, None if none was found.
+    """
+
+    def __init__(self, engine: str):
+        """
+        Initializes a new, empty instance of the SearchStats class.
+
+        Args:
+            engine (str): The engine that runs the search.
+        """
+        self.engine: str = engine
+        self.expansions: int = 0
+        self.generated: int = 0
+        self.duplicate_hits: int = 0
+        self.peak_frontier: int = 0
+        self.peak_visited: int = 0
+        self.generation_time: float = 0.0
+        self.lookup_time: float = 0.0
+        self.total_time: float = 0.0
+        self.solution_length: Optional[int] = None
+
+    def add_expansion(
+        self,
+        generated: int,
+        duplicates: int,
+        frontier_size: int,
+        visited_size: int,
+        generation_time: float,
+        lookup_time: float,
+    ) -> None:
+        """
+        Records one expanded board.
+
+        Args:
+            generated (int): The number of generated neighbours.
+            duplicates (int): The number of neighbours that were already visited.
+            frontier_size (int): The number of boards waiting to be expanded afterwards.
+            visited_size (int): The number of visited boards afterwards.
+            generation_time (float): The seconds spent generating the neighbours.
+            lookup_time (float): The seconds spent looking up and storing the neighbours.
+        """
+        self.expansions += 1
+        self.generated += generated
+        self.duplicate_hits += duplicates
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if visited_size > self.peak_visited:
+            self.peak_visited = visited_size
+        self.generation_time += generation_time
+        self.lookup_time += lookup_time
+
+    @property
+    def branching_factor(self) -> float:
+        """
+        Returns the mean number of neighbours generated per expanded board.
+
+        Returns:
+            float: The mean branching factor, 0 if no board was expanded.
+        """
+        return self.generated / self.expansions if self.expansions else 0.0
+
+    def to_dict(self) -> Dict[str, Union[str, int, float, None]]:
+        """
+        Returns the statistics as a plain dictionary, e.g. to send them between processes.
+
+        Returns:
+            Dict[str, Union[str, int, float, None]]: The statistics by name.
+        """
+        return {
+            "engine": self.engine,
+            "expansions": self.expansions,
+            "generated": self.generated,
+            "duplicate_hits": self.duplicate_hits,
+            "branching_factor": round(self.branching_factor, 3),
+            "peak_frontier": self.peak_frontier,
+            "peak_visited": self.peak_visited,
+            "generation_time": round(self.generation_time, 6),
+            "lookup_time": round(self.lookup_time, 6),
+            "total_time": round(self.total_time, 6),
+            "solution_length": self.solution_length,
+        }
+
+    @staticmethod
+    def format(stats: Dict[str, Union[str, int, float, None]]) -> str:
+        """
+        Formats statistics returned by to_dict as a single line.
+
+        Args:
+            stats (Dict[str, Union[str, int, float, None]]): The statistics by name.
+
+        Returns:
+            str: The statistics as space-separated name=value pairs.
+        """
+        return " ".join(f"{name}={value}" for name, value in stats.items())
@@ -0,0 +1,308 @@
+from enum import Enum
+import os
+import struct
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+from game.moves import Moves
+from game.ranking import Ranking
+from game.solver import Solver
+from game.state_space import StateSpace
+from game.tiles import Tile
+
+# File header: magic, format version, row count, column count, compression flag, bytes per
+# state index (version 2 only, version 1 archives use 8)
+HEADER_FORMAT: str = "<4sBBBBB"
+LEGACY_HEADER_FORMAT: str = "<4sBBBB"
+MAGIC: bytes = b"SOLA"
+VERSION: int = 2
+LEGACY_VERSION: int = 1
+# Smallest number of bytes per state index, state indices of 5x5 boards and up need more
+MIN_INDEX_BYTES: int = 8
+# Record header after the state index: number of moves, payload length
+RECORD_FORMAT: str = "<HH"
+# Index entry after the state index: offset of the record in the archive
+INDEX_FORMAT: str = "<Q"
+# Moves packed into one byte, two bits per move
+MOVES_PER_BYTE: int = 4
+
+
+class SolutionOutput(Enum):
+    """
+    Enum class representing where solved puzzles are written to.
+
+    Attributes:
+        TEXT_FILES (str): One human-readable solution_<index>.txt file per solved puzzle.
+        ARCHIVE (str): A single append-only solution archive with an index file.
+    """
+
+    TEXT_FILES = "text_files"
+    ARCHIVE = "archive"
+
+
+class SolutionArchive:
+    """
+    Append-only container of many solutions in one file.
+
+    Every record holds the index of the start state in the state space and its
+    solution as two bits per move (optionally zlib-compressed), so a 31-move
+    solution takes 20 bytes instead of a text file with 32 rendered boards. A
+    separate index file (the archive path plus ".idx") maps state indices to
+    record offsets for random access. Records are only appended, so the
+    solutions of an interrupted run stay readable. State indices are stored with
+    a fixed number of bytes per archive, enough for every index of the board
+    shape (8 bytes up to 4x4 boards).
+
+    Attributes:
+        path (str): The path of the archive file.
+        row_count (int): The number of rows of the board.
+        col_count (int): The number of columns of the board.
+        compress (bool): True if the move payloads are zlib-compressed.
+        index_bytes (int): The number of bytes per state index.
+    """
+
+    def __init__(self, path: str, row_count: int = 0, col_count: int = 0, compress: bool = False):
+        """
+        Initializes a new instance of the SolutionArchive class.
+
+        An existing archive is opened with its stored board shape and compression
+        flag, otherwise a new archive is created with the given ones.
+
+        Args:
+            path (str): The path of the archive file.
+            row_count (int, optional): The number of rows of the board of a new archive.
+            col_count (int, optional): The number of columns of the board of a new archive.
+            compress (bool, optional): Compress the move payloads of a new archive. Defaults to False.
+
+        Raises:
+            ValueError: If the file is not a solution archive of this version.
+        """
+        self.path: str = path
+        self.index_path: str = f"{path}.idx"
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                header = file.read(struct.calcsize(HEADER_FORMAT))
+            magic, version = struct.unpack_from("<4sB", header)
+            if magic != MAGIC or version not in (LEGACY_VERSION, VERSION):
+                raise ValueError(f"{path} is not a solution archive of version {VERSION}")
+            if version == LEGACY_VERSION:
+                _, _, row_count, col_count, compress = struct.unpack_from(LEGACY_HEADER_FORMAT, header)
+                index_bytes = MIN_INDEX_BYTES
+            else:
+                _, _, row_count, col_count, compress, index_bytes = struct.unpack(HEADER_FORMAT, header)
+            self.header_size: int = struct.calcsize(
+                LEGACY_HEADER_FORMAT if version == LEGACY_VERSION else HEADER_FORMAT
+            )
+        else:
+            index_bytes = max(
+                MIN_INDEX_BYTES,
+                (Ranking.get_board_count(row_count, col_count).bit_length() + 7) // 8,
+            )
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(
+                    struct.pack(
+                        HEADER_FORMAT, MAGIC, VERSION, row_count, col_count, compress, index_bytes
+                    )
+                )
+            self.header_size = struct.calcsize(HEADER_FORMAT)
+        self.row_count: int = row_count
+        self.col_count: int = col_count
+        self.compress: bool = bool(compress)
+        self.index_bytes: int = index_bytes
+        # Open lazily, readers never need the write handles
+        self.file = None
+        self.index_file = None
+        # Record offset of every state index, loaded on the first lookup
+        self.offsets: Optional[Dict[int, int]] = None
+
+    def __enter__(self) -> "SolutionArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the write handles of the archive.
+        """
+        for handle in (self.file, self.index_file):
+            if handle is not None:
+                handle.close()
+        self.file = self.index_file = None
+
+    @staticmethod
+    def pack_moves(moves: List[str]) -> bytes:
+        """
+        Packs a list of moves into two bits per move.
+
+        Args:
+            moves (List[str]): The moves to pack.
+
+        Returns:
+            bytes: The packed moves.
+        """
+        codes = {move: index for index, move in enumerate(Moves.move_names)}
+        packed = bytearray((len(moves) + MOVES_PER_BYTE - 1) // MOVES_PER_BYTE)
+        for position, move in enumerate(moves):
+            packed[position >> 2] |= codes[move] << ((position & 3) << 1)
+        return bytes(packed)
+
+    @staticmethod
+    def unpack_moves(packed: bytes, move_count: int) -> List[str]:
+        """
+        Unpacks moves packed by pack_moves.
+
+        Args:
+            packed (bytes): The packed moves.
+            move_count (int): The number of moves.
+
+        Returns:
+            List[str]: The moves.
+        """
+        names = Moves.move_names
+        return [
+            names[(packed[position >> 2] >> ((position & 3) << 1)) & 3]
+            for position in range(move_count)
+        ]
+
+    def append(self, state_index: int, moves: List[str]) -> None:
+        """
+        Appends the solution of a start state to the archive.
+
+        Args:
+            state_index (int): The index of the start state in the state space.
+            moves (List[str]): The solution path as a list of moves.
+        """
+        if self.file is None:
+            self.file = open(self.path, "ab")
+            self.index_file = open(self.index_path, "ab")
+        payload = SolutionArchive.pack_moves(moves)
+        if self.compress:
+            payload = zlib.compress(payload)
+        offset = self.file.tell()
+        index = state_index.to_bytes(self.index_bytes, "little")
+        self.file.write(index + struct.pack(RECORD_FORMAT, len(moves), len(payload)))
+        self.file.write(payload)
+        self.index_file.write(index + struct.pack(INDEX_FORMAT, offset))
+        if self.offsets is not None:
+            self.offsets[state_index] = offset
+
+    def flush(self) -> None:
+        """
+        Writes buffered records to disk, the record data before its index entries.
+        """
+        if self.file is not None:
+            self.file.flush()
+            self.index_file.flush()
+
+    def load_index(self) -> Dict[int, int]:
+        """
+        Loads the record offsets of all state indices from the index file.
+
+        Index entries of records that were not completely written are skipped.
+
+        Returns:
+            Dict[int, int]: The record offset of every state index.
+        """
+        self.flush()
+        self.offsets = {}
+        if not os.path.exists(self.index_path):
+            return self.offsets
+        archive_size = os.path.getsize(self.path)
+        index_bytes = self.index_bytes
+        entry_size = index_bytes + struct.calcsize(INDEX_FORMAT)
+        record_header_size = index_bytes + struct.calcsize(RECORD_FORMAT)
+        with open(self.index_path, "rb") as file:
+            data = file.read()
+        # A partially written last entry is left out by the range
+        for entry in range(0, len(data) - entry_size + 1, entry_size):
+            state_index = int.from_bytes(data[entry : entry + index_bytes], "little")
+            (offset,) = struct.unpack_from(INDEX_FORMAT, data, entry + index_bytes)
+            if offset + record_header_size <= archive_size:
+                self.offsets[state_index] = offset
+        return self.offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets if self.offsets is not None else self.load_index())
+
+    def __contains__(self, state_index: int) -> bool:
+        offsets = self.offsets if self.offsets is not None else self.load_index()
+        return state_index in offsets
+
+    def get_moves(self, state_index: int) -> List[str]:
+        """
+        Returns the stored solution of a start state.
+
+        Args:
+            state_index (int): The index of the start state in the state space.
+
+        Returns:
+            List[str]: The solution path as a list of moves.
+
+        Raises:
+            KeyError: If the archive holds no solution of the state.
+        """
+        offsets = self.offsets if self.offsets is not None else self.load_index()
+        self.flush()
+        with open(self.path, "rb") as file:
+            file.seek(offsets[state_index])
+            return self.read_record(file)[1]
+
+    def render(self, state_index: int, all_states: StateSpace) -> str:
+        """
+        Renders a stored solution as the text of a solution_<index>.txt file.
+
+        Args:
+            state_index (int): The index of the start state in the state space.
+            all_states (StateSpace): The state space the solution was recorded for.
+
+        Returns:
+            str: The human-readable solution.
+        """
+        solved_state = all_states.solved_state
+        return Solver.render_solution(
+            all_states[state_index],
+            solved_state,
+            self.get_moves(state_index),
+            Tile.get_blank_tile_value(solved_state.tile_mode),
+        )
+
+    def read_record(self, file) -> Optional[Tuple[int, List[str]]]:
+        """
+        Reads the record at the current position of an open archive file.
+
+        Args:
+            file: The archive file opened for binary reading.
+
+        Returns:
+            Optional[Tuple[int, List[str]]]: The state index and its moves, or None at the
+                end of the file or of the completely written records.
+        """
+        header_size = self.index_bytes + struct.calcsize(RECORD_FORMAT)
+        header = file.read(header_size)
+        if len(header) < header_size:
+            return None
+        state_index = int.from_bytes(header[: self.index_bytes], "little")
+        move_count, payload_length = struct.unpack_from(RECORD_FORMAT, header, self.index_bytes)
+        payload = file.read(payload_length)
+        if len(payload) < payload_length:
+            return None
+        if self.compress:
+            payload = zlib.decompress(payload)
+        return state_index, SolutionArchive.unpack_moves(payload, move_count)
+
+    def __iter__(self) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Yields all records in the order they were written.
+
+        Yields:
+            Tuple[int, List[str]]: The state index and its solution path.
+        """
+        self.flush()
+        with open(self.path, "rb") as file:
+            file.seek(self.header_size)
+            while True:
+                record = self.read_record(file)
+                if record is None:
+                    return
+                yield record
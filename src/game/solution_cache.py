@@ -0,0 +1,228 @@
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+from game.board import Board, BoardLayout
+from game.symmetry import Symmetry
+
+# Largest number of boards kept in the cache, the least recently used are evicted first
+DEFAULT_MAX_ENTRIES: int = 500_000
+# Seconds a process waits for another process writing to the cache
+LOCK_TIMEOUT: float = 30.0
+# Single-letter code of every move, solutions are stored as strings of these letters
+MOVE_LETTERS: Dict[str, str] = {"up": "u", "down": "d", "left": "l", "right": "r"}
+LETTER_MOVES: Dict[str, str] = {letter: move for move, letter in MOVE_LETTERS.items()}
+
+
+class SolutionCache:
+    """
+    Persistent cache of optimal solutions shared by all runs and worker processes.
+
+    Solutions are stored in an SQLite database under assets/cache, keyed by the
+    board shape and the packed board (see game.board), which already encodes the
+    goal-relative position of every tile. Every suffix of an optimal solution is
+    an optimal solution of the board it starts from, so storing a solution stores
+    one entry per board on its path. The database is bounded: the least recently
+    used entries are evicted once it holds more than max_entries boards.
+    Canonical boards with interchangeable identical tiles (see Board.canonical)
+    are cached under a variant of the shape naming the classes of the tile
+    codes, so they never collide with labelled boards or other duplicate layouts.
+
+    On square boards a board and its transpose share one entry (see
+    game.symmetry): only the canonical board is stored, with its solution
+    transposed if needed, and the solution is transposed back when the other
+    board is looked up. The database stores half as many boards, while both
+    boards of every pair are known to the search engines.
+
+    Besides the moves, every process keeps the solution length of all cached
+    boards of its shape in memory, so the search engines can test every
+    expanded board for a known exact distance at the cost of a dict lookup.
+
+    Attributes:
+        row_count (int): The number of rows of the board.
+        col_count (int): The number of columns of the board.
+        variant (str): The class codes of a canonical board shape, empty for labelled boards.
+        symmetry (Optional[Symmetry]): The symmetry of square labelled boards, None if it is not used.
+        path (str): The path of the database file.
+        max_entries (int): The largest number of cached boards.
+        entry_count (int): The number of entries of all shapes, as far as this process knows.
+        lengths (Dict[int, int]): The solution length of every cached board of the shape.
+    """
+
+    _caches: Dict[Tuple[int, int, str], "SolutionCache"] = {}
+
+    def __init__(
+        self,
+        row_count: int,
+        col_count: int,
+        path: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        variant: str = "",
+    ):
+        """
+        Initializes a new instance of the SolutionCache class.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            path (str): The path of the database file, created if it does not exist.
+            max_entries (int, optional): The largest number of cached boards. Defaults to DEFAULT_MAX_ENTRIES.
+            variant (str, optional): The class codes of a canonical board shape. Defaults to "" (labelled boards).
+        """
+        self.row_count: int = row_count
+        self.col_count: int = col_count
+        self.layout: BoardLayout = BoardLayout.get(row_count, col_count)
+        self.variant: str = variant
+        self.shape: str = f"{row_count}x{col_count}" + (f"/{variant}" if variant else "")
+        # Identical tiles of a variant may not have identical transposed tiles
+        self.symmetry: Optional[Symmetry] = None if variant else Symmetry.get(row_count, col_count)
+        self.path: str = path
+        self.max_entries: int = max_entries
+        self.process_id: int = os.getpid()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(path, timeout=LOCK_TIMEOUT)
+        # Write-ahead logging lets the workers read while another process writes
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS solutions ("
+            "shape TEXT NOT NULL, board TEXT NOT NULL, moves TEXT NOT NULL, "
+            "last_used REAL NOT NULL, PRIMARY KEY (shape, board))"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)"
+        )
+        self.connection.commit()
+        # Running number of entries of all shapes, counted once here and kept by store
+        (self.entry_count,) = self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()
+        self.lengths: Dict[int, int] = {}
+        for board, length in self.connection.execute(
+            "SELECT board, length(moves) FROM solutions WHERE shape = ?", (self.shape,)
+        ):
+            self.add_length(int(board, 16), length)
+
+    @staticmethod
+    def get_file_path() -> str:
+        """
+        Returns the path of the cache database.
+
+        Returns:
+            str: The path of the database file under assets/cache.
+        """
+        dir_of_script = os.path.dirname(os.path.abspath(__file__))
+        return os.path.join(
+            dir_of_script, os.pardir, os.pardir, "assets", "cache", "solutions.sqlite"
+        )
+
+    @staticmethod
+    def get(row_count: int, col_count: int, variant: str = "") -> "SolutionCache":
+        """
+        Returns the cache of a board shape, opened once per process.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            variant (str, optional): The class codes of a canonical board shape. Defaults to "" (labelled boards).
+
+        Returns:
+            SolutionCache: The solution cache.
+        """
+        cache = SolutionCache._caches.get((row_count, col_count, variant))
+        # A connection inherited from a parent process must not be used after a fork
+        if cache is None or cache.process_id != os.getpid():
+            cache = SolutionCache(
+                row_count, col_count, SolutionCache.get_file_path(), variant=variant
+            )
+            SolutionCache._caches[(row_count, col_count, variant)] = cache
+        return cache
+
+    def add_length(self, key: int, length: int) -> None:
+        """
+        Records the solution length of a cached board and of its transposed board.
+
+        Args:
+            key (int): The packed board.
+            length (int): The length of its optimal solution.
+        """
+        self.lengths[key] = length
+        if self.symmetry is not None:
+            self.lengths[self.symmetry.transpose(key)] = length
+
+    def get_moves(self, key: int) -> Optional[List[str]]:
+        """
+        Returns the cached optimal solution of a board and marks it as recently used.
+
+        Args:
+            key (int): The packed board.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if the board is not cached.
+        """
+        if key not in self.lengths:
+            return None
+        transposed = False
+        if self.symmetry is not None:
+            key, transposed = self.symmetry.canonical(key)
+        board = format(key, "x")
+        row = self.connection.execute(
+            "SELECT moves FROM solutions WHERE shape = ? AND board = ?", (self.shape, board)
+        ).fetchone()
+        if row is None:
+            # Evicted by another process
+            self.lengths.pop(key, None)
+            if self.symmetry is not None:
+                self.lengths.pop(self.symmetry.transpose(key), None)
+            return None
+        self.connection.execute(
+            "UPDATE solutions SET last_used = ? WHERE shape = ? AND board = ?",
+            (time.time(), self.shape, board),
+        )
+        self.connection.commit()
+        moves = [LETTER_MOVES[letter] for letter in row[0]]
+        return Symmetry.transpose_moves(moves) if transposed else moves
+
+    def store(self, board: Board, moves: List[str]) -> None:
+        """
+        Stores an optimal solution and the solutions of all boards on its path.
+
+        Args:
+            board (Board): The start board of the solution.
+            moves (List[str]): The optimal solution path as a list of moves.
+        """
+        letters = "".join(MOVE_LETTERS[move] for move in moves)
+        now = time.time()
+        entries = []
+        for position in range(len(moves) + 1):
+            if board.key not in self.lengths:
+                key, suffix = board.key, letters[position:]
+                if self.symmetry is not None:
+                    key, transposed = self.symmetry.canonical(key)
+                    if transposed:
+                        # Store the solution of the canonical board
+                        suffix = "".join(
+                            MOVE_LETTERS[move]
+                            for move in Symmetry.transpose_moves(moves[position:])
+                        )
+                entries.append((self.shape, format(key, "x"), suffix, now))
+                self.add_length(key, len(moves) - position)
+            if position < len(moves):
+                board = board.apply_move(moves[position])
+        if not entries:
+            return
+        inserted = self.connection.executemany(
+            "INSERT OR IGNORE INTO solutions (shape, board, moves, last_used) VALUES (?, ?, ?, ?)",
+            entries,
+        ).rowcount
+        self.entry_count += inserted
+        # Evict the least recently used boards of all shapes above the bound; the running count
+        # misses the entries of other processes, so the table is counted once before evicting
+        if self.entry_count > self.max_entries:
+            (self.entry_count,) = self.connection.execute(
+                "SELECT COUNT(*) FROM solutions"
+            ).fetchone()
+            if self.entry_count > self.max_entries:
+                self.entry_count -= self.connection.execute(
+                    "DELETE FROM solutions WHERE rowid IN "
+                    "(SELECT rowid FROM solutions ORDER BY last_used LIMIT ?)",
+                    (self.entry_count - self.max_entries,),
+                ).rowcount
+        self.connection.commit()
@@ -0,0 +1,214 @@
+from collections import deque
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+from game.board import Board, BoardLayout
+from game.moves import Moves
+from game.ranking import Ranking
+from game.symmetry import Symmetry, TRANSPOSED_MOVES
+
+# File header: magic, format version, row count, column count
+HEADER_FORMAT: str = "<4sBBB"
+MAGIC: bytes = b"SOLT"
+VERSION: int = 2
+UNREACHED: int = 255
+# Largest board (in cells) for which a complete table is built
+MAX_TABLE_SIZE: int = 10
+
+
+class SolutionTable:
+    """
+    Optimal solutions of every board of one shape, computed by a single breadth-first
+    search backwards from the goal board.
+
+    For every solvable board, indexed by its dense rank in [0, n!/2) (see
+    Ranking.rank_board), the table stores the
+    depth (distance to the goal) and the first move of an optimal solution. A path
+    is emitted by following these moves until the goal is reached, so answering
+    an instance costs O(solution length) instead of a search.
+
+    On square boards the search only expands canonical boards (see game.symmetry)
+    and fills the entry of every transposed board from its canonical board, which
+    halves the expansions of the build. The table stays indexed by the dense rank
+    of every board, so its size does not shrink: the ranks of canonical boards
+    are not dense.
+
+    Attributes:
+        row_count (int): The number of rows of the board.
+        col_count (int): The number of columns of the board.
+        layout (BoardLayout): The layout of the board.
+        entry_count (int): The number of table entries.
+        path (str): The path of the table file.
+        table (mmap.mmap): The memory-mapped table file.
+    """
+
+    _tables: Dict[Tuple[int, int], "SolutionTable"] = {}
+
+    def __init__(self, row_count: int, col_count: int, path: str):
+        """
+        Initializes a new instance of the SolutionTable class by mapping an existing table file.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            path (str): The path of the table file.
+        """
+        self.row_count: int = row_count
+        self.col_count: int = col_count
+        self.layout: BoardLayout = BoardLayout.get(row_count, col_count)
+        self.entry_count: int = Ranking.get_board_count(row_count, col_count)
+        self.path: str = path
+        with open(path, "rb") as file:
+            self.table: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rows, cols = struct.unpack_from(HEADER_FORMAT, self.table, 0)
+        if magic != MAGIC or version != VERSION or (rows, cols) != (row_count, col_count):
+            raise ValueError(f"Solution table {path} does not match the board shape")
+        self.moves_offset: int = struct.calcsize(HEADER_FORMAT)
+        self.depths_offset: int = self.moves_offset + self.entry_count
+
+    @staticmethod
+    def get_file_path(row_count: int, col_count: int) -> str:
+        """
+        Returns the path of the table file of a board shape.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            str: The path of the table file under assets/tables.
+        """
+        dir_of_script = os.path.dirname(os.path.abspath(__file__))
+        tables_path = os.path.join(dir_of_script, os.pardir, os.pardir, "assets", "tables")
+        return os.path.join(tables_path, f"solution_table_{row_count}x{col_count}.bin")
+
+    @staticmethod
+    def get(row_count: int, col_count: int) -> "SolutionTable":
+        """
+        Returns the mapped table of a board shape, building the table file on first use.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            SolutionTable: The solution table.
+
+        Raises:
+            ValueError: If the board is too large for a complete table.
+        """
+        table = SolutionTable._tables.get((row_count, col_count))
+        if table is None:
+            if row_count * col_count > MAX_TABLE_SIZE:
+                raise ValueError(
+                    f"Solution tables are limited to boards with at most {MAX_TABLE_SIZE} cells"
+                )
+            path = SolutionTable.get_file_path(row_count, col_count)
+            if not os.path.exists(path):
+                SolutionTable.build(row_count, col_count, path)
+            table = SolutionTable(row_count, col_count, path)
+            SolutionTable._tables[(row_count, col_count)] = table
+        return table
+
+    @staticmethod
+    def build(row_count: int, col_count: int, path: str) -> None:
+        """
+        Builds the table file of a board shape by a breadth-first search from the goal.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            path (str): The path of the table file to write.
+        """
+        layout = BoardLayout.get(row_count, col_count)
+        transitions, mask, unpack = layout.transitions, layout.mask, layout.unpack
+        entry_count = Ranking.get_board_count(row_count, col_count)
+        move_indices = {move: index for index, move in enumerate(Moves.move_names)}
+        # First move of an optimal solution and depth of every board
+        moves = bytearray([UNREACHED]) * entry_count
+        depths = bytearray([UNREACHED]) * entry_count
+        goal = Board.goal(row_count, col_count)
+        goal_rank = Ranking.rank_board(unpack(goal.key), row_count, col_count)
+        depths[goal_rank] = 0
+        symmetry: Optional[Symmetry] = Symmetry.get(row_count, col_count)
+        # Every layer holds both boards of a transposed pair, only canonical boards are queued
+        queue = deque([(goal.key, goal.blank, 0)])
+        while queue:
+            key, blank, depth = queue.popleft()
+            for target, move, factor, shift in transitions[blank]:
+                neighbor_key = key + ((key >> shift) & mask) * factor
+                neighbor_rank = Ranking.rank_board(unpack(neighbor_key), row_count, col_count)
+                if depths[neighbor_rank] == UNREACHED:
+                    # The neighbour reaches the current board by undoing the move
+                    back_move = Moves.opposite_moves[move]
+                    moves[neighbor_rank] = move_indices[back_move]
+                    depths[neighbor_rank] = min(depth + 1, UNREACHED - 1)
+                    if symmetry is not None:
+                        transposed_key = symmetry.transpose(neighbor_key)
+                        transposed_rank = Ranking.rank_board(
+                            unpack(transposed_key), row_count, col_count
+                        )
+                        moves[transposed_rank] = move_indices[TRANSPOSED_MOVES[back_move]]
+                        depths[transposed_rank] = depths[neighbor_rank]
+                        if transposed_key < neighbor_key:
+                            queue.append((transposed_key, symmetry.cells[target], depth + 1))
+                            continue
+                    queue.append((neighbor_key, target, depth + 1))
+        # Write to a temporary file first so that concurrent readers never see a partial table
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, row_count, col_count))
+            file.write(moves)
+            file.write(depths)
+        os.replace(temporary_path, path)
+
+    def get_depth(self, board: Board) -> Optional[int]:
+        """
+        Returns the length of an optimal solution of a board.
+
+        Args:
+            board (Board): The board to look up.
+
+        Returns:
+            Optional[int]: The number of moves to the goal, or None if the goal is unreachable.
+        """
+        if not board.is_solvable():
+            return None
+        depth = self.table[self.depths_offset + self.rank(board)]
+        return None if depth == UNREACHED else depth
+
+    def get_path(self, board: Board) -> Optional[List[str]]:
+        """
+        Returns an optimal solution of a board by following the stored moves.
+
+        Args:
+            board (Board): The start board.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if the goal is unreachable.
+        """
+        path: List[str] = []
+        moves_offset, depths_offset = self.moves_offset, self.depths_offset
+        if not board.is_solvable():
+            return None
+        rank = self.rank(board)
+        while self.table[depths_offset + rank] != 0:
+            move = Moves.move_names[self.table[moves_offset + rank]]
+            path.append(move)
+            board = board.apply_move(move)
+            rank = self.rank(board)
+        return path
+
+    def rank(self, board: Board) -> int:
+        """
+        Returns the table index of a solvable board.
+
+        Args:
+            board (Board): The board to rank.
+
+        Returns:
+            int: The dense rank of the board.
+        """
+        return Ranking.rank_board(board.to_codes(), self.row_count, self.col_count)
@@ -0,0 +1,172 @@
+from math import factorial
+from typing import Iterator, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, callers fall back to the pure Python paths
+    np = None
+
+# Number of permutations generated and checked at once
+BLOCK_SIZE: int = 1 << 16
+# Largest permutation length whose lexicographic ranks fit into int64 (20! < 2^63 < 21!)
+MAX_PERMUTATION_LENGTH: int = 20
+
+
+class Solvability:
+    """
+    Vectorised solvability checks and permutation generation for many boards at once.
+
+    Boards are 2-D integer arrays with one board per row and one tile code per
+    column in cell order (0 being the blank, every other tile coded by its goal
+    cell plus one, see game.board). Requires numpy.
+    """
+
+    @staticmethod
+    def is_available() -> bool:
+        """
+        Checks if numpy is installed.
+
+        Returns:
+            bool: True if the vectorised paths can be used, False otherwise.
+        """
+        return np is not None
+
+    @staticmethod
+    def require_numpy() -> None:
+        """
+        Raises an error if numpy is not installed.
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+        if np is None:
+            raise ImportError("The vectorised solvability checks require numpy")
+
+    @staticmethod
+    def count_inversions(permutations: "np.ndarray") -> "np.ndarray":
+        """
+        Counts the inversions of every row.
+
+        Args:
+            permutations (np.ndarray): An (N, m) array of values.
+
+        Returns:
+            np.ndarray: The number of pairs i < j with row[i] > row[j] for every row.
+        """
+        Solvability.require_numpy()
+        permutations = np.asarray(permutations)
+        inversions = np.zeros(len(permutations), dtype=np.int64)
+        for i in range(permutations.shape[1] - 1):
+            inversions += (permutations[:, i, None] > permutations[:, i + 1 :]).sum(axis=1)
+        return inversions
+
+    @staticmethod
+    def are_solvable(boards: "np.ndarray", row_count: int, col_count: int) -> "np.ndarray":
+        """
+        Checks which boards can reach the goal board.
+
+        A board is solvable if the inversion parity of its tiles (blank removed)
+        equals the parity of the blank's distance to its goal cell plus the number
+        of cells after the blank (see Ranking.tiles_parity).
+
+        Args:
+            boards (np.ndarray): An (N, row_count * col_count) array of tile codes.
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            np.ndarray: A boolean array, True for every solvable board.
+        """
+        Solvability.require_numpy()
+        boards = np.asarray(boards)
+        size = row_count * col_count
+        if boards.ndim != 2 or boards.shape[1] != size:
+            raise ValueError(f"Expected an (N, {size}) array of tile codes")
+        blanks = np.argmax(boards == 0, axis=1)
+        # Removing the blank keeps the cell order of the remaining tiles
+        tiles = boards[boards != 0].reshape(len(boards), size - 1)
+        blank_rows, blank_cols = np.divmod(blanks, col_count)
+        required_parity = (
+            (row_count - 1 - blank_rows) + (col_count - 1 - blank_cols) + (size - 1 - blanks)
+        ) % 2
+        return Solvability.count_inversions(tiles) % 2 == required_parity
+
+    @staticmethod
+    def permutation_block(n: int, start: int, count: int) -> "np.ndarray":
+        """
+        Generates a block of permutations of 0..n-1 in lexicographic order.
+
+        Row k of the block is the permutation with lexicographic rank start + k, so
+        consecutive blocks enumerate the permutations in itertools.permutations order.
+
+        Args:
+            n (int): The length of the permutations.
+            start (int): The rank of the first permutation.
+            count (int): The number of permutations.
+
+        Returns:
+            np.ndarray: A (count, n) array of permutations.
+
+        Raises:
+            ValueError: If n exceeds MAX_PERMUTATION_LENGTH, the ranks would overflow int64.
+        """
+        Solvability.require_numpy()
+        if n > MAX_PERMUTATION_LENGTH:
+            raise ValueError(
+                f"Permutations of length {n} cannot be ranked in int64, "
+                f"at most {MAX_PERMUTATION_LENGTH} are supported"
+            )
+        ranks = np.arange(start, start + count, dtype=np.int64)
+        # Lehmer digits, the last position first
+        digits = np.zeros((count, n), dtype=np.int64)
+        for position in range(n - 1, -1, -1):
+            base = n - position
+            ranks, digits[:, position] = np.divmod(ranks, base)
+        permutations = np.zeros((count, n), dtype=np.int64)
+        available = np.ones((count, n), dtype=bool)
+        rows = np.arange(count)
+        for position in range(n):
+            # Pick the (digit + 1)-th value that is still available
+            chosen = np.argmax(np.cumsum(available, axis=1) > digits[:, position, None], axis=1)
+            permutations[:, position] = chosen
+            available[rows, chosen] = False
+        return permutations
+
+    @staticmethod
+    def solvable_permutations(
+        row_count: int, col_count: int, block_size: int = BLOCK_SIZE
+    ) -> Iterator["np.ndarray"]:
+        """
+        Yields the solvable permutations of the goal cells in lexicographic order.
+
+        Row k of a yielded array lists, for every cell, the goal cell of the tile on
+        it. Permutations are generated and filtered block by block.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            block_size (int, optional): The number of permutations per block. Defaults to BLOCK_SIZE.
+
+        Yields:
+            np.ndarray: A (k, row_count * col_count) array of solvable permutations.
+        """
+        size = row_count * col_count
+        total = factorial(size)
+        for start in range(0, total, block_size):
+            block = Solvability.permutation_block(size, start, min(block_size, total - start))
+            # The tile on goal cell i has code i + 1, the blank (last goal cell) has code 0
+            yield block[Solvability.are_solvable((block + 1) % size, row_count, col_count)]
+
+    @staticmethod
+    def codes_to_array(boards: Sequence[Sequence[int]]) -> "np.ndarray":
+        """
+        Converts a sequence of tile code lists into a board array.
+
+        Args:
+            boards (Sequence[Sequence[int]]): The tile codes of every board.
+
+        Returns:
+            np.ndarray: An (N, size) array of tile codes.
+        """
+        Solvability.require_numpy()
+        return np.asarray(boards, dtype=np.int64)
@@ -1,15 +1,93 @@
-from collections import deque
-from typing import List, Tuple, Optional, Set, Deque, Union
+from collections import Counter, deque
+from enum import Enum
+import heapq
+from time import perf_counter
+from typing import Dict, List, Tuple, Optional, Set, Deque, Union
 from game.utils import PuzzleUtils as utils
 from game.tiles import Tile
 from game.state import State
 from game.moves import Moves
+from game.board import Board, BoardLayout
+from game.heuristics import Heuristic, HeuristicType
+from game.solution_table import SolutionTable
+from game.solution_cache import SolutionCache
+from game.search_stats import SearchStats
+from game.search_budget import BudgetExceeded, BudgetOutcome, SearchBudget
+from game.ranking import Ranking, RankMoveTable
+from game.reduction import Reduction
+from game.move_kernel import MoveKernel
+from game.pattern_database import PatternDatabase
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from game.puzzle import Puzzle
 
 
+class SolverEngine(Enum):
+    """
+    Enum class representing the available search engines of the solver.
+
+    Attributes:
+        BFS (str): Uninformed breadth-first search.
+        A_STAR (str): A* search, fast but keeps every generated board in memory.
+        IDA_STAR (str): Iterative deepening A*, memory grows only with the solution depth.
+        AUTO (str): A* for boards up to AUTO_A_STAR_MAX_SIZE cells. Up to AUTO_OPTIMAL_MAX_SIZE cells
+            IDA* with the pattern databases if their tables are built, within AUTO_OPTIMAL_SECONDS
+            and else weighted A*, or weighted A* right away without the tables. Row and column
+            reduction for larger boards.
+        LOOKUP_TABLE (str): Lookup in a table of all optimal solutions built once per board shape.
+        BIDIRECTIONAL (str): Breadth-first search from the start and the goal board meeting in the middle.
+        GREEDY (str): Greedy best-first search by the heuristic alone, fast but not optimal.
+        WEIGHTED_A_STAR (str): A* with the heuristic scaled by Solver.weight, trades solution length for speed.
+        REDUCTION (str): Constructive row and column reduction (see game.reduction), fast but far from optimal.
+    """
+
+    BFS = "bfs"
+    A_STAR = "a_star"
+    IDA_STAR = "ida_star"
+    AUTO = "auto"
+    LOOKUP_TABLE = "lookup_table"
+    BIDIRECTIONAL = "bidirectional"
+    GREEDY = "greedy"
+    WEIGHTED_A_STAR = "weighted_a_star"
+    REDUCTION = "reduction"
+
+
+# Heuristics used by the informed engines if none are selected
+DEFAULT_HEURISTICS: List[HeuristicType] = [
+    HeuristicType.MANHATTAN,
+    HeuristicType.LINEAR_CONFLICT,
+]
+# Largest board (in cells) that SolverEngine.AUTO solves with A*
+AUTO_A_STAR_MAX_SIZE: int = 9
+# Largest board (in cells) that SolverEngine.AUTO solves by search. Above AUTO_A_STAR_MAX_SIZE
+# cells, IDA* on Manhattan distance and linear conflict takes minutes per board, so optimal
+# solutions are only tried with built pattern databases; 5x5 boards and up are reduced
+AUTO_OPTIMAL_MAX_SIZE: int = 16
+# Seconds SolverEngine.AUTO searches for an optimal solution of a board above AUTO_A_STAR_MAX_SIZE
+# cells before it falls back to weighted A*, unless the solver has a budget of its own
+AUTO_OPTIMAL_SECONDS: float = 5.0
+INFINITY: float = float("inf")
+# Heuristic weight of SolverEngine.WEIGHTED_A_STAR, its solutions are at most this many times
+# longer than optimal ones
+DEFAULT_WEIGHT: float = 2.0
+# Move code stored by BFS for the start board, which is not reached by any move
+START_MOVE_CODE: int = 15
+# Board sizes (in cells) whose BFS moves are stored in a table over dense ranks. Ranking a
+# board costs more than hashing its key, so 3x3 boards, whose full state space fits in a
+# dict, keep the dict; up to 12 cells the table needs at most 12!/2 nibbles (120 MB)
+BITSET_MIN_SIZE: int = 10
+BITSET_MAX_SIZE: int = 12
+# Engines whose solutions are optimal and may be stored in the solution cache
+OPTIMAL_ENGINES: Set[SolverEngine] = {
+    SolverEngine.BFS,
+    SolverEngine.A_STAR,
+    SolverEngine.IDA_STAR,
+    SolverEngine.LOOKUP_TABLE,
+    SolverEngine.BIDIRECTIONAL,
+}
+
+
 class Solver:
     """
     A class that represents a solver for a puzzle game.
@@ -20,9 +98,24 @@ class Solver:
         puzzle_instance (Puzzle): The instance of the puzzle.
         col_count (int): The number of columns in the puzzle board.
         goal_state (State): The goal state of the puzzle.
+        engine (SolverEngine): The search engine used by solve().
+        heuristic_types (List[HeuristicType]): The heuristics of the informed engines.
+        nodes_expanded (int): The number of boards expanded by the last bidirectional search.
+        cache (Optional[SolutionCache]): The persistent solution cache, None if it is not used.
+        stats (Optional[SearchStats]): The statistics of the last search, None if they are not collected.
+        budget (Optional[SearchBudget]): The limits of a search, None for no limits.
+        budget_outcome (Optional[BudgetOutcome]): How the last search ended with respect to the budget,
+            None without one; the time limit SolverEngine.AUTO sets itself is not reported here.
+        budget_reason (Optional[str]): The limit the last search exceeded, if any.
+        weight (float): The heuristic weight of SolverEngine.WEIGHTED_A_STAR.
+        solution_length (Optional[int]): The number of moves of the last solution, None if none was found.
+        lower_bound (Optional[int]): A lower bound of the optimal solution length of the start board:
+            the solution length for optimal engines, the heuristic estimate otherwise.
+        code_classes (Optional[List[int]]): The class code of every tile code if identical tiles are
+            interchangeable and the goal has duplicated values, None otherwise.
 
     Methods:
-        solve(): Solves the puzzle and returns the solution path.
+        solve(): Solves the puzzle with the selected engine and returns the solution path.
         apply_solution_and_draw(solution: List[str]): Applies the solution path to the puzzle and draws the result.
     """
 
@@ -33,6 +126,13 @@ class Solver:
         puzzle_instance: "Puzzle",
         col_count: int,
         goal_state: State,
+        engine: "SolverEngine" = None,
+        heuristics: List[HeuristicType] = None,
+        use_cache: bool = False,
+        collect_stats: bool = False,
+        budget: Optional[SearchBudget] = None,
+        weight: float = DEFAULT_WEIGHT,
+        interchangeable_duplicates: bool = False,
     ):
         """
         Initializes a new instance of the Solver class.
@@ -43,7 +143,22 @@ class Solver:
             puzzle_instance (Puzzle): The instance of the puzzle.
             col_count (int): The number of columns in the puzzle board.
             goal_state (State): The goal state of the puzzle.
+            engine (SolverEngine, optional): The search engine to use. Defaults to SolverEngine.BFS.
+            heuristics (List[HeuristicType], optional): The heuristics of the informed engines.
+                Defaults to Manhattan distance plus linear conflict.
+            use_cache (bool, optional): Reuse and extend the persistent solution cache. Defaults to False.
+            collect_stats (bool, optional): Collect search statistics in Solver.stats. Defaults to False.
+            budget (Optional[SearchBudget], optional): The limits of every search. Defaults to None.
+            weight (float, optional): The heuristic weight of SolverEngine.WEIGHTED_A_STAR,
+                at least 1. Defaults to DEFAULT_WEIGHT.
+            interchangeable_duplicates (bool, optional): Treat identical tiles as interchangeable, so any
+                arrangement of the goal's visible values is a goal. Defaults to False.
+
+        Raises:
+            ValueError: If the weight is smaller than 1.
         """
+        if weight < 1:
+            raise ValueError(f"The heuristic weight must be at least 1, got {weight}")
         self.start_state: State = start_state
         self.state_id: int = state_id
         self.board_width: int = col_count
@@ -55,76 +170,843 @@ class Solver:
         self.blank_tile_value: Union[int, str] = Tile.get_blank_tile_value(
             self.puzzle_instance.tile_mode
         )
-        self.visited: Set[Tuple[Tuple[int, ...], ...]] = set()
-        self.prev_state: str = None
+        # Number of rows of the board, derived from the number of tiles
+        self.board_height: int = len(start_state.state) // col_count
+        self.engine: SolverEngine = engine if engine is not None else SolverEngine.BFS
+        self.heuristic_types: List[HeuristicType] = (
+            heuristics if heuristics is not None else DEFAULT_HEURISTICS
+        )
+        # Boards reached by the last BFS, read back by rebuild_path: packed keys mapped to the
+        # code of the move that reached them, or a table over dense ranks on mid-sized boards
+        self.visited: Union[Set[int], Dict[int, int], RankMoveTable] = set()
+        # Packed start and goal boards used by the search engines
+        self.start_board: Board = Board.from_state(start_state, col_count)
+        goal_board: Board = Board.from_state(goal_state, col_count)
+        self.code_classes: Optional[List[int]] = None
+        if interchangeable_duplicates:
+            code_classes = Board.get_code_classes(goal_state)
+            # Without duplicated values every board is already canonical
+            if len(set(code_classes)) < len(code_classes):
+                self.code_classes = code_classes
+        # Solvable labelled start board, kept for the engines that need distinct tiles
+        self.labelled_board: Board = self.start_board
+        cache_variant: str = ""
+        if self.code_classes is not None:
+            if not self.start_board.is_solvable():
+                self.labelled_board = self.relabel(self.start_board)
+            # The engines search boards of visible values, every goal arrangement has one key
+            self.start_board = self.start_board.canonical(self.code_classes)
+            goal_board = goal_board.canonical(self.code_classes)
+            cache_variant = ",".join(map(str, self.code_classes))
+        self.goal_key: int = goal_board.key
+        self.nodes_expanded: int = 0
+        self.cache: Optional[SolutionCache] = (
+            SolutionCache.get(self.board_height, col_count, cache_variant) if use_cache else None
+        )
+        self.collect_stats: bool = collect_stats
+        self.stats: Optional[SearchStats] = None
+        self.budget: Optional[SearchBudget] = budget
+        self.budget_outcome: Optional[BudgetOutcome] = None
+        self.budget_reason: Optional[str] = None
+        # Start of the running search, the time budget is measured from here
+        self.search_start: float = 0.0
+        # Budget and heuristics of the running search, the caller's unless SolverEngine.AUTO
+        # picked its own, so that budget and heuristic_types keep what the caller set
+        self.search_budget: Optional[SearchBudget] = budget
+        self.search_heuristics: List[HeuristicType] = self.heuristic_types
+        self.weight: float = weight
+        self.solution_length: Optional[int] = None
+        self.lower_bound: Optional[int] = None
+
+    def solve(self) -> Optional[List[str]]:
+        """
+        Solves the puzzle with the selected engine and returns the solution path.
+
+        The engines run on packed boards (see game.board) instead of State objects,
+        so expanding a node costs one integer per neighbour. With the solution cache,
+        a cached start board is answered without a search, the search engines stop
+        early at cached boards, and optimal solutions are added to the cache. With a
+        budget, a search that exceeds it is repeated with the fallback engine or
+        given up (see Solver.budget_outcome). The length of the solution and a lower
+        bound of the optimal length are kept in Solver.solution_length and
+        Solver.lower_bound, so callers can see how far a solution of a suboptimal
+        engine is from optimal.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if no solution is found.
+        """
+        search_start = perf_counter()
+        engine: SolverEngine = self.engine
+        heuristic_types: List[HeuristicType] = self.heuristic_types
+        budget: Optional[SearchBudget] = self.budget
+        if engine == SolverEngine.AUTO:
+            # A* keeps every generated board, so it is only used for small boards
+            size: int = self.start_board.layout.size
+            if size <= AUTO_A_STAR_MAX_SIZE:
+                engine = SolverEngine.A_STAR
+            elif size <= AUTO_OPTIMAL_MAX_SIZE:
+                # IDA* is only fast enough with built pattern databases, and even then not on
+                # every board or shape, so it gets a time budget; building them is left to
+                # Puzzle.start, without them weighted A* is used right away
+                if self.code_classes is None and PatternDatabase.is_built(
+                    self.board_height, self.board_width
+                ):
+                    engine = SolverEngine.IDA_STAR
+                    if HeuristicType.PATTERN_DATABASE not in heuristic_types:
+                        heuristic_types = heuristic_types + [HeuristicType.PATTERN_DATABASE]
+                    if budget is None:
+                        budget = SearchBudget(
+                            max_seconds=AUTO_OPTIMAL_SECONDS,
+                            fallback=SolverEngine.WEIGHTED_A_STAR,
+                        )
+                else:
+                    engine = SolverEngine.WEIGHTED_A_STAR
+            else:
+                engine = SolverEngine.REDUCTION
+        if self.collect_stats:
+            self.stats = SearchStats(engine.value)
+        solution = self.cache.get_moves(self.start_board.key) if self.cache is not None else None
+        # Cached solutions are optimal
+        optimal: bool = solution is not None
+        if solution is None:
+            solution, engine = self.search_within_budget(engine, budget, heuristic_types)
+            if self.budget is None:
+                # A fallback within AUTO's own time limit shows in lower_bound instead
+                self.budget_outcome = None
+                self.budget_reason = None
+            optimal = engine in OPTIMAL_ENGINES
+            if solution is not None and self.cache is not None and optimal:
+                self.cache.store(self.start_board, solution)
+        self.solution_length = None if solution is None else len(solution)
+        self.lower_bound = self.solution_length
+        if solution is not None and not optimal:
+            layout: BoardLayout = self.start_board.layout
+            self.lower_bound = self.get_heuristic().estimate(layout.unpack(self.start_board.key))
+        if self.stats is not None:
+            self.stats.total_time = perf_counter() - search_start
+            self.stats.solution_length = self.solution_length
+        return solution
+
+    def search_within_budget(
+        self,
+        engine: SolverEngine,
+        budget: Optional[SearchBudget],
+        heuristic_types: List[HeuristicType],
+    ) -> Tuple[Optional[List[str]], SolverEngine]:
+        """
+        Runs a search engine on the start board and falls back if it exceeds the budget.
+
+        Args:
+            engine (SolverEngine): The search engine, not SolverEngine.AUTO.
+            budget (Optional[SearchBudget]): The limits of the search, None for no limits.
+            heuristic_types (List[HeuristicType]): The heuristics of the informed engines.
+
+        Returns:
+            Tuple[Optional[List[str]], SolverEngine]: The solution path (None if no solution is found)
+                and the engine that found it.
+        """
+        self.budget_outcome = None
+        self.budget_reason = None
+        self.search_budget = budget
+        self.search_heuristics = heuristic_types
+        self.search_start = perf_counter()
+        if budget is None:
+            return self.search(engine), engine
+        try:
+            solution = self.search(engine)
+            self.budget_outcome = BudgetOutcome.WITHIN_BUDGET
+            return solution, engine
+        except BudgetExceeded as exceeded:
+            self.budget_reason = exceeded.reason
+        fallback: Optional[SolverEngine] = budget.fallback
+        if fallback is not None and fallback != engine:
+            # The fallback engine gets a budget of its own
+            self.search_start = perf_counter()
+            try:
+                solution = self.search(fallback)
+                self.budget_outcome = BudgetOutcome.FALLBACK
+                return solution, fallback
+            except BudgetExceeded:
+                pass
+        self.budget_outcome = BudgetOutcome.UNSOLVED
+        return None, engine
 
-    def solve(self) -> Optional[List[List[int]]]:
+    def relabel(self, board: Board) -> Board:
         """
-        Solves the puzzle and returns the solution path.
+        Swaps the first two copies of a duplicated value on a board.
+
+        The visible board stays the same, but the parity of the permutation flips,
+        so an unsolvable labelling becomes a solvable one.
+
+        Args:
+            board (Board): The labelled board.
+
+        Returns:
+            Board: The board with the two copies swapped.
+        """
+        code_classes: List[int] = self.code_classes
+        first = next(code for code in range(1, len(code_classes)) if code_classes[code] != code)
+        second = code_classes[first]
+        codes = board.to_codes()
+        first_index, second_index = codes.index(first), codes.index(second)
+        codes[first_index], codes[second_index] = second, first
+        return Board.from_codes(codes, board.layout.row_count, board.layout.col_count)
+
+    def is_solvable(self) -> bool:
+        """
+        Checks if a goal board can be reached from the start board.
+
+        With interchangeable identical tiles every board is solvable: swapping two
+        identical tiles flips the parity of the permutation without changing the
+        visible board, so one of the two labellings always has the parity of the goal.
 
         Returns:
-            Optional[List[List[int]]]: The solution path as a list of moves, or None if no solution is found.
+            bool: True if the start board is solvable, False otherwise.
         """
-        queue: Deque[Tuple[State, List[str]]] = deque(
-            [(self.start_state, [])]
-        )  # Initialize the queue with the start state and an empty path
+        return self.code_classes is not None or self.start_board.is_solvable()
+
+    def get_heuristic(self) -> Heuristic:
+        """
+        Returns the heuristic of the informed engines for the searched boards.
+
+        Returns:
+            Heuristic: The heuristic, on class codes if identical tiles are interchangeable.
+        """
+        return Heuristic(self.start_board.layout, self.search_heuristics, self.code_classes)
+
+    def get_rank(self, codes: List[int]) -> int:
+        """
+        Returns the dense rank of a searched board, the index of its move in the BFS table.
+
+        Canonical boards with interchangeable identical tiles are multiset permutations
+        of the class codes, all other boards are permutations of distinct codes.
+
+        Args:
+            codes (List[int]): The tile codes of the board in cell order.
+
+        Returns:
+            int: The dense rank of the board.
+        """
+        if self.code_classes is not None:
+            return Ranking.rank_multiset(codes)
+        layout: BoardLayout = self.start_board.layout
+        return Ranking.rank_board(codes, layout.row_count, layout.col_count)
+
+    def get_board_count(self) -> int:
+        """
+        Returns the number of dense ranks of the searched boards (see get_rank).
+
+        Returns:
+            int: The number of ranks.
+        """
+        layout: BoardLayout = self.start_board.layout
+        if self.code_classes is not None:
+            return Ranking.get_multiset_count(Counter(self.code_classes))
+        return Ranking.get_board_count(layout.row_count, layout.col_count)
+
+    def search(self, engine: SolverEngine) -> Optional[List[str]]:
+        """
+        Runs a search engine on the start board.
+
+        Args:
+            engine (SolverEngine): The search engine, not SolverEngine.AUTO.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if no solution is found.
+        """
+        if engine == SolverEngine.BFS:
+            return self.solve_bfs()
+        if engine == SolverEngine.LOOKUP_TABLE:
+            # The table holds labelled boards, canonical boards are searched instead
+            if self.code_classes is not None:
+                return self.solve_bfs()
+            return SolutionTable.get(self.board_height, self.board_width).get_path(
+                self.start_board
+            )
+        # The informed engines cannot prove unsolvability by exhaustion in reasonable time
+        if not self.is_solvable():
+            return None
+        if engine == SolverEngine.BIDIRECTIONAL:
+            return self.solve_bidirectional()
+        if engine == SolverEngine.A_STAR:
+            return self.solve_a_star()
+        if engine == SolverEngine.WEIGHTED_A_STAR:
+            return self.solve_a_star(self.weight)
+        if engine == SolverEngine.GREEDY:
+            return self.solve_greedy()
+        if engine == SolverEngine.REDUCTION:
+            # Reduction places every tile by its code and needs distinct tiles
+            return Reduction.solve(self.labelled_board)
+        return self.solve_ida_star()
+
+    def solve_bfs(self) -> Optional[List[str]]:
+        """
+        Solves the puzzle with a breadth-first search.
+
+        The queue only holds boards. The move that first reached every board is
+        stored once (see Solver.visited) and the path is rebuilt from these moves
+        when the goal board is dequeued. A dequeued board with a cached solution
+        bounds the solution length; once the search depth reaches that bound, the
+        path through the cached board is optimal.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if no solution is found.
+        """
+        start: Board = self.start_board
+        goal_key: int = self.goal_key
+        layout: BoardLayout = start.layout
+        transitions = layout.transitions
+        mask: int = layout.mask
+        unpack = layout.unpack
+        rank = self.get_rank
+        # Move code (index in Moves.move_names plus one) of every move name
+        move_codes: Dict[str, int] = {move: index + 1 for index, move in enumerate(Moves.move_names)}
+        # Boards with too many states for a dict keep one nibble per dense rank instead
+        use_ranks: bool = BITSET_MIN_SIZE <= layout.size <= BITSET_MAX_SIZE
+        if use_ranks:
+            visited = RankMoveTable(self.get_board_count())
+            # The start board has no move, any code marks it as visited
+            visited.set(rank(unpack(start.key)), START_MOVE_CODE)
+        else:
+            visited = {start.key: START_MOVE_CODE}
+        self.visited = visited
+        cached_lengths: Optional[Dict[int, int]] = self.cache.lengths if self.cache else None
+        # Length of the best solution through a cached board and that solution
+        best_length: float = INFINITY
+        best_path: Optional[List[str]] = None
+        stats: Optional[SearchStats] = self.stats
+        # Number of visited boards, only counted for the statistics
+        visited_count: int = 1
+        budget: Optional[SearchBudget] = self.search_budget
+        expansions: int = 0
+        next_check: float = budget.first_check() if budget is not None else INFINITY
+        # Initialize the queue with the start board, its blank position and its depth
+        queue: Deque[Tuple[int, int, int]] = deque([(start.key, start.blank, 0)])
         while queue:  # While the queue is not empty
-            current_state, path = queue.popleft() # Get the current state and path from the queue
-            state_to_compare = current_state.state_to_tuple() # Get the current state as a tuple
-            # Check if the current state is the goal state
+            key, blank, depth = queue.popleft()  # Get the current board from the queue
+            # Check if the current board is the goal board
             # If it is, return the path, as the solution has been found
-            if state_to_compare == self.goal_state_tuple:
-                return path
-            # If the current state is not the goal state, update the previous state
-            self.prev_state = current_state.state_to_tuple()
-
-            # Add the current state to the visited set
-            self.visited.add(
-                current_state.state_to_tuple()
-            )  # Add the current state to the visited set
-            # For each neighbor and move in the current state's neighbors
-            for neighbor, move in current_state.get_neighbors(self.board_width):
-                neighbor_tuple = neighbor.state_to_tuple()# Get the neighbor state as a tuple
-                if neighbor_tuple != self.prev_state: # Check if the neighbor state is not the previous state
-                    if neighbor_tuple not in self.visited: # Check if the neighbor state has not been visited
-                        queue.append(  # Append the neighbor state and updated path to the queue
-                            (neighbor, path + [move])
+            if key == goal_key:
+                return self.rebuild_path(key, blank)
+            expansions += 1
+            if expansions >= next_check:
+                # Every visited board was either expanded or is still queued
+                next_check = budget.check(expansions, expansions + len(queue), self.search_start)
+            if cached_lengths is not None:
+                # No solution is shorter than the depth of the boards still to dequeue
+                if depth >= best_length:
+                    return best_path
+                cached_length = cached_lengths.get(key)
+                if cached_length is not None and depth + cached_length < best_length:
+                    cached_moves = self.cache.get_moves(key)
+                    if cached_moves is not None:
+                        best_length = depth + cached_length
+                        best_path = self.rebuild_path(key, blank) + cached_moves
+            if stats is not None:
+                expansion_start = perf_counter()
+                lookup_time = 0.0
+            duplicates = 0
+            # For each legal move of the blank tile, swap the blank with the target tile
+            for target, move, factor, shift in transitions[blank]:
+                neighbor_key = key + ((key >> shift) & mask) * factor
+                if stats is not None:
+                    lookup_start = perf_counter()
+                visited_key = rank(unpack(neighbor_key)) if use_ranks else neighbor_key
+                # Every stored move code is nonzero, so a stored code marks a visited board
+                if visited.get(visited_key):
+                    duplicates += 1
+                elif use_ranks:
+                    visited.set(visited_key, move_codes[move])
+                    queue.append((neighbor_key, target, depth + 1))
+                else:
+                    visited[visited_key] = move_codes[move]
+                    queue.append((neighbor_key, target, depth + 1))
+                if stats is not None:
+                    lookup_time += perf_counter() - lookup_start
+            if stats is not None:
+                generated = len(transitions[blank])
+                visited_count += generated - duplicates
+                stats.add_expansion(
+                    generated,
+                    duplicates,
+                    len(queue),
+                    visited_count,
+                    perf_counter() - expansion_start - lookup_time,
+                    lookup_time,
+                )
+        # If no solution is found, return the solution through a cached board, if any
+        return best_path
+
+    def rebuild_path(self, key: int, blank: int) -> List[str]:
+        """
+        Rebuilds the path to a board reached by solve_bfs by undoing the stored moves.
+
+        Args:
+            key (int): The packed board to rebuild the path to.
+            blank (int): The cell index of the blank tile of the board.
+
+        Returns:
+            List[str]: The moves from the start board to the given board.
+        """
+        layout: BoardLayout = self.start_board.layout
+        start_key: int = self.start_board.key
+        visited = self.visited
+        path: List[str] = []
+        while key != start_key:
+            if isinstance(visited, RankMoveTable):
+                code = visited.get(self.get_rank(layout.unpack(key)))
+            else:
+                code = visited[key]
+            move = Moves.move_names[code - 1]
+            path.append(move)
+            # Undoing a move moves the blank tile back in the opposite direction
+            board = Board(layout, key, blank).apply_move(Moves.opposite_moves[move])
+            key, blank = board.key, board.blank
+        path.reverse()
+        return path
+
+    def solve_bidirectional(self) -> Optional[List[str]]:
+        """
+        Solves the puzzle with two breadth-first searches, one from the start board
+        and one from the goal board, that meet in the middle.
+
+        The search always expands a whole layer of the smaller frontier. Every board
+        generated on one side is looked up in the boards reached by the other side,
+        and the shortest connection found in a layer is an optimal solution. Both
+        searches together explore about 2 * b^(d/2) boards instead of b^d.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if no solution is found.
+        """
+        start: Board = self.start_board
+        layout: BoardLayout = start.layout
+        transitions = layout.transitions
+        mask: int = layout.mask
+        opposite_moves: Dict[str, str] = Moves.opposite_moves
+        self.nodes_expanded = 0
+        stats: Optional[SearchStats] = self.stats
+        budget: Optional[SearchBudget] = self.search_budget
+        next_check: float = budget.first_check() if budget is not None else INFINITY
+        if start.key == self.goal_key:
+            return []
+        # Depth and (parent, move from the parent) of every board reached from the start
+        forward_depth: Dict[int, int] = {start.key: 0}
+        forward_parent: Dict[int, Tuple[int, str]] = {}
+        # Depth and (child, move to the child) of every board reached from the goal,
+        # where the child is one move closer to the goal
+        backward_depth: Dict[int, int] = {self.goal_key: 0}
+        backward_child: Dict[int, Tuple[int, str]] = {}
+        forward_frontier: List[Tuple[int, int]] = [(start.key, start.blank)]
+        backward_frontier: List[Tuple[int, int]] = [(self.goal_key, layout.size - 1)]
+        while forward_frontier and backward_frontier:
+            # Expand the smaller frontier, the other side provides the boards to meet
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, depth, links = forward_frontier, forward_depth, forward_parent
+                other_depth = backward_depth
+            else:
+                frontier, depth, links = backward_frontier, backward_depth, backward_child
+                other_depth = forward_depth
+            best_length = INFINITY
+            # Last board of the start side, move connecting both sides, first board of the goal side
+            meeting: Tuple[int, str, int] = (0, "", 0)
+            next_frontier: List[Tuple[int, int]] = []
+            for key, blank in frontier:
+                self.nodes_expanded += 1
+                if self.nodes_expanded >= next_check:
+                    next_check = budget.check(
+                        self.nodes_expanded,
+                        len(forward_depth) + len(backward_depth),
+                        self.search_start,
+                    )
+                neighbor_depth = depth[key] + 1
+                if stats is not None:
+                    expansion_start = perf_counter()
+                    lookup_time = 0.0
+                duplicates = 0
+                for target, move, factor, shift in transitions[blank]:
+                    neighbor_key = key + ((key >> shift) & mask) * factor
+                    if stats is not None:
+                        lookup_start = perf_counter()
+                    # Check if the other search has already reached the neighbor
+                    if neighbor_key in other_depth:
+                        length = neighbor_depth + other_depth[neighbor_key]
+                        if length < best_length:
+                            best_length = length
+                            meeting = (
+                                (key, move, neighbor_key)
+                                if expand_forward
+                                else (neighbor_key, opposite_moves[move], key)
+                            )
+                    if neighbor_key in depth:
+                        duplicates += 1
+                    else:
+                        depth[neighbor_key] = neighbor_depth
+                        # Backward moves lead away from the goal, store the move towards it
+                        links[neighbor_key] = (
+                            (key, move) if expand_forward else (key, opposite_moves[move])
                         )
+                        next_frontier.append((neighbor_key, target))
+                    if stats is not None:
+                        lookup_time += perf_counter() - lookup_start
+                if stats is not None:
+                    stats.add_expansion(
+                        len(transitions[blank]),
+                        duplicates,
+                        len(forward_frontier) + len(backward_frontier) + len(next_frontier),
+                        len(forward_depth) + len(backward_depth),
+                        perf_counter() - expansion_start - lookup_time,
+                        lookup_time,
+                    )
+            # A whole layer has been expanded, so the shortest connection found is optimal
+            if best_length < INFINITY:
+                forward_key, move, backward_key = meeting
+                path = Solver.reconstruct_path(forward_parent, forward_key)
+                path.append(move)
+                while backward_key in backward_child:
+                    backward_key, move = backward_child[backward_key]
+                    path.append(move)
+                return path
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
         # If no solution is found, return None
         return None
 
-    def apply_solution_and_draw(self, solution: List[str]) -> None:
+    def solve_a_star(self, weight: float = 1.0) -> Optional[List[str]]:
         """
-        Applies the solution path to the puzzle and draws the result.
+        Solves the puzzle with an A* search guided by the selected heuristics.
+
+        An expanded board with a cached solution yields a solution of known length;
+        it is returned once no open board can lead to a shorter one. With a weight
+        above 1 the boards are ordered by cost + weight * estimate (weighted A*),
+        which expands far fewer boards but only guarantees solutions at most
+        weight times longer than optimal.
 
         Args:
+            weight (float, optional): The weight of the heuristic estimate. Defaults to 1 (optimal A*).
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if no solution is found.
+        """
+        start: Board = self.start_board
+        goal_key: int = self.goal_key
+        layout: BoardLayout = start.layout
+        transitions = layout.transitions
+        mask: int = layout.mask
+        heuristic = self.get_heuristic()
+        estimate = heuristic.estimate
+        unpack = layout.unpack
+        # Cheapest known cost and the (parent, move) that reached every generated board
+        best_cost: Dict[int, int] = {start.key: 0}
+        came_from: Dict[int, Tuple[int, str]] = {}
+        start_estimate = estimate(unpack(start.key))
+        # Entries are ordered by f, then by h so that deeper boards are preferred on ties
+        open_heap: List[Tuple[float, int, int, int, int]] = [
+            (weight * start_estimate, start_estimate, 0, start.key, start.blank)
+        ]
+        cached_lengths: Optional[Dict[int, int]] = self.cache.lengths if self.cache else None
+        # Length of the best solution through a cached board and that solution
+        best_length: float = INFINITY
+        best_path: Optional[List[str]] = None
+        stats: Optional[SearchStats] = self.stats
+        budget: Optional[SearchBudget] = self.search_budget
+        expansions: int = 0
+        next_check: float = budget.first_check() if budget is not None else INFINITY
+        while open_heap:
+            f, _, cost, key, blank = heapq.heappop(open_heap)
+            # Every open board leads to solutions of at least f moves (at least f / weight
+            # for weighted A*, whose cached solutions are returned as early)
+            if f >= best_length:
+                return best_path
+            # Skip entries that were superseded by a cheaper path
+            if cost > best_cost[key]:
+                continue
+            if key == goal_key:
+                return Solver.reconstruct_path(came_from, key)
+            expansions += 1
+            if expansions >= next_check:
+                next_check = budget.check(expansions, len(best_cost), self.search_start)
+            if cached_lengths is not None:
+                cached_length = cached_lengths.get(key)
+                if cached_length is not None and cost + cached_length < best_length:
+                    cached_moves = self.cache.get_moves(key)
+                    if cached_moves is not None:
+                        best_length = cost + cached_length
+                        best_path = Solver.reconstruct_path(came_from, key) + cached_moves
+            neighbor_cost = cost + 1
+            if stats is not None:
+                expansion_start = perf_counter()
+                lookup_time = 0.0
+            duplicates = 0
+            for target, move, factor, shift in transitions[blank]:
+                neighbor_key = key + ((key >> shift) & mask) * factor
+                if stats is not None:
+                    lookup_start = perf_counter()
+                # Skip the neighbors that are already reached at no higher cost
+                if neighbor_cost >= best_cost.get(neighbor_key, neighbor_cost + 1):
+                    duplicates += 1
+                else:
+                    best_cost[neighbor_key] = neighbor_cost
+                    came_from[neighbor_key] = (key, move)
+                    neighbor_estimate = estimate(unpack(neighbor_key))
+                    heapq.heappush(
+                        open_heap,
+                        (
+                            neighbor_cost + weight * neighbor_estimate,
+                            neighbor_estimate,
+                            neighbor_cost,
+                            neighbor_key,
+                            target,
+                        ),
+                    )
+                if stats is not None:
+                    lookup_time += perf_counter() - lookup_start
+            if stats is not None:
+                # The heuristic is counted as lookup time, it is computed for new boards only
+                stats.add_expansion(
+                    len(transitions[blank]),
+                    duplicates,
+                    len(open_heap),
+                    len(best_cost),
+                    perf_counter() - expansion_start - lookup_time,
+                    lookup_time,
+                )
+        # If no solution is found, return the solution through a cached board, if any
+        return best_path
+
+    def solve_greedy(self) -> Optional[List[str]]:
+        """
+        Solves the puzzle with a greedy best-first search that always expands the
+        board with the smallest heuristic estimate.
+
+        The search ignores the cost so far, so it usually finds a solution after far
+        fewer expansions than A*, but the solution is not necessarily optimal.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if no solution is found.
+        """
+        start: Board = self.start_board
+        goal_key: int = self.goal_key
+        layout: BoardLayout = start.layout
+        transitions = layout.transitions
+        mask: int = layout.mask
+        estimate = self.get_heuristic().estimate
+        unpack = layout.unpack
+        # The (parent, move) that first reached every generated board
+        came_from: Dict[int, Tuple[int, str]] = {}
+        reached: Set[int] = {start.key}
+        open_heap: List[Tuple[int, int, int]] = [(estimate(unpack(start.key)), start.key, start.blank)]
+        stats: Optional[SearchStats] = self.stats
+        budget: Optional[SearchBudget] = self.search_budget
+        expansions: int = 0
+        next_check: float = budget.first_check() if budget is not None else INFINITY
+        while open_heap:
+            _, key, blank = heapq.heappop(open_heap)
+            if key == goal_key:
+                return Solver.reconstruct_path(came_from, key)
+            expansions += 1
+            if expansions >= next_check:
+                next_check = budget.check(expansions, len(reached), self.search_start)
+            if stats is not None:
+                expansion_start = perf_counter()
+                lookup_time = 0.0
+            duplicates = 0
+            for target, move, factor, shift in transitions[blank]:
+                neighbor_key = key + ((key >> shift) & mask) * factor
+                if stats is not None:
+                    lookup_start = perf_counter()
+                if neighbor_key in reached:
+                    duplicates += 1
+                else:
+                    reached.add(neighbor_key)
+                    came_from[neighbor_key] = (key, move)
+                    heapq.heappush(open_heap, (estimate(unpack(neighbor_key)), neighbor_key, target))
+                if stats is not None:
+                    lookup_time += perf_counter() - lookup_start
+            if stats is not None:
+                stats.add_expansion(
+                    len(transitions[blank]),
+                    duplicates,
+                    len(open_heap),
+                    len(reached),
+                    perf_counter() - expansion_start - lookup_time,
+                    lookup_time,
+                )
+        # If no solution is found, return None
+        return None
+
+    def solve_ida_star(self) -> Optional[List[str]]:
+        """
+        Solves the puzzle with an iterative deepening A* search.
+
+        Only the current path is kept in memory, so the memory use grows with the
+        solution depth instead of the number of explored boards. Cached solution
+        lengths are exact distances: a cached board within the bound completes an
+        optimal solution, any other one is pruned with its exact distance.
+
+        The search moves a single mutable board in place and undoes every move on
+        backtrack (see game.move_kernel), so no board is created per node and the
+        Manhattan distance and linear conflict are updated by per-move deltas.
+
+        Returns:
+            Optional[List[str]]: The solution path as a list of moves, or None if no solution is found.
+        """
+        start: Board = self.start_board
+        goal_key: int = self.goal_key
+        transitions = start.layout.transitions
+        kernel = MoveKernel(start, self.get_heuristic())
+        estimate = kernel.estimate
+        make, unmake = kernel.make, kernel.unmake
+        path: List[str] = []
+        cached_lengths: Optional[Dict[int, int]] = self.cache.lengths if self.cache else None
+        stats: Optional[SearchStats] = self.stats
+        budget: Optional[SearchBudget] = self.search_budget
+        expansions: int = 0
+        next_check: float = budget.first_check() if budget is not None else INFINITY
+
+        def search(previous: int, cost: int, bound: int) -> int:
+            """
+            Depth-first search below the current bound from the board of the kernel.
+
+            Returns:
+                int: -1 if the goal was found, otherwise the smallest f value above the bound.
+            """
+            nonlocal expansions, next_check
+            key = kernel.key
+            if cached_lengths is not None and key in cached_lengths:
+                f = cost + cached_lengths[key]
+                if f <= bound:
+                    cached_moves = self.cache.get_moves(key)
+                    if cached_moves is not None:
+                        path.extend(cached_moves)
+                        return -1
+                else:
+                    return f
+            f = cost + estimate()
+            if f > bound:
+                return f
+            if key == goal_key:
+                return -1
+            blank = kernel.blank
+            expansions += 1
+            if expansions >= next_check:
+                # Only the current path is stored
+                next_check = budget.check(expansions, len(path), self.search_start)
+            if stats is not None:
+                # IDA* keeps no visited boards, only the current path and the recursion stack
+                stats.add_expansion(
+                    len(transitions[blank]) - (previous >= 0),
+                    0,
+                    len(path),
+                    len(path),
+                    0.0,
+                    0.0,
+                )
+            minimum = INFINITY
+            for target, move, _, _ in transitions[blank]:
+                # Skip the move that would undo the previous one
+                if target == previous:
+                    continue
+                path.append(move)
+                make(target)
+                result = search(blank, cost + 1, bound)
+                if result == -1:
+                    return -1
+                unmake(blank)
+                if result < minimum:
+                    minimum = result
+                path.pop()
+            return minimum
+
+        bound = estimate()
+        while True:
+            # Every iteration ends with the kernel back on the start board
+            result = search(-1, 0, bound)
+            if result == -1:
+                return path
+            if result == INFINITY:
+                return None
+            bound = result
+
+    @staticmethod
+    def reconstruct_path(came_from: Dict[int, Tuple[int, str]], key: int) -> List[str]:
+        """
+        Follows the parent links from a board back to the start board.
+
+        Args:
+            came_from (Dict[int, Tuple[int, str]]): The parent board and move of every reached board.
+            key (int): The packed board to reconstruct the path to.
+
+        Returns:
+            List[str]: The moves from the start board to the given board.
+        """
+        path: List[str] = []
+        while key in came_from:
+            key, move = came_from[key]
+            path.append(move)
+        path.reverse()
+        return path
+
+    @staticmethod
+    def render_solution(
+        start_state: State,
+        goal_state: State,
+        solution: List[str],
+        blank_tile_value: Union[int, str],
+    ) -> str:
+        """
+        Renders a solution as human-readable text with the board after every move.
+
+        Args:
+            start_state (State): The initial state of the puzzle.
+            goal_state (State): The goal state of the puzzle.
             solution (List[str]): The solution path as a list of moves.
+            blank_tile_value (Union[int, str]): The value of the blank tile.
+
+        Returns:
+            str: The original state, the goal state and every move with the resulting board.
         """
         solved_state: State = (
-            self.start_state.deep_copy()
+            start_state.deep_copy()
         )  # Create a deep copy of the start state to apply the solution
+        lines: List[str] = [
+            "Original State" + "\n" + utils.write_matrix(start_state) + "\n",
+            "Goal State" + "\n" + utils.write_matrix(goal_state) + "\n",
+        ]
+        for move in solution:  # For each move in the solution
+            row, col = next(  # Get the row and column of the blank tile
+                (tile.row, tile.col)
+                for tile in solved_state.state
+                if tile.val == blank_tile_value
+            )
+            # Get the new row and column of the blank tile after the move
+            new_row, new_col = (
+                row + Moves.moves_dict[move].value[0],
+                col + Moves.moves_dict[move].value[1],
+            )
+            blank_index: int = solved_state.get_blank_tile_index() # Get the index of the blank tile
+            target_index: int = solved_state.get_target_tile_index(new_row, new_col) # Get the index of the target tile
+            solved_state.update_state(blank_index, target_index, new_row, new_col) # Update the state with the new blank tile position
+            # Add the move and updated state
+            lines.append(f"Move: {move}\n")
+            lines.append(utils.write_matrix(solved_state) + "\n")
+        return "".join(lines)
+
+    def apply_solution_and_draw(self, solution: List[str]) -> None:
+        """
+        Applies the solution path to the puzzle and draws the result.
+
+        Args:
+            solution (List[str]): The solution path as a list of moves.
+        """
         # Write the solution to a file
         with open(
             f"{self.puzzle_instance.dir_path}/solution_{self.state_id}.txt", "w"
         ) as file:
             file.write(
-                "Original State" + "\n" + utils.write_matrix(self.start_state) + "\n"
-            )
-            file.write("Goal State" + "\n" + utils.write_matrix(self.goal_state) + "\n")
-            for move in solution:  # For each move in the solution
-                row, col = next(  # Get the row and column of the blank tile
-                    (tile.row, tile.col)
-                    for tile in solved_state.state
-                    if tile.val == self.blank_tile_value
+                Solver.render_solution(
+                    self.start_state, self.goal_state, solution, self.blank_tile_value
                 )
-                # Get the new row and column of the blank tile after the move
-                new_row, new_col = (
-                    row + Moves.moves_dict[move].value[0],
-                    col + Moves.moves_dict[move].value[1],
-                )
-                blank_index: int = solved_state.get_blank_tile_index() # Get the index of the blank tile
-                target_index: int = solved_state.get_target_tile_index(new_row, new_col) # Get the index of the target tile
-                solved_state.update_state(blank_index, target_index, new_row, new_col) # Update the state with the new blank tile position
-                # Write the move and updated state to the file
-                file.write(f"Move: {move}\n")
-                file.write(utils.write_matrix(solved_state) + "\n")
+            )
@@ -3,8 +3,10 @@ from itertools import permutations
 import random
 from string import ascii_uppercase
 from game.tiles import Tile, TileMode, DuplicationMode
-from typing import Dict, List, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 from game.moves import Moves
+from game.ranking import Ranking, RankBitset
+from game.solvability import MAX_PERMUTATION_LENGTH, Solvability
 
 
 class State:
@@ -78,16 +80,21 @@ class State:
         )
 
     @staticmethod
-    def state_is_solvable(state: List[Tile], blank_row: int, n: int) -> bool:
+    def state_is_solvable(
+        state: List[Tile], blank_row: int, n: int, row_count: Optional[int] = None
+    ) -> bool:
         """
         Check if a given state of the game is solvable.
         Args:
             state (List[Tile]): The current state of the game represented as a list of Tile objects.
             blank_row (int): The row index of the blank tile.
             n (int): The width of the game board.
+            row_count (Optional[int], optional): The height of the game board. Defaults to the width.
         Returns:
             bool: True if the state is solvable, False otherwise.
         """
+        if row_count is None:
+            row_count = n
         inversions: int = 0
         for i in range(len(state)):
             for j in range(i + 1, len(state)):
@@ -98,7 +105,7 @@ class State:
             return inversions % 2 == 0
         # For boards with an even width, we need to also check the row of the blank tile
         else:
-            blank_row_from_bottom: int = n - blank_row
+            blank_row_from_bottom: int = row_count - blank_row
             if blank_row_from_bottom % 2 == 0:  # Blank on even row from bottom
                 return inversions % 2 != 0
             else:  # Blank on odd row from bottom
@@ -182,10 +189,37 @@ class State:
         tiles = [tile.real_val for tile in solved_state.state]
         # Get the scale values of the tiles to check for solvability
         scale_values: Dict[str, int] = State.get_scale_values(solved_state.state)
-        # Define a set to store the hashes of the states
-        seen_hashes = set()
+        # Visible values are ranked as a multiset permutation, so that relabellings of
+        # duplicated tiles share a rank and one bit marks every arrangement already seen
+        value_ids: Dict[Union[int, str], int] = {}
+        for tile in solved_state.state:
+            value_ids.setdefault(tile.val, len(value_ids))
+        has_duplicates: bool = len(value_ids) < size
+        seen_ranks = RankBitset(
+            Ranking.get_multiset_count(
+                Counter(value_ids[tile.val] for tile in solved_state.state)
+            )
+            if has_duplicates
+            else 0
+        )
+        # Without duplicates, numpy (if installed) generates the permutations block by
+        # block and filters out the unsolvable ones before any Tile is created; boards above
+        # MAX_PERMUTATION_LENGTH cells use the pure Python path, their ranks overflow int64
+        pre_filtered: bool = (
+            not has_duplicates
+            and Solvability.is_available()
+            and size <= MAX_PERMUTATION_LENGTH
+        )
+        if pre_filtered:
+            perms = (
+                [tiles[index] for index in row]
+                for block in Solvability.solvable_permutations(row_count, col_count)
+                for row in block.tolist()
+            )
+        else:
+            perms = permutations(tiles)
         # Generate all states
-        for perm in permutations(tiles):
+        for perm in perms:
             state = []
             blank_row = None
             state_to_check = [] # To check if the state is solvable
@@ -215,14 +249,17 @@ class State:
                 # Store the row of the blank tile to check for solvability
                 else:
                     blank_row = tile.row
-            # Add the hash of the state to the set of seen hashes if it is not already in the set
-            # Else, skip the state
-            hash_value = State.state_to_hash(state)
-            if hash_value in seen_hashes:
-                continue
-            seen_hashes.add(hash_value)
+            # Mark the rank of the visible arrangement as seen if it is not already marked
+            # Else, skip the state. Without duplicates every permutation is a new arrangement
+            if has_duplicates:
+                rank = Ranking.rank_multiset([value_ids[tile.val] for tile in state])
+                if rank in seen_ranks:
+                    continue
+                seen_ranks.add(rank)
             # Check if the state is solvable and add it to the list of all states
-            if State.state_is_solvable(state_to_check, blank_row, col_count):
+            if pre_filtered or State.state_is_solvable(
+                state_to_check, blank_row, col_count, row_count
+            ):
                 all_states.append(State(state, tile_mode, repeat_mode))
         # Return the list of all states and the solved state
         return all_states, solved_state
@@ -247,19 +284,27 @@ class State:
 
         Returns:
             list: The prepared tiles for the game state.
+
+        Raises:
+            ValueError: If the letters mode has more tiles than letters.
         """
         # Generate the tiles based on the tile mode
         if tile_mode == TileMode.NUMBERS:
             # Generate a list of numbers from 1 to size - 1 and add the blank tile value
             tiles = list(range(1, size)) + [blank_tile_value]
         elif tile_mode == TileMode.LETTERS:
+            if size - 1 > len(ascii_uppercase):
+                raise ValueError(
+                    f"The letters mode supports at most {len(ascii_uppercase)} tiles, got {size - 1}"
+                )
             # Generate a list of uppercase letters from A to size - 1 and add the blank tile value
             tiles = list(ascii_uppercase)[: size - 1] + [blank_tile_value]
         else:  # tile_mode == TileMode.MIXED
-            # Generate a list of numbers from 1 to size // 2, uppercase letters from A to size // 2, and the blank tile value
+            # Generate a list of numbers from 1 to size // 2, uppercase letters for the remaining
+            # size - 1 - size // 2 tiles, and the blank tile value
             tiles = (
                 list(range(1, size // 2 + 1))
-                + list(ascii_uppercase)[: size // 2]
+                + list(ascii_uppercase)[: size - 1 - size // 2]
                 + [blank_tile_value]
             )
         # Handle tile duplication based on the duplication mode
@@ -376,18 +421,20 @@ class State:
             self.repeat_mode,
         )
 
-    def get_neighbors(self, side_length: int) -> List[Tuple[List["State"], str]]:
+    def get_neighbors(self, col_count: int) -> List[Tuple[List["State"], str]]:
         """
         Returns a list of neighboring states and the corresponding move.
 
         Args:
-            side_length (int): The side length of the board.
+            col_count (int): The number of columns of the board, the number of rows follows
+                from the number of tiles.
 
         Returns:
             List[Tuple[List[State], str]]: A list of tuples containing the neighboring states and the corresponding move.
         """
         # Initialize the list of neighbors
         neighbors = []
+        row_count: int = len(self.state) // col_count
         # Find the blank tile's position
         row, col = next(
             (tile.row, tile.col)
@@ -404,7 +451,7 @@ class State:
             # Calculate the new row and column
             new_row, new_col = row + dr, col + dc
             # Check if the move is within the bounds of the board
-            if 0 <= new_row < side_length and 0 <= new_col < side_length:
+            if 0 <= new_row < row_count and 0 <= new_col < col_count:
                 # Make the move
                 new_state: State = self.deep_copy()  # Deep copy of the state
                 blank_index: int = new_state.get_blank_tile_index()
@@ -0,0 +1,153 @@
+import random
+import sys
+from typing import Dict, Iterator, List, Optional
+from game.board import Board
+from game.ranking import Ranking
+from game.state import State
+from game.state_store import StateStore
+
+
+class StateSpace:
+    """
+    Random-access view of all solvable start states of a puzzle configuration.
+
+    States are produced on demand from their index instead of being enumerated
+    and kept in a list. Without duplicated tiles the index is the dense rank of
+    the board (see Ranking.rank_board). With duplicated tiles it is the multiset
+    rank of the visible arrangement; identical tiles are labelled in goal order
+    and, if that labelling is unsolvable, the first two copies of a duplicated
+    value are swapped, so every arrangement has a solvable representative.
+
+    If the state store holds explicit board rows (migrated from a legacy cache),
+    the index addresses these rows instead, so legacy indices stay valid.
+
+    Attributes:
+        solved_state (State): The goal state of the puzzle.
+        row_count (int): The number of rows of the board.
+        col_count (int): The number of columns of the board.
+        store (Optional[StateStore]): The state store of the configuration, if any.
+        count (int): The number of states in the space.
+    """
+
+    def __init__(
+        self,
+        solved_state: State,
+        row_count: int,
+        col_count: int,
+        store: Optional[StateStore] = None,
+    ):
+        """
+        Initializes a new instance of the StateSpace class.
+
+        Args:
+            solved_state (State): The goal state of the puzzle.
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            store (StateStore, optional): The state store of the configuration. Defaults to None.
+        """
+        self.solved_state: State = solved_state
+        self.row_count: int = row_count
+        self.col_count: int = col_count
+        self.store: Optional[StateStore] = store
+        # Only stores with board rows define the space explicitly
+        self.has_rows: bool = store is not None and store.board_count > 0
+        size = row_count * col_count
+        # Visible value class of every tile code, the first copy of a value names the class
+        self.code_classes: List[int] = Board.get_code_classes(solved_state)
+        # Codes of every class in goal order
+        self.class_codes: Dict[int, List[int]] = {}
+        for code in list(range(1, size)) + [0]:
+            self.class_codes.setdefault(self.code_classes[code], []).append(code)
+        self.class_counts: Dict[int, int] = {
+            value_class: len(codes) for value_class, codes in self.class_codes.items()
+        }
+        self.has_duplicates: bool = len(self.class_codes) < size
+        if self.has_rows:
+            self.count: int = store.board_count
+        elif self.has_duplicates:
+            self.count = Ranking.get_multiset_count(self.class_counts)
+        else:
+            self.count = Ranking.get_board_count(row_count, col_count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> State:
+        """
+        Returns the state with the given index.
+
+        Args:
+            index (int): The index in [0, count).
+
+        Returns:
+            State: The state.
+        """
+        return self.get_board(index).to_state(self.solved_state)
+
+    def __iter__(self) -> Iterator[State]:
+        """
+        Yields all states in index order without keeping them.
+
+        Yields:
+            State: The next state.
+        """
+        for index in range(self.count):
+            yield self[index]
+
+    def get_board(self, index: int) -> Board:
+        """
+        Returns the packed board of the state with the given index.
+
+        Args:
+            index (int): The index in [0, count).
+
+        Returns:
+            Board: The board.
+        """
+        if self.has_rows:
+            return Board.from_key(self.store.get_key(index), self.row_count, self.col_count)
+        if not 0 <= index < self.count:
+            raise IndexError("state index out of range")
+        if not self.has_duplicates:
+            codes = Ranking.unrank_board(index, self.row_count, self.col_count)
+            return Board.from_codes(codes, self.row_count, self.col_count)
+        # Label the copies of every visible value in goal order
+        next_copy = {value_class: 0 for value_class in self.class_codes}
+        codes = []
+        for value_class in Ranking.unrank_multiset(index, self.class_counts):
+            codes.append(self.class_codes[value_class][next_copy[value_class]])
+            next_copy[value_class] += 1
+        board = Board.from_codes(codes, self.row_count, self.col_count)
+        if not board.is_solvable():
+            # Swapping two identical tiles fixes the parity without changing the visible board
+            first, second = next(
+                copies for copies in self.class_codes.values() if len(copies) > 1
+            )[:2]
+            first_index, second_index = codes.index(first), codes.index(second)
+            codes[first_index], codes[second_index] = second, first
+            board = Board.from_codes(codes, self.row_count, self.col_count)
+        return board
+
+    def sample(self, count: int, seed: Optional[int] = None) -> List[int]:
+        """
+        Draws distinct state indices uniformly at random without enumerating the space.
+
+        Args:
+            count (int): The number of indices to draw.
+            seed (Optional[int], optional): Seed for a reproducible draw. Defaults to None.
+
+        Returns:
+            List[int]: The drawn indices.
+        """
+        generator = random.Random(seed) if seed is not None else random
+        if self.count <= sys.maxsize:
+            return generator.sample(range(self.count), count)
+        # Spaces too large for a range: the chance of drawing an index twice is negligible
+        indices: List[int] = []
+        drawn = set()
+        while len(indices) < count:
+            index = generator.randrange(self.count)
+            if index not in drawn:
+                drawn.add(index)
+                indices.append(index)
+        return indices
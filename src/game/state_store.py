@@ -0,0 +1,198 @@
+import json
+import mmap
+import os
+import pickle
+import struct
+from typing import Iterable, List, Optional
+from game.board import Board, BoardLayout
+from game.state import State
+from game.tiles import Tile, TileMode, DuplicationMode
+
+# File header: magic, format version, row count, column count, tile mode, duplication mode,
+# duplicate count, bytes per board row, length of the solved state record, number of board rows
+HEADER_FORMAT: str = "<4sBBBBBBBIQ"
+MAGIC: bytes = b"STST"
+VERSION: int = 1
+
+
+class StateStore:
+    """
+    Versioned binary cache of a puzzle configuration, read through mmap.
+
+    The file starts with a fixed header (board shape, tile mode, duplication mode,
+    duplicate count, format version), followed by the solved state as a small JSON
+    record and an optional list of boards as fixed-width rows of packed keys. The
+    rows are read directly from the mapped file, so opening a store costs nothing
+    regardless of its size and every process shares the same pages.
+
+    Attributes:
+        path (str): The path of the store file.
+        row_count (int): The number of rows of the board.
+        col_count (int): The number of columns of the board.
+        tile_mode (TileMode): The tile mode of the puzzle.
+        duplication_mode (DuplicationMode): The duplication mode of the puzzle.
+        duplicate_count (int): The number of duplicated tiles.
+        solved_state (State): The goal state of the puzzle.
+        board_count (int): The number of stored board rows.
+        row_width (int): The number of bytes per board row.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes a new instance of the StateStore class by mapping an existing store file.
+
+        Args:
+            path (str): The path of the store file.
+
+        Raises:
+            ValueError: If the file is not a state store of this version.
+        """
+        self.path: str = path
+        with open(path, "rb") as file:
+            self.data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            self.row_count,
+            self.col_count,
+            tile_mode_index,
+            duplication_mode_index,
+            self.duplicate_count,
+            self.row_width,
+            solved_state_length,
+            self.board_count,
+        ) = struct.unpack_from(HEADER_FORMAT, self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a state store of version {VERSION}")
+        self.tile_mode: TileMode = list(TileMode)[tile_mode_index]
+        self.duplication_mode: DuplicationMode = list(DuplicationMode)[duplication_mode_index]
+        offset = struct.calcsize(HEADER_FORMAT)
+        tiles = json.loads(bytes(self.data[offset : offset + solved_state_length]))
+        self.solved_state: State = StateStore.tiles_to_state(
+            tiles, self.col_count, self.tile_mode, self.duplication_mode
+        )
+        self.rows_offset: int = offset + solved_state_length
+        self.layout: BoardLayout = BoardLayout.get(self.row_count, self.col_count)
+        self.rows: memoryview = memoryview(self.data)[self.rows_offset :]
+
+    @staticmethod
+    def write(
+        path: str,
+        solved_state: State,
+        row_count: int,
+        col_count: int,
+        duplicate_count: Optional[int],
+        keys: Iterable[int] = (),
+    ) -> None:
+        """
+        Writes a store file.
+
+        Args:
+            path (str): The path of the store file.
+            solved_state (State): The goal state of the puzzle.
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            duplicate_count (Optional[int]): The number of duplicated tiles.
+            keys (Iterable[int], optional): Packed boards to store as rows. Defaults to none.
+        """
+        layout = BoardLayout.get(row_count, col_count)
+        row_width = (layout.size * layout.bits + 7) // 8
+        tiles = json.dumps(
+            [
+                [tile.val, tile.real_val, getattr(tile, "duplicated", None), tile.scale_value]
+                for tile in solved_state.state
+            ]
+        ).encode()
+        rows = bytearray()
+        board_count = 0
+        for key in keys:
+            rows += key.to_bytes(row_width, "little")
+            board_count += 1
+        # Write to a temporary file first so that concurrent readers never see a partial store
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(
+                struct.pack(
+                    HEADER_FORMAT,
+                    MAGIC,
+                    VERSION,
+                    row_count,
+                    col_count,
+                    list(TileMode).index(solved_state.tile_mode),
+                    list(DuplicationMode).index(solved_state.repeat_mode),
+                    duplicate_count or 0,
+                    row_width,
+                    len(tiles),
+                    board_count,
+                )
+            )
+            file.write(tiles)
+            file.write(rows)
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def migrate(
+        pickle_path: str, path: str, row_count: int, col_count: int, duplicate_count: Optional[int]
+    ) -> None:
+        """
+        Converts a legacy pickled cache of (states, solved_state) into a store file.
+
+        The states keep their order, so indices of the legacy cache stay valid.
+
+        Args:
+            pickle_path (str): The path of the legacy pickle file.
+            path (str): The path of the store file to write.
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+            duplicate_count (Optional[int]): The number of duplicated tiles.
+        """
+        with open(pickle_path, "rb") as file:
+            states, solved_state = pickle.load(file)
+        keys = (Board.from_state(state, col_count).key for state in states or [])
+        StateStore.write(path, solved_state, row_count, col_count, duplicate_count, keys)
+
+    @staticmethod
+    def tiles_to_state(
+        tiles: List[list], col_count: int, tile_mode: TileMode, duplication_mode: DuplicationMode
+    ) -> State:
+        """
+        Rebuilds the solved state from its stored tile records.
+
+        Args:
+            tiles (List[list]): The [val, real_val, duplicated, scale_value] record of every tile.
+            col_count (int): The number of columns of the board.
+            tile_mode (TileMode): The tile mode of the puzzle.
+            duplication_mode (DuplicationMode): The duplication mode of the puzzle.
+
+        Returns:
+            State: The solved state.
+        """
+        state = []
+        for index, (val, real_val, duplicated, scale_value) in enumerate(tiles):
+            row, col = divmod(index, col_count)
+            tile = Tile(val, row, col, scale_value, duplicated, real_val)
+            # Tile only derives the flag for duplicated copies, keep the stored one
+            if duplicated is not None:
+                tile.duplicated = duplicated
+            state.append(tile)
+        return State(state, tile_mode, duplication_mode)
+
+    def __reduce__(self):
+        # The mapping cannot be pickled, other processes map the same file again
+        return (StateStore, (self.path,))
+
+    def get_key(self, index: int) -> int:
+        """
+        Returns the packed board of a stored row.
+
+        Args:
+            index (int): The row index in [0, board_count).
+
+        Returns:
+            int: The packed board.
+        """
+        if not 0 <= index < self.board_count:
+            raise IndexError("board row out of range")
+        start = index * self.row_width
+        return int.from_bytes(self.rows[start : start + self.row_width], "little")
@@ -0,0 +1,115 @@
+from typing import Dict, List, Optional, Tuple
+from game.board import BoardLayout
+
+# Move of the blank on the transposed board for every move of the blank on the board
+TRANSPOSED_MOVES: Dict[str, str] = {"up": "left", "left": "up", "down": "right", "right": "down"}
+
+
+class Symmetry:
+    """
+    Reflection of square boards across the main diagonal.
+
+    Transposing a board moves the tile on cell (row, col) to cell (col, row) and
+    relabels every tile with the code of its transposed goal cell. The goal board
+    maps to itself and every move of the blank maps to its transposed move (up and
+    left, down and right swap), so a board and its transpose have the same optimal
+    distance, and a solution of one becomes a solution of the other by
+    transposing its moves. Tables rooted at the goal (solution cache, solution
+    table, pattern databases) therefore only need one board of every pair, the
+    canonical board with the smaller key.
+
+    Searches rooted at the start board cannot use the symmetry: the distance from
+    the start to a board and to its transpose differ unless the start board is
+    itself symmetric.
+
+    Attributes:
+        layout (BoardLayout): The layout of the boards.
+        cells (List[int]): The transposed cell of every cell.
+        codes (List[int]): The transposed tile code of every tile code.
+    """
+
+    _symmetries: Dict[Tuple[int, int], "Symmetry"] = {}
+
+    def __init__(self, layout: BoardLayout):
+        """
+        Initializes a new instance of the Symmetry class.
+
+        Args:
+            layout (BoardLayout): The layout of a square board.
+        """
+        self.layout: BoardLayout = layout
+        side, size = layout.col_count, layout.size
+        self.cells: List[int] = [(index % side) * side + index // side for index in range(size)]
+        # A tile's code is its goal cell plus one, the blank (code 0) stays on the last cell
+        self.codes: List[int] = [0] + [self.cells[code - 1] + 1 for code in range(1, size)]
+        # Bit offset of every cell and of its transposed cell
+        self.shift_pairs: List[Tuple[int, int]] = [
+            (layout.shifts[index], layout.shifts[self.cells[index]]) for index in range(size)
+        ]
+
+    @staticmethod
+    def get(row_count: int, col_count: int) -> Optional["Symmetry"]:
+        """
+        Returns the shared symmetry of a board shape.
+
+        Args:
+            row_count (int): The number of rows of the board.
+            col_count (int): The number of columns of the board.
+
+        Returns:
+            Optional[Symmetry]: The symmetry, or None if the board is not square.
+        """
+        if row_count != col_count:
+            return None
+        symmetry = Symmetry._symmetries.get((row_count, col_count))
+        if symmetry is None:
+            symmetry = Symmetry(BoardLayout.get(row_count, col_count))
+            Symmetry._symmetries[(row_count, col_count)] = symmetry
+        return symmetry
+
+    def transpose(self, key: int) -> int:
+        """
+        Returns the transposed board of a packed board.
+
+        Args:
+            key (int): The packed board.
+
+        Returns:
+            int: The packed transposed board.
+        """
+        mask, codes = self.layout.mask, self.codes
+        transposed = 0
+        for shift, transposed_shift in self.shift_pairs:
+            transposed |= codes[(key >> shift) & mask] << transposed_shift
+        return transposed
+
+    def canonical(self, key: int) -> Tuple[int, bool]:
+        """
+        Returns the canonical board of a packed board and its transposed board.
+
+        Args:
+            key (int): The packed board.
+
+        Returns:
+            Tuple[int, bool]: The smaller of both packed boards and True if it is the transposed one.
+        """
+        transposed = self.transpose(key)
+        if transposed < key:
+            return transposed, True
+        return key, False
+
+    @staticmethod
+    def transpose_moves(moves: List[str]) -> List[str]:
+        """
+        Maps a solution of a board to the solution of its transposed board.
+
+        Transposition is an involution, so this also maps a solution of the
+        canonical board back to the board it was canonicalised from.
+
+        Args:
+            moves (List[str]): The solution path as a list of moves.
+
+        Returns:
+            List[str]: The transposed moves.
+        """
+        return [TRANSPOSED_MOVES[move] for move in moves]
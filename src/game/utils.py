@@ -1,4 +1,3 @@
-import math
 from game.state import State
 import time
 
@@ -13,10 +12,11 @@ class PuzzleUtils:
         Returns:
             str: The matrix string representation of the game state.
         """
-        # Calculate the board size based on the state length
-        board_size: int = int(math.sqrt(len(state.state)))
+        # Calculate the board shape from the tile positions, boards need not be square
+        row_count: int = max(tile.row for tile in state.state) + 1
+        col_count: int = max(tile.col for tile in state.state) + 1
         # Initialize an empty 2D array to represent the matrix
-        matrix = [["" for _ in range(board_size)] for _ in range(board_size)]
+        matrix = [["" for _ in range(col_count)] for _ in range(row_count)]
 
         # Populate the matrix with tile indices based on their row and col
         for tile in state.state:
@@ -70,8 +70,8 @@ class PuzzleUtils:
         Returns:
         A tuple containing the result of the function and the time taken in seconds.
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = func(*args, **kwargs)
-        end_time = time.time()
+        end_time = time.perf_counter()
         time_taken: str = f"{end_time - start_time:.2f}"
         return result, time_taken
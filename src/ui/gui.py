@@ -1,14 +1,26 @@
 import os
+import queue
+import threading
+import time
+from string import ascii_uppercase
 from tkinter import messagebox, ttk
 import tkinter as tk
+from typing import Optional, Tuple, Union
 from api import (
     create_puzzle,
     start_puzzle,
     Puzzle,
     PuzzleSize,
+    SolverEngine,
     TileMode,
     DuplicationMode,
 )
+from game.ranking import Ranking
+
+# Board shapes offered besides the predefined sizes, any other "<rows>x<columns>" can be typed in
+EXTRA_PUZZLE_SIZES: Tuple[str, ...] = ("5x5", "6x6")
+# Milliseconds between two reads of the progress queue by the Tk main loop
+PROGRESS_POLL_MS: int = 100
 
 
 class Gui:
@@ -68,6 +80,18 @@ class Gui:
         global dup_count_entry
         global dup_count_label
         global submit_button
+        global cancel_button
+        global progress_bar
+        global status_var
+        status_var = tk.StringVar()
+
+        global main_window
+        main_window = root
+        # Event and queue of the running batch, None while no batch is running
+        global cancel_event
+        cancel_event = None
+        global progress_queue
+        progress_queue = None
 
         # Create a label for the puzzle size
         size_label = ttk.Label(root, text="Select Puzzle Size:", style="TLabel")
@@ -76,12 +100,12 @@ class Gui:
         # Create a combobox for the puzzle size
         size_options = ttk.Combobox(root, textvariable=size_var)
         # Set the values for the combobox
-        # Currently, only the SMALL size is enabled. Other sizes take too long to generate all states
+        # States are built on demand, so larger boards no longer need all states to be generated
         size_options["values"] = (
             PuzzleSize.SMALL.name,
-            # PuzzleSize.MEDIUM.name,
-            # PuzzleSize.LARGE.name,
-        )
+            PuzzleSize.MEDIUM.name,
+            PuzzleSize.LARGE.name,
+        ) + EXTRA_PUZZLE_SIZES
         size_options.place(relx=0.4, rely=0.4, anchor="e")
 
         # Create a label for the solution count
@@ -147,7 +171,22 @@ class Gui:
         submit_button = ttk.Button(
             root, text="Submit", command=Gui.submit, style="TButton"
         )
-        submit_button.place(relx=0.5, rely=0.88, anchor="center")
+        submit_button.place(relx=0.4, rely=0.86, anchor="center")
+
+        # Create a cancel button, enabled while puzzles are solved
+        cancel_button = ttk.Button(
+            root, text="Cancel", command=Gui.cancel, style="TButton", state="disabled"
+        )
+        cancel_button.place(relx=0.6, rely=0.86, anchor="center")
+
+        # Create a progress bar and a status line with the throughput and the remaining time
+        progress_bar = ttk.Progressbar(root, mode="determinate", length=360)
+        progress_bar.place(relx=0.5, rely=0.92, anchor="center")
+        status_label = ttk.Label(root, textvariable=status_var, style="TLabel")
+        status_label.place(relx=0.5, rely=0.97, anchor="center")
+
+        # Stop a running batch when the window is closed
+        root.protocol("WM_DELETE_WINDOW", Gui.close)
 
         # Run the main loop
         root.mainloop()
@@ -191,7 +230,8 @@ class Gui:
         This function retrieves the selected puzzle size, tile mode, duplication mode,
         duplicates count, and solution count from the respective variables. It then
         creates a puzzle object using the selected configuration and starts solving
-        the puzzles. If the puzzles are solved successfully, a success message is shown.
+        the puzzles on a background thread. The progress is shown by poll_progress, and
+        a message is shown when the run has finished or was cancelled.
 
         Returns:
             None
@@ -212,29 +252,141 @@ class Gui:
             f"Puzzle Size: {puzzle_size}, Tile Mode: {tile_mode}, Duplication Mode: {duplication_mode}, Solution Count: {solution_count}, Duplicate Count: {duplicates_count}"
         )
         # Create a puzzle object based on the selected configuration
+        # The automatic engine solves boards up to 3x3 optimally, boards up to 16 cells by weighted A*
+        # (optimally within a time budget once pattern databases are built) and larger boards by
+        # row and column reduction, so no board keeps the window busy for minutes
         puzzle: Puzzle = create_puzzle(
-            PuzzleSize[puzzle_size],
+            Gui.get_puzzle_size(puzzle_size),
             TileMode[tile_mode],
             DuplicationMode[duplication_mode],
             int(duplicates_count) if duplicates_count else None,
+            SolverEngine.AUTO,
         )
-        # Start solving the puzzles
-        solved = start_puzzle(puzzle, int(solution_count))
+        # Solve the puzzles on a background thread, so that the window stays responsive;
+        # the thread reports to the Tk main loop only through the progress queue
+        global cancel_event, progress_queue
+        cancel_event = threading.Event()
+        progress_queue = queue.Queue()
+        to_solve = int(solution_count)
+        progress_bar.config(maximum=to_solve, value=0)
+        status_var.set("Preparing the states...")
+        cancel_button.config(state="normal")
+        threading.Thread(
+            target=Gui.solve_in_background,
+            args=(puzzle, to_solve, progress_queue, cancel_event),
+            daemon=True,
+        ).start()
+        main_window.after(PROGRESS_POLL_MS, Gui.poll_progress, to_solve, time.perf_counter())
+
+    def solve_in_background(
+        puzzle: Puzzle, to_solve: int, progress_queue: queue.Queue, cancel_event: threading.Event
+    ) -> None:
+        """
+        Solves the puzzles on the background thread and reports to the progress queue.
+
+        The queue receives ("progress", finished, total) after every finished puzzle and
+        finally ("done", finished_all) or ("error", message).
 
+        Args:
+            puzzle (Puzzle): The puzzle to solve.
+            to_solve (int): The number of puzzles to solve.
+            progress_queue (queue.Queue): The queue read by the Tk main loop.
+            cancel_event (threading.Event): Set by the cancel button to stop the run.
+        """
+        try:
+            finished_all = start_puzzle(
+                puzzle,
+                to_solve,
+                lambda finished, total: progress_queue.put(("progress", finished, total)),
+                cancel_event=cancel_event,
+            )
+            progress_queue.put(("done", finished_all))
+        except Exception as error:
+            progress_queue.put(("error", str(error)))
+
+    def poll_progress(to_solve: int, start_time: float) -> None:
+        """
+        Reads the progress queue on the Tk main loop and updates the progress widgets.
+
+        Reschedules itself every PROGRESS_POLL_MS milliseconds until the run has ended.
+
+        Args:
+            to_solve (int): The number of puzzles to solve.
+            start_time (float): The perf_counter time the run was submitted at.
+        """
+        finished = int(progress_bar["value"])
+        while True:
+            try:
+                message = progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "progress":
+                finished = message[1]
+                progress_bar.config(value=finished)
+                # Throughput and remaining time from the average rate since the submission
+                elapsed = time.perf_counter() - start_time
+                rate = finished / elapsed if elapsed > 0 else 0.0
+                remaining = (to_solve - finished) / rate if rate > 0 else 0.0
+                minutes, seconds = divmod(int(remaining), 60)
+                status_var.set(
+                    f"{finished}/{to_solve} puzzles, {rate:.1f} puzzles/s, ETA {minutes}:{seconds:02d}"
+                )
+            else:
+                Gui.finish_run(message, finished, to_solve)
+                return
+        main_window.after(PROGRESS_POLL_MS, Gui.poll_progress, to_solve, start_time)
+
+    def finish_run(message: Tuple, finished: int, to_solve: int) -> None:
+        """
+        Shows the outcome of a run and resets the buttons.
+
+        Args:
+            message (Tuple): The last message of the progress queue, ("done", finished_all) or ("error", text).
+            finished (int): The number of finished puzzles.
+            to_solve (int): The number of puzzles to solve.
+        """
+        global cancel_event, progress_queue
+        cancel_event = progress_queue = None
+        cancel_button.config(state="disabled")
         # Show a success message if the puzzles are solved successfully
-        if solved:
+        if message[0] == "done" and message[1]:
+            status_var.set(f"{to_solve}/{to_solve} puzzles finished")
             messagebox.showinfo(
-                "Success", f"{solution_count} puzzles have been solved successfully!"
+                "Success", f"{to_solve} puzzles have been solved successfully!"
+            )
+        # The results of a cancelled run are kept in its solved_states directory
+        elif message[0] == "done":
+            status_var.set(f"Cancelled after {finished}/{to_solve} puzzles")
+            messagebox.showinfo(
+                "Cancelled", f"Cancelled after {finished} of {to_solve} puzzles, the finished puzzles are kept."
             )
         # Show an error message if an error occurred while solving the puzzles
         else:
+            status_var.set("")
             messagebox.showerror(
-                "Error", "An error occurred while solving the puzzles."
+                "Error", f"An error occurred while solving the puzzles: {message[1]}"
             )
 
         # Enable the submit button
         submit_button.config(state="normal")
 
+    def cancel():
+        """
+        Asks the running batch to stop; the worker pool is terminated by the background thread.
+        """
+        if cancel_event is not None:
+            cancel_event.set()
+            cancel_button.config(state="disabled")
+            status_var.set("Cancelling...")
+
+    def close():
+        """
+        Cancels a running batch and closes the main window.
+        """
+        if cancel_event is not None:
+            cancel_event.set()
+        main_window.destroy()
+
     def validate_solution_count(*args):
         """
         Validates the solution count entered by the user.
@@ -252,27 +404,40 @@ class Gui:
             # Try to convert the value to an integer
             value = int(solution_count_var.get())
 
-            # If the value is more than 181440, set it to an empty string
-            if value > 181440 or value <= 0:
+            # The value must not exceed the number of solvable boards (181440 for 3x3)
+            size = Gui.get_puzzle_size(size_var.get())
+            row_count, col_count = Puzzle.get_dimensions(size) if size is not None else (3, 3)
+            if value > Ranking.get_board_count(row_count, col_count) or value <= 0:
                 return False
         except ValueError:
             return False
         return True
 
+    def get_puzzle_size(puzzle_size: str) -> Optional[Union[PuzzleSize, Tuple[int, int]]]:
+        """
+        Converts the selected puzzle size to a predefined size or a (rows, columns) tuple.
+
+        Args:
+            puzzle_size (str): The name of a predefined size or "<rows>x<columns>".
+
+        Returns:
+            Optional[Union[PuzzleSize, Tuple[int, int]]]: The puzzle size, None if it is invalid.
+        """
+        if puzzle_size in PuzzleSize.__members__:
+            return PuzzleSize[puzzle_size]
+        try:
+            row_count, col_count = (int(side) for side in puzzle_size.lower().split("x"))
+            return Puzzle.get_dimensions((row_count, col_count))
+        except ValueError:
+            return None
+
     def validate_puzzle_size(*args):
         """
         Validates the selected puzzle size.
         Returns:
             True if the puzzle size is valid, False otherwise.
         """
-        puzzle_size = size_var.get()
-        if puzzle_size not in [
-            PuzzleSize.SMALL.name,
-            PuzzleSize.MEDIUM.name,
-            PuzzleSize.LARGE.name,
-        ]:
-            return False
-        return True
+        return Gui.get_puzzle_size(size_var.get()) is not None
 
     def validate_tile_mode(*args):
         """
@@ -287,6 +452,12 @@ class Gui:
             TileMode.MIXED.name,
         ]:
             return False
+        # The letters mode has one letter per tile
+        size = Gui.get_puzzle_size(size_var.get())
+        if tile_mode == TileMode.LETTERS.name and size is not None:
+            row_count, col_count = Puzzle.get_dimensions(size)
+            if row_count * col_count - 1 > len(ascii_uppercase):
+                return False
         return True
 
     def validate_duplication_mode(*args):